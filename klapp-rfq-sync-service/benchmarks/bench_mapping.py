@@ -0,0 +1,101 @@
+# =============================================================================
+# FILE: benchmarks/bench_mapping.py
+# Compiled mapping vs the reference RFQTransformer: equivalence and speed
+#
+# Usage: python -m benchmarks.bench_mapping [--batch 1000]
+#
+# Exits with status 1 if the compiled mapping's output differs from
+# RFQTransformer.transform_email_to_record for any case.
+# =============================================================================
+
+import argparse
+import copy
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.fixtures import make_line_item, make_rfq_data
+from benchmarks.hot_path import time_stage
+from src.services.mapping import email_to_medusa_mapping
+from src.services.transformer import transformer
+
+PAYLOADS = {"small": 3, "medium": 25, "large": 500}
+
+
+def edge_cases() -> List[Dict[str, Any]]:
+    """Inputs covering every default, enum fallback and description branch."""
+    base = make_rfq_data(5, 1)
+    cases = [make_rfq_data(n, n) for n in (0, 1, 3, 4, 25)]
+
+    def variant(**changes: Any) -> Dict[str, Any]:
+        data = copy.deepcopy(base)
+        for key, value in changes.items():
+            if value is KeyError:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        return data
+
+    cases += [
+        variant(customer=KeyError),
+        variant(customer={}),
+        variant(delivery=KeyError),
+        variant(delivery={}),
+        variant(delivery={"city": "Wien"}),
+        variant(description="Hydraulic hoses"),
+        variant(description="", title="Spare parts"),
+        variant(description="", title="", line_items=[]),
+        variant(title="", line_items=KeyError),
+        variant(status="quote_requested", priority="critical"),
+        variant(status="unknown", priority="unknown"),
+        variant(status=KeyError, priority=KeyError, currency=KeyError),
+        variant(email_rfq_id=KeyError, rfq_number=KeyError),
+        variant(email_rfq_id=12345),
+        variant(ai_confidence_score=KeyError, language=KeyError, estimated_value=KeyError),
+        variant(line_items=[{}, {"description": ""}, {"quantity": 0, "specifications": None}]),
+        variant(line_items=[{"description": ""}] * 5),
+        variant(line_items=[make_line_item(i) for i in range(3)] + [{}]),
+    ]
+    return cases
+
+
+def check_equivalence() -> int:
+    """Compare batch and single-record output with the reference. Returns mismatches."""
+    cases = edge_cases()
+    expected = [transformer.transform_email_to_record(data) for data in cases]
+    batch = email_to_medusa_mapping.transform_batch(cases)
+    mismatches = 0
+    for i, (data, want, got) in enumerate(zip(cases, expected, batch)):
+        if got != want or email_to_medusa_mapping.transform(data) != want:
+            mismatches += 1
+            print(f"MISMATCH case {i}:\n  reference: {want}\n  compiled:  {got}")
+    print(f"Equivalence: {len(cases) - mismatches}/{len(cases)} cases match")
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled mapping vs reference transformer")
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    if check_equivalence():
+        sys.exit(1)
+
+    print(f"{'payload':<8} {'batch':>6} {'reference':>12} {'compiled':>12} {'speedup':>8}")
+    for name, n_items in PAYLOADS.items():
+        size = args.batch if n_items <= 25 else max(1, args.batch // 20)
+        records = [make_rfq_data(n_items, seq) for seq in range(size)]
+        for batch in (records[:1], records):
+            reference = time_stage(
+                lambda: [transformer.transform_email_to_record(r) for r in batch]
+            )["min_us"] / len(batch)
+            compiled = time_stage(
+                lambda: email_to_medusa_mapping.transform_batch(batch)
+            )["min_us"] / len(batch)
+            print(
+                f"{name:<8} {len(batch):>6} {reference:>10.2f}us {compiled:>10.2f}us "
+                f"{reference / compiled:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# =============================================================================
+# FILE: benchmarks/bench_models.py
+# Memory per in-flight message and throughput: pydantic vs slotted models
+#
+# Usage: python -m benchmarks.bench_models [--messages 2000]
+# =============================================================================
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fixtures import make_sync_event
+from src.models.events import RFQSyncRequest, RFQSyncResult, SyncDirection, SyncStatus
+from src.models.internal import SyncOutcome, SyncWork
+from src.services.transformer import transformer
+
+PAYLOADS = {"small": 3, "medium": 25, "large": 500}
+
+
+def pydantic_path(event: Dict[str, Any]) -> tuple:
+    """Hot path objects as carried before: all pydantic models."""
+    request = RFQSyncRequest(**event)
+    medusa_rfq = transformer.transform_email_to_medusa(request.rfq_data)
+    now = datetime.utcnow()
+    result = RFQSyncResult(
+        email_rfq_id=request.email_rfq_id,
+        medusa_rfq_id="rfq_0123456789abcdef01234567",
+        rfq_number=request.rfq_number,
+        sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+        sync_status=SyncStatus.COMPLETED,
+        sync_started_at=now,
+        sync_completed_at=now,
+        duration_ms=0,
+    )
+    return request, medusa_rfq, result
+
+
+def slotted_path(event: Dict[str, Any]) -> tuple:
+    """Hot path objects as carried now: pydantic at the boundary only."""
+    work = SyncWork.from_event(event)
+    record = transformer.transform_email_to_record(work.rfq_data)
+    now = datetime.utcnow()
+    outcome = SyncOutcome(
+        email_rfq_id=work.email_rfq_id,
+        medusa_rfq_id="rfq_0123456789abcdef01234567",
+        rfq_number=work.rfq_number,
+        sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+        sync_status=SyncStatus.COMPLETED,
+        sync_started_at=now,
+        sync_completed_at=now,
+        duration_ms=0,
+    )
+    return work, record, outcome
+
+
+def bytes_per_message(path: Callable, events: List[Dict[str, Any]]) -> float:
+    """Memory retained per in-flight message, excluding the raw event."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    in_flight = [path(event) for event in events]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del in_flight
+    return (after - before) / len(events)
+
+
+def messages_per_second(path: Callable, events: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    for event in events:
+        path(event)
+    return len(events) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare pydantic and slotted hot-path models")
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<8} {'model':<9} {'bytes/msg':>12} {'msgs/sec':>12}")
+    for name, n_items in PAYLOADS.items():
+        count = args.messages if n_items <= 25 else max(1, args.messages // 10)
+        events = [make_sync_event(n_items, seq) for seq in range(count)]
+        for label, path in (("pydantic", pydantic_path), ("slotted", slotted_path)):
+            path(events[0])  # warm up
+            memory = bytes_per_message(path, events)
+            throughput = messages_per_second(path, events)
+            print(f"{name:<8} {label:<9} {memory:>12,.0f} {throughput:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# =============================================================================
+# FILE: benchmarks/fixtures.py
+# Realistic RFQ sync events for benchmarks
+# =============================================================================
+
+from datetime import datetime
+from typing import Any, Dict
+
+MANUFACTURERS = ["Siemens", "Festo", "SMC", "Bosch Rexroth", "Schneider Electric"]
+UNITS = ["pcs", "m", "kg", "set", "box"]
+
+
+def make_line_item(i: int) -> Dict[str, Any]:
+    return {
+        "description": f"Pneumatic cylinder DSBC-{32 + i % 8 * 8}-{100 + i}-PPVA-N3, "
+                       f"double acting, with cushioning",
+        "quantity": 1 + i % 25,
+        "unit": UNITS[i % len(UNITS)],
+        "part_number": f"DSBC-{1000 + i}",
+        "manufacturer": MANUFACTURERS[i % len(MANUFACTURERS)],
+        "specifications": {
+            "bore_mm": 32 + i % 8 * 8,
+            "stroke_mm": 100 + i,
+            "material": "aluminium",
+            "operating_pressure_bar": "0.6-12",
+        },
+        "unit_price": round(49.5 + i * 1.25, 2),
+        "total_price": None,
+    }
+
+
+def make_rfq_data(n_items: int, seq: int = 0) -> Dict[str, Any]:
+    return {
+        "email_rfq_id": f"00000000-0000-4000-8000-{seq:012d}",
+        "rfq_number": f"RFQ-2026-{seq:06d}",
+        "title": None,
+        "description": None,
+        "status": "validated",
+        "priority": "high" if seq % 10 == 0 else "medium",
+        "currency": "EUR",
+        "estimated_value": 12500.0,
+        "language": "de",
+        "ai_confidence_score": 0.93,
+        "customer": {
+            "email": f"einkauf{seq}@example-industrie.de",
+            "name": "Max Mustermann",
+            "company": "Example Industrie GmbH",
+            "phone": "+49 89 1234567",
+            "city": "München",
+            "country": "DE",
+        },
+        "delivery": {
+            "city": "München",
+            "country": "DE",
+            "address": "Industriestraße 12, 80939 München",
+            "required_date": "2026-11-30",
+            "payment_terms": "30 days net",
+            "special_instructions": "Deliver to gate 3",
+        },
+        "line_items": [make_line_item(i) for i in range(n_items)],
+    }
+
+
+def make_sync_event(n_items: int, seq: int = 0) -> Dict[str, Any]:
+    rfq_data = make_rfq_data(n_items, seq)
+    return {
+        "event_id": f"evt_{seq}",
+        "event_type": "rfq.sync.to_medusa",
+        "event_timestamp": datetime(2026, 10, 19, 12, 0, 0).isoformat(),
+        "source_service": "email-service",
+        "idempotency_key": f"sync_{rfq_data['email_rfq_id']}",
+        "correlation_id": f"corr_{seq}",
+        "email_rfq_id": rfq_data["email_rfq_id"],
+        "rfq_number": rfq_data["rfq_number"],
+        "rfq_data": rfq_data,
+    }
@@ -0,0 +1 @@
+# Load and soak harness package
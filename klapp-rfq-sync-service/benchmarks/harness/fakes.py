@@ -0,0 +1,383 @@
+# =============================================================================
+# FILE: benchmarks/harness/fakes.py
+# In-process stand-ins for Kafka, Redis and the Medusa database
+# =============================================================================
+
+import asyncio
+import random
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from aiokafka.structs import TopicPartition
+
+from src.consumers.sync_consumer import deserialize_key, deserialize_value, serialize_key, serialize_value
+from src.services.breakers import medusa_db_breaker
+from src.services.medusa_db import MedusaDBClient, build_insert_args
+
+
+@dataclass
+class FaultModel:
+    """Latency and error injection for a stand-in dependency."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    spike_probability: float = 0.0
+    spike_ms: float = 0.0
+    error_rate: float = 0.0
+    down: bool = False  # Outage: every call fails until cleared
+    seed: int = 7
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    async def apply(self) -> None:
+        if self.down:
+            raise ConnectionError("Injected outage")
+        delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if self.spike_probability and self._random.random() < self.spike_probability:
+            delay += self.spike_ms
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise ConnectionError("Injected fault")
+
+
+# -----------------------------------------------------------------------------
+# Kafka
+# -----------------------------------------------------------------------------
+
+@dataclass
+class FakeMessage:
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[str]
+    value: Any
+    timestamp: int  # ms since epoch, like aiokafka ConsumerRecord
+
+
+class InMemoryKafkaConsumer:
+    """
+    Stand-in for AIOKafkaConsumer. Messages are serialized on publish and
+    deserialized on consumption with the service's own (de)serializers.
+    Messages are returned in publish order; pause() holds back a
+    partition's messages until resume().
+    """
+
+    def __init__(self, partitions: int = 6, max_buffer: int = 10_000):
+        self._partitions = partitions
+        self._max_buffer = max_buffer
+        self._topics: Set[str] = set()
+        self._buffers: Dict[TopicPartition, Deque[tuple]] = {}
+        self._paused: Set[TopicPartition] = set()
+        self._offsets: Dict[Tuple[str, int], int] = {}
+        self.committed: Dict[TopicPartition, int] = {}
+        self._seq = 0
+        self._stopped = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self._stopped = True
+        self._readable.set()
+
+    async def publish(self, topic: str, value: Dict[str, Any], key: Optional[str] = None) -> None:
+        """Append a message; waits while the buffer is full."""
+        while self.lag() >= self._max_buffer:
+            self._writable.clear()
+            await self._writable.wait()
+
+        partition = zlib.crc32((key or "").encode("utf-8")) % self._partitions
+        offset = self._offsets.get((topic, partition), 0)
+        self._offsets[(topic, partition)] = offset + 1
+        self._seq += 1
+        self._topics.add(topic)
+        self._buffers.setdefault(TopicPartition(topic, partition), deque()).append((
+            self._seq, offset, serialize_key(key), serialize_value(value),
+            int(time.time() * 1000),
+        ))
+        self._readable.set()
+
+    def lag(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def uncommitted(self) -> int:
+        """Published messages not covered by a committed offset."""
+        return sum(
+            published - self.committed.get(TopicPartition(topic, partition), 0)
+            for (topic, partition), published in self._offsets.items()
+        )
+
+    def assignment(self) -> Set[TopicPartition]:
+        return {
+            TopicPartition(topic, partition)
+            for topic in self._topics
+            for partition in range(self._partitions)
+        }
+
+    async def commit(self, offsets: Dict[TopicPartition, int]) -> None:
+        self.committed.update(offsets)
+
+    def pause(self, *partitions: TopicPartition) -> None:
+        self._paused.update(partitions)
+
+    def resume(self, *partitions: TopicPartition) -> None:
+        self._paused.difference_update(partitions)
+        self._readable.set()
+
+    def paused(self) -> Set[TopicPartition]:
+        return set(self._paused)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> FakeMessage:
+        while True:
+            if self._stopped:
+                raise StopAsyncIteration
+            ready = [
+                (buffer[0][0], tp)
+                for tp, buffer in self._buffers.items()
+                if buffer and tp not in self._paused
+            ]
+            if ready:
+                break
+            self._readable.clear()
+            await self._readable.wait()
+
+        tp = min(ready)[1]
+        _, offset, key, value, timestamp = self._buffers[tp].popleft()
+        self._writable.set()
+        return FakeMessage(
+            topic=tp.topic,
+            partition=tp.partition,
+            offset=offset,
+            key=deserialize_key(key),
+            value=deserialize_value(value),
+            timestamp=timestamp,
+        )
+
+
+class InMemoryKafkaProducer:
+    """
+    Stand-in for AIOKafkaProducer. on_send is called for every record.
+    It doubles as its own client, for the metadata round trip.
+    """
+
+    def __init__(
+        self,
+        fault: Optional[FaultModel] = None,
+        on_send: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        self._fault = fault or FaultModel()
+        self._on_send = on_send
+        self.sent: Dict[str, int] = {}
+        self.client = self
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+    async def force_metadata_update(self) -> bool:
+        await self._fault.apply()
+        return True
+
+    async def partitions_for(self, topic: str) -> set:
+        return {0}
+
+    async def send_and_wait(self, topic: str, value: Dict[str, Any], key: Optional[str] = None) -> None:
+        serialize_value(value)
+        serialize_key(key)
+        await self._fault.apply()
+        self.sent[topic] = self.sent.get(topic, 0) + 1
+        if self._on_send:
+            self._on_send(topic, value)
+
+
+# -----------------------------------------------------------------------------
+# Redis
+# -----------------------------------------------------------------------------
+
+class InMemoryRedis:
+    """The subset of redis.asyncio.Redis used by the service."""
+
+    def __init__(self, fault: Optional[FaultModel] = None):
+        self._fault = fault or FaultModel()
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._bitmaps: Dict[str, bytearray] = {}
+        self._zsets: Dict[str, Dict[str, float]] = {}
+
+    def _get(self, key: str) -> Any:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        await self._fault.apply()
+        return self._set(key, value, ex, nx)
+
+    def _set(self, key: str, value: Any, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._get(key) is not None:
+            return None
+        expires_at = time.monotonic() + ex if ex else None
+        self._values[key] = (value, expires_at)
+        return True
+
+    async def get(self, key: str) -> Any:
+        await self._fault.apply()
+        return self._get(key)
+
+    async def delete(self, *keys: str) -> int:
+        await self._fault.apply()
+        return sum(self._values.pop(key, None) is not None for key in keys)
+
+    async def mget(self, keys: List[str]) -> List[Any]:
+        await self._fault.apply()
+        return [self._get(key) for key in keys]
+
+    async def zrevrange(self, key: str, start: int, end: int) -> List[str]:
+        await self._fault.apply()
+        members = sorted(self._zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+        return [member for member, _ in members[start:end + 1 if end != -1 else None]]
+
+    async def ping(self) -> bool:
+        await self._fault.apply()
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+    def _getbit(self, key: str, offset: int) -> int:
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None or offset // 8 >= len(bitmap):
+            return 0
+        return (bitmap[offset // 8] >> (7 - offset % 8)) & 1
+
+    def _setbit(self, key: str, offset: int, value: int) -> int:
+        bitmap = self._bitmaps.setdefault(key, bytearray())
+        if offset // 8 >= len(bitmap):
+            bitmap.extend(bytes(offset // 8 + 1 - len(bitmap)))
+        old = self._getbit(key, offset)
+        mask = 1 << (7 - offset % 8)
+        if value:
+            bitmap[offset // 8] |= mask
+        else:
+            bitmap[offset // 8] &= ~mask
+        return old
+
+    def _zadd(self, key: str, mapping: Dict[str, float]) -> int:
+        members = self._zsets.setdefault(key, {})
+        added = sum(member not in members for member in mapping)
+        members.update(mapping)
+        return added
+
+    def _zremrangebyrank(self, key: str, start: int, end: int) -> int:
+        members = self._zsets.get(key, {})
+        ranked = sorted(members.items(), key=lambda item: (item[1], item[0]))
+        removed = ranked[start:end + 1 if end != -1 else None]
+        for member, _ in removed:
+            del members[member]
+        return len(removed)
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: InMemoryRedis):
+        self._redis = redis
+        self._ops: List[Callable[[], Any]] = []
+
+    def getbit(self, key: str, offset: int) -> "InMemoryPipeline":
+        self._ops.append(lambda: self._redis._getbit(key, offset))
+        return self
+
+    def setbit(self, key: str, offset: int, value: int) -> "InMemoryPipeline":
+        self._ops.append(lambda: self._redis._setbit(key, offset, value))
+        return self
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> "InMemoryPipeline":
+        self._ops.append(lambda: self._redis._set(key, value, ex))
+        return self
+
+    def zadd(self, key: str, mapping: Dict[str, float]) -> "InMemoryPipeline":
+        self._ops.append(lambda: self._redis._zadd(key, mapping))
+        return self
+
+    def zremrangebyrank(self, key: str, start: int, end: int) -> "InMemoryPipeline":
+        self._ops.append(lambda: self._redis._zremrangebyrank(key, start, end))
+        return self
+
+    def expire(self, key: str, seconds: int) -> "InMemoryPipeline":
+        self._ops.append(lambda: True)
+        return self
+
+    async def execute(self) -> List[Any]:
+        await self._redis._fault.apply()
+        return [op() for op in self._ops]
+
+
+# -----------------------------------------------------------------------------
+# Medusa database
+# -----------------------------------------------------------------------------
+
+class InMemoryMedusaDB(MedusaDBClient):
+    """
+    MedusaDBClient stand-in. INSERT arguments are still built with
+    build_insert_args so serialization cost is part of the measurement.
+    Calls go through the Medusa DB circuit breaker, like pooled ones.
+    """
+
+    def __init__(self, fault: Optional[FaultModel] = None):
+        super().__init__()
+        self._fault = fault or FaultModel()
+        self._rows: Dict[str, Dict[str, Any]] = {}
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def ping(self) -> None:
+        async with medusa_db_breaker.guard():
+            await self._fault.apply()
+
+    async def find_rfq_by_external_id(self, external_id: str, consistent: bool = False) -> Optional[Dict[str, Any]]:
+        async with medusa_db_breaker.guard():
+            await self._fault.apply()
+        return self._rows.get(external_id)
+
+    async def create_rfq(self, rfq, line_items_json: Optional[str] = None) -> str:
+        rfq_id = f"rfq_{uuid4().hex[:24]}"
+        build_insert_args(rfq_id, rfq, line_items_json)
+        async with medusa_db_breaker.guard():
+            await self._fault.apply()
+        self._rows[rfq.external_id] = {
+            "id": rfq_id,
+            "rfq_number": rfq.rfq_number,
+            "status": rfq.status,
+            "external_id": rfq.external_id,
+            "sync_status": "synced",
+        }
+        return rfq_id
+
+    async def update_rfq_status(self, rfq_id: str, status: str, updated_by: Optional[str] = None) -> None:
+        async with medusa_db_breaker.guard():
+            await self._fault.apply()
@@ -0,0 +1,86 @@
+# =============================================================================
+# FILE: benchmarks/harness/generator.py
+# Synthetic RFQ sync event generator
+# =============================================================================
+
+import asyncio
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from benchmarks.fixtures import make_sync_event
+
+
+@dataclass
+class GeneratorConfig:
+    rate: float = 200.0             # events per second
+    duplicate_ratio: float = 0.05   # share of events re-delivering an earlier event
+    min_items: int = 1              # line items per RFQ, uniform in [min, max]
+    max_items: int = 25
+    key_skew: float = 0.0           # Zipf exponent over keyspace; 0 = every RFQ unique
+    keyspace: int = 10_000          # distinct RFQs when key_skew > 0
+    urgent_ratio: float = 0.01      # share of events with priority "urgent"
+    seed: int = 42
+
+
+class SyntheticEventGenerator:
+    """
+    Produces rfq.sync.to_medusa events at a target rate.
+
+    Duplicates re-send a recent event unchanged (same idempotency_key), as
+    a producer retry or redelivery would. With key_skew > 0, RFQ ids are
+    drawn from a Zipf distribution, so hot RFQs receive repeated sync
+    requests with fresh idempotency keys and contend on the Redis lock.
+    """
+
+    def __init__(self, config: GeneratorConfig):
+        self._config = config
+        self._random = random.Random(config.seed)
+        self._seq = itertools.count()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self._zipf_weights: Optional[List[float]] = None
+        if config.key_skew > 0:
+            self._zipf_weights = list(itertools.accumulate(
+                1.0 / (k ** config.key_skew) for k in range(1, config.keyspace + 1)
+            ))
+        self.produced = 0
+        self.duplicates = 0
+
+    def next_event(self) -> Dict[str, Any]:
+        config = self._config
+        if self._recent and self._random.random() < config.duplicate_ratio:
+            self.duplicates += 1
+            return self._random.choice(self._recent)
+
+        seq = next(self._seq)
+        rfq_seq = seq
+        if self._zipf_weights:
+            rfq_seq = self._random.choices(
+                range(config.keyspace), cum_weights=self._zipf_weights
+            )[0]
+
+        n_items = self._random.randint(config.min_items, config.max_items)
+        event = make_sync_event(n_items, rfq_seq)
+        event["event_id"] = f"evt_{seq}"
+        event["idempotency_key"] = f"sync_{seq}"
+        if self._random.random() < config.urgent_ratio:
+            event["rfq_data"]["priority"] = "urgent"
+        self._recent.append(event)
+        return event
+
+    async def stream(self, duration: float) -> AsyncIterator[Dict[str, Any]]:
+        """Yield events at the configured rate for duration seconds."""
+        start = time.monotonic()
+        tick = 0.01
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= duration:
+                return
+            due = int(elapsed * self._config.rate) - self.produced
+            for _ in range(due):
+                self.produced += 1
+                yield self.next_event()
+            await asyncio.sleep(tick)
@@ -0,0 +1,319 @@
+# =============================================================================
+# FILE: benchmarks/harness/soak.py
+# End-to-end load and soak run of SyncConsumer -> SyncProcessor -> Medusa
+# with in-process stand-ins for Kafka, Redis and Postgres
+#
+# Usage:
+#   python -m benchmarks.harness.soak --duration 60 --rate 200
+#   python -m benchmarks.harness.soak --duration 14400 --rate 100 \
+#       --medusa-spike-probability 0.01 --medusa-spike-ms 2000 \
+#       --medusa-error-rate 0.001 --output soak.json
+#   python -m benchmarks.harness.soak --duration 120 --rate 100 \
+#       --outage medusa_db --outage-at 30 --outage-seconds 20
+# =============================================================================
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import resource
+import statistics
+import time
+from typing import Any, Dict, List
+
+from benchmarks.harness.fakes import (
+    FaultModel,
+    InMemoryKafkaConsumer,
+    InMemoryKafkaProducer,
+    InMemoryMedusaDB,
+    InMemoryRedis,
+)
+from benchmarks.harness.generator import GeneratorConfig, SyntheticEventGenerator
+from src.config import settings
+from src.consumers.handler_registry import HandlerRegistry
+from src.consumers.handlers import StatusChangedHandler, SyncToMedusaHandler
+from src.consumers.sync_consumer import SyncConsumer
+from src.services.breakers import BREAKERS
+from src.services.medusa_db import set_medusa_db
+from src.services.redis_client import set_redis_client
+from src.services.sync_state import SyncStateIndex, sync_state_index
+from src.utils.circuit_breaker import DependencyUnavailable
+from src.utils.logging_config import configure_logging, shutdown_logging
+
+
+class LatencyHistogram:
+    """Log-scale histogram (~2% resolution) so hour-long runs use constant memory."""
+
+    GROWTH = 1.02
+    MIN_SECONDS = 1e-4
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        bucket = 0
+        if seconds > self.MIN_SECONDS:
+            bucket = int(math.log(seconds / self.MIN_SECONDS, self.GROWTH)) + 1
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = math.ceil(p / 100 * self.count)
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return self.MIN_SECONDS * self.GROWTH ** bucket
+        return 0.0
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class InstrumentedSyncHandler(SyncToMedusaHandler):
+    """Sync handler that reports each handled message to on_done."""
+
+    def __init__(self, send, on_done):
+        super().__init__(send)
+        self._on_done = on_done
+
+    async def handle(self, message) -> None:
+        try:
+            await super().handle(message)
+        except DependencyUnavailable:
+            raise  # Held and retried; reported once it finishes
+        except Exception:
+            self._on_done(message)
+            raise
+        self._on_done(message)
+
+
+class InstrumentedSyncConsumer(SyncConsumer):
+    """SyncConsumer that records publish-to-processed latency per sync message."""
+
+    def __init__(self, *args, **kwargs):
+        self.processed = 0
+        self.window: List[float] = []
+        self.histogram = LatencyHistogram()
+
+        registry = HandlerRegistry()
+        registry.register(
+            InstrumentedSyncHandler(self._send, self._record),
+            [settings.TOPIC_RFQ_SYNC_TO_MEDUSA, settings.TOPIC_RFQ_SYNC_TO_MEDUSA_PRIORITY],
+        )
+        registry.register(StatusChangedHandler(), [settings.TOPIC_RFQ_STATUS_CHANGED])
+        super().__init__(*args, registry=registry, **kwargs)
+
+    def _record(self, message) -> None:
+        latency = max(0.0, time.time() - message.timestamp / 1000)
+        self.processed += 1
+        self.window.append(latency)
+        self.histogram.record(latency)
+
+
+async def report(
+    consumer: InstrumentedSyncConsumer,
+    generator: SyntheticEventGenerator,
+    kafka: InMemoryKafkaConsumer,
+    interval: float,
+    series: List[Dict[str, Any]],
+) -> None:
+    start = time.monotonic()
+    last_processed = 0
+    print(
+        f"{'t(s)':>7} {'produced':>9} {'processed':>9} {'msg/s':>8} "
+        f"{'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'lag':>6} {'rss(MB)':>8}"
+    )
+    while True:
+        await asyncio.sleep(interval)
+        window, consumer.window = consumer.window, []
+        point = {
+            "t": round(time.monotonic() - start, 1),
+            "produced": generator.produced,
+            "processed": consumer.processed,
+            "throughput": round((consumer.processed - last_processed) / interval, 1),
+            "p50_ms": round(percentile(window, 50) * 1000, 1),
+            "p95_ms": round(percentile(window, 95) * 1000, 1),
+            "p99_ms": round(percentile(window, 99) * 1000, 1),
+            "lag": kafka.lag(),
+            "rss_mb": round(rss_mb(), 1),
+        }
+        last_processed = consumer.processed
+        series.append(point)
+        print(
+            f"{point['t']:>7} {point['produced']:>9} {point['processed']:>9} "
+            f"{point['throughput']:>8} {point['p50_ms']:>8} {point['p95_ms']:>8} "
+            f"{point['p99_ms']:>8} {point['lag']:>6} {point['rss_mb']:>8}"
+        )
+
+
+async def outage(fault: FaultModel, name: str, at: float, seconds: float) -> None:
+    """Take a stand-in dependency down for a while."""
+    await asyncio.sleep(at)
+    fault.down = True
+    print(f"--- {name} down for {seconds:g}s")
+    await asyncio.sleep(seconds)
+    fault.down = False
+    print(f"--- {name} back up")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    faults = {
+        "medusa_db": FaultModel(
+            latency_ms=args.medusa_latency_ms,
+            jitter_ms=args.medusa_jitter_ms,
+            spike_probability=args.medusa_spike_probability,
+            spike_ms=args.medusa_spike_ms,
+            error_rate=args.medusa_error_rate,
+        ),
+        "redis": FaultModel(latency_ms=args.redis_latency_ms),
+        "kafka_producer": FaultModel(latency_ms=args.producer_latency_ms),
+    }
+    set_medusa_db(InMemoryMedusaDB(faults["medusa_db"]))
+    set_redis_client(InMemoryRedis(faults["redis"]))
+    sync_state_index.start()
+    for breaker in BREAKERS.values():
+        breaker.recovery_timeout = args.breaker_recovery_seconds
+
+    kafka = InMemoryKafkaConsumer(partitions=args.partitions)
+    producer = InMemoryKafkaProducer(faults["kafka_producer"])
+    consumer = InstrumentedSyncConsumer(consumer=kafka, producer=producer)
+    generator = SyntheticEventGenerator(GeneratorConfig(
+        rate=args.rate,
+        duplicate_ratio=args.duplicate_ratio,
+        min_items=args.min_items,
+        max_items=args.max_items,
+        key_skew=args.key_skew,
+        keyspace=args.keyspace,
+        urgent_ratio=args.urgent_ratio,
+    ))
+
+    series: List[Dict[str, Any]] = []
+    rss_start = rss_mb()
+    started = time.monotonic()
+    consumer_task = asyncio.create_task(consumer.run())
+    reporter_task = asyncio.create_task(
+        report(consumer, generator, kafka, args.report_interval, series)
+    )
+    outage_task = None
+    if args.outage:
+        outage_task = asyncio.create_task(
+            outage(faults[args.outage], args.outage, args.outage_at, args.outage_seconds)
+        )
+
+    async for event in generator.stream(args.duration):
+        await kafka.publish(settings.TOPIC_RFQ_SYNC_TO_MEDUSA, event, key=event["rfq_number"])
+
+    # Let the backlog drain before stopping
+    deadline = time.monotonic() + args.drain_timeout
+    while consumer.processed < generator.produced and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    elapsed = time.monotonic() - started
+
+    reporter_task.cancel()
+    if outage_task:
+        outage_task.cancel()
+    await consumer.drain()
+    await consumer.stop()
+    await asyncio.gather(consumer_task, reporter_task, return_exceptions=True)
+    await sync_state_index.stop()
+    # What a restarted replica would serve
+    restored = await SyncStateIndex().restore()
+
+    rss_series = [point["rss_mb"] for point in series] or [rss_mb()]
+    # Growth is measured from the first report on, after warm-up allocations
+    growth_per_hour = 0.0
+    if len(series) >= 2:
+        hours = (series[-1]["t"] - series[0]["t"]) / 3600
+        growth_per_hour = (series[-1]["rss_mb"] - series[0]["rss_mb"]) / hours
+    return {
+        "config": vars(args),
+        "produced": generator.produced,
+        "duplicates_generated": generator.duplicates,
+        "processed": consumer.processed,
+        "results_published": producer.sent.get(settings.TOPIC_RFQ_SYNC_COMPLETED, 0),
+        "dlq": producer.sent.get(settings.TOPIC_RFQ_DLQ, 0),
+        "uncommitted": kafka.uncommitted(),
+        "sync_state": {
+            "entries": len(sync_state_index),
+            "restored": restored,
+            "snapshot_failures": sync_state_index.get_metrics()["snapshot_failures"],
+        },
+        "breaker_opens": {name: b.get_metrics()["opened_count"] for name, b in BREAKERS.items()},
+        "elapsed_s": round(elapsed, 1),
+        "throughput": round(consumer.processed / elapsed, 1),
+        "latency_ms": {
+            p: round(consumer.histogram.percentile(float(p[1:])) * 1000, 1)
+            for p in ("p50", "p95", "p99", "p99.9")
+        },
+        "rss_mb": {
+            "start": round(rss_start, 1),
+            "end": round(rss_series[-1], 1),
+            "max": round(max(rss_series), 1),
+            "median": round(statistics.median(rss_series), 1),
+            "growth_per_hour": round(growth_per_hour, 1),
+        },
+        "series": series,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync service load and soak harness")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load")
+    parser.add_argument("--rate", type=float, default=200, help="events per second")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    parser.add_argument("--min-items", type=int, default=1)
+    parser.add_argument("--max-items", type=int, default=25)
+    parser.add_argument("--key-skew", type=float, default=0.0)
+    parser.add_argument("--keyspace", type=int, default=10_000)
+    parser.add_argument("--urgent-ratio", type=float, default=0.01)
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--medusa-latency-ms", type=float, default=2.0)
+    parser.add_argument("--medusa-jitter-ms", type=float, default=1.0)
+    parser.add_argument("--medusa-spike-probability", type=float, default=0.0)
+    parser.add_argument("--medusa-spike-ms", type=float, default=0.0)
+    parser.add_argument("--medusa-error-rate", type=float, default=0.0)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.2)
+    parser.add_argument("--producer-latency-ms", type=float, default=1.0)
+    parser.add_argument("--outage", choices=sorted(BREAKERS), help="dependency to take down")
+    parser.add_argument("--outage-at", type=float, default=30, help="seconds into the run")
+    parser.add_argument("--outage-seconds", type=float, default=20)
+    parser.add_argument("--breaker-recovery-seconds", type=float, default=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT)
+    parser.add_argument("--report-interval", type=float, default=10)
+    parser.add_argument("--drain-timeout", type=float, default=60)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write the full report as JSON")
+    args = parser.parse_args()
+
+    settings.LOG_LEVEL = args.log_level
+    configure_logging()
+    try:
+        summary = asyncio.run(run(args))
+    finally:
+        shutdown_logging()
+
+    print(json.dumps({k: v for k, v in summary.items() if k != "series"}, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# =============================================================================
+# FILE: benchmarks/hot_path.py
+# Per-stage micro-benchmarks for the sync hot path
+#
+# Usage:
+#   python -m benchmarks.hot_path                         # print results
+#   python -m benchmarks.hot_path --save benchmarks/baselines/baseline.json
+#   python -m benchmarks.hot_path --compare benchmarks/baselines/baseline.json
+#
+# --compare exits with status 1 if any stage's best time (min over repeats,
+# the least noise-sensitive statistic) regressed by more than --threshold
+# (default 10%).
+# =============================================================================
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from benchmarks.fixtures import make_sync_event
+from src.consumers.sync_consumer import deserialize_value, serialize_value
+from src.models.events import RFQSyncRequest, SyncDirection, SyncStatus
+from src.models.internal import SyncOutcome, SyncWork
+from src.services.mapping import email_to_medusa_mapping
+from src.services.medusa_db import build_insert_args
+from src.services.transformer import transformer
+
+PAYLOADS = {"small": 3, "medium": 25, "large": 500}
+REPEATS = 7
+TARGET_SECONDS = 0.1
+
+
+def build_stages(event: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """One zero-argument callable per hot-path stage, inputs precomputed."""
+    raw = serialize_value(event)
+    rfq_data = event["rfq_data"]
+    medusa_rfq = transformer.transform_email_to_medusa(rfq_data)
+    record = transformer.transform_email_to_record(rfq_data)
+    now = datetime.utcnow()
+    outcome = SyncOutcome(
+        email_rfq_id=event["email_rfq_id"],
+        medusa_rfq_id="rfq_0123456789abcdef01234567",
+        rfq_number=event["rfq_number"],
+        sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+        sync_status=SyncStatus.COMPLETED,
+        sync_started_at=now,
+        sync_completed_at=now,
+        duration_ms=12,
+    )
+
+    return {
+        "kafka_deserialize": lambda: deserialize_value(raw),
+        "rfq_sync_request": lambda: RFQSyncRequest(**event),
+        "sync_work_from_event": lambda: SyncWork.from_event(event),
+        "validate_for_sync": lambda: transformer.validate_for_sync(rfq_data),
+        "transform_email_to_medusa": lambda: transformer.transform_email_to_medusa(rfq_data),
+        "transform_email_to_record": lambda: transformer.transform_email_to_record(rfq_data),
+        "transform_compiled_mapping": lambda: email_to_medusa_mapping.transform(rfq_data),
+        "insert_args_model": lambda: build_insert_args("rfq_x", medusa_rfq),
+        "insert_args_record": lambda: build_insert_args("rfq_x", record),
+        "result_serialize": lambda: serialize_value(outcome.to_event("rfq-sync-service")),
+    }
+
+
+def time_stage(fn: Callable[[], Any]) -> Dict[str, float]:
+    """Median and min time per call in microseconds."""
+    # Calibrate the loop count so each repeat runs for about TARGET_SECONDS
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_SECONDS / 10:
+            break
+        number *= 10
+    number = max(1, int(number * TARGET_SECONDS / elapsed))
+
+    # As timeit does, keep GC pauses out of the measurement
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number * 1e6)
+    finally:
+        gc.enable()
+
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "loops": number,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(payloads: Dict[str, int]) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name, n_items in payloads.items():
+        stages = build_stages(make_sync_event(n_items))
+        results[name] = {stage: time_stage(fn) for stage, fn in stages.items()}
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print per-stage deltas. Returns True if any stage regressed."""
+    regressed = False
+    print(f"{'payload':<8} {'stage':<28} {'baseline':>11} {'current':>11} {'delta':>8}")
+    for payload, stages in current["results"].items():
+        for stage, timing in stages.items():
+            base = baseline["results"].get(payload, {}).get(stage)
+            if not base:
+                continue
+            delta = timing["min_us"] / base["min_us"] - 1
+            flag = ""
+            if delta > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(
+                f"{payload:<8} {stage:<28} {base['min_us']:>9.1f}us "
+                f"{timing['min_us']:>9.1f}us {delta:>+7.1%}{flag}"
+            )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync hot-path micro-benchmarks")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--payload", choices=sorted(PAYLOADS), action="append")
+    args = parser.parse_args()
+
+    payloads = {p: PAYLOADS[p] for p in args.payload} if args.payload else PAYLOADS
+    current = run(payloads)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"Baseline {baseline['meta'].get('commit')} vs current {current['meta']['commit']}")
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        print(f"{'payload':<8} {'stage':<28} {'median':>11} {'min':>11}")
+        for payload, stages in current["results"].items():
+            for stage, timing in stages.items():
+                print(
+                    f"{payload:<8} {stage:<28} {timing['median_us']:>9.1f}us "
+                    f"{timing['min_us']:>9.1f}us"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# =============================================================================
+# FILE: src/api/server.py
+# HTTP server for health, readiness, metrics, diagnostics and sync state
+# =============================================================================
+
+import hmac
+from typing import Optional
+
+import structlog
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from src.config import settings
+from src.utils.profiling import runtime_profiler
+from src.utils.startup import startup_tracker
+
+logger = structlog.get_logger(__name__)
+
+
+async def health(request: web.Request) -> web.Response:
+    """Liveness: the process is up and serving."""
+    return web.json_response({"status": "ok"})
+
+
+async def ready(request: web.Request) -> web.Response:
+    """Readiness: 503 until startup warm-up has finished."""
+    return web.json_response(
+        startup_tracker.report(),
+        status=200 if startup_tracker.ready else 503,
+    )
+
+
+async def metrics(request: web.Request) -> web.Response:
+    """Prometheus metrics."""
+    return web.Response(body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
+async def query_report(request: web.Request) -> web.Response:
+    """
+    Medusa DB statement timings, pool state and recent slow statements.
+    Slow statements carry parameter sizes and plans, so this is an admin
+    endpoint.
+    """
+    denied = _admin_denied(request)
+    if denied:
+        return denied
+    if not startup_tracker.ready:
+        return web.json_response({"error": "not ready"}, status=503)
+    # Imported here so the server can start before the DB client is loaded
+    from src.services.medusa_db import get_medusa_db
+
+    medusa_db = await get_medusa_db()
+    return web.json_response(medusa_db.get_query_report())
+
+
+def _admin_denied(request: web.Request) -> Optional[web.Response]:
+    """
+    None if the request may use the admin endpoints. They do not exist
+    unless enabled with a token, and need "Authorization: Bearer <token>".
+    """
+    if not settings.PROFILE_ADMIN_ENABLED or not settings.ADMIN_TOKEN:
+        return web.json_response({"error": "not found"}, status=404)
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        return web.json_response({"error": "unauthorized"}, status=401)
+    return None
+
+
+async def start_profile(request: web.Request) -> web.Response:
+    """Start a profiling window: POST /admin/profile?seconds=30."""
+    denied = _admin_denied(request)
+    if denied:
+        return denied
+    try:
+        seconds = float(request.query.get("seconds", settings.PROFILE_DEFAULT_SECONDS))
+    except ValueError:
+        return web.json_response({"error": "seconds must be a number"}, status=400)
+
+    if not runtime_profiler.start(seconds):
+        return web.json_response({"error": "profiling already running"}, status=409)
+    return web.json_response({"started": True, "output_dir": settings.PROFILE_OUTPUT_DIR}, status=202)
+
+
+async def profile_status(request: web.Request) -> web.Response:
+    """Whether a profiling window is running, and where the last one was written."""
+    denied = _admin_denied(request)
+    if denied:
+        return denied
+    return web.json_response({
+        "running": runtime_profiler.running,
+        "last_result": runtime_profiler.last_result,
+    })
+
+
+async def sync_state_list(request: web.Request) -> web.Response:
+    """
+    Sync state, most recent attempt first:
+    GET /sync-state?limit=100&cursor=...&status=failed
+    """
+    if not startup_tracker.ready:
+        return web.json_response({"error": "not ready"}, status=503)
+    from src.services.sync_state import sync_state_index
+
+    try:
+        limit = int(request.query.get("limit", settings.SYNC_STATE_PAGE_SIZE))
+        cursor = int(request.query["cursor"]) if "cursor" in request.query else None
+    except ValueError:
+        return web.json_response({"error": "limit and cursor must be integers"}, status=400)
+    if not 1 <= limit <= settings.SYNC_STATE_MAX_PAGE_SIZE:
+        return web.json_response(
+            {"error": f"limit must be between 1 and {settings.SYNC_STATE_MAX_PAGE_SIZE}"},
+            status=400,
+        )
+
+    items, next_cursor = sync_state_index.page(limit, cursor, request.query.get("status"))
+    return web.json_response({
+        "items": items,
+        "next_cursor": str(next_cursor) if next_cursor is not None else None,
+        "total": len(sync_state_index),
+    })
+
+
+async def sync_state_by_id(request: web.Request) -> web.Response:
+    """Sync state of one RFQ: GET /sync-state/{email_rfq_id}."""
+    return await _sync_state_one(request, "email_rfq_ids", request.match_info["email_rfq_id"])
+
+
+async def sync_state_by_number(request: web.Request) -> web.Response:
+    """Sync state of one RFQ: GET /sync-state/by-rfq-number/{rfq_number}."""
+    return await _sync_state_one(request, "rfq_numbers", request.match_info["rfq_number"])
+
+
+async def _sync_state_one(request: web.Request, kind: str, key: str) -> web.Response:
+    if not startup_tracker.ready:
+        return web.json_response({"error": "not ready"}, status=503)
+    from src.services.sync_state import sync_state_index
+
+    found = await sync_state_index.lookup(**{kind: [key]})
+    state = found[kind][key]
+    if state is None:
+        return web.json_response({"error": "not found"}, status=404)
+    return web.json_response(state)
+
+
+async def sync_state_lookup(request: web.Request) -> web.Response:
+    """
+    Bulk lookup: POST /sync-state/lookup
+    {"email_rfq_ids": [...], "rfq_numbers": [...]}; unknown RFQs map to null.
+    """
+    if not startup_tracker.ready:
+        return web.json_response({"error": "not ready"}, status=503)
+    from src.services.sync_state import sync_state_index
+
+    try:
+        body = await request.json()
+    except ValueError:
+        return web.json_response({"error": "body must be JSON"}, status=400)
+
+    keys = {}
+    for kind in ("email_rfq_ids", "rfq_numbers"):
+        values = body.get(kind, []) if isinstance(body, dict) else None
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return web.json_response({"error": f"{kind} must be a list of strings"}, status=400)
+        keys[kind] = values
+    if sum(len(values) for values in keys.values()) > settings.SYNC_STATE_MAX_LOOKUP:
+        return web.json_response(
+            {"error": f"at most {settings.SYNC_STATE_MAX_LOOKUP} keys per lookup"},
+            status=400,
+        )
+
+    return web.json_response(await sync_state_index.lookup(**keys))
+
+
+def create_app() -> web.Application:
+    """Build the HTTP application."""
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/ready", ready)
+    app.router.add_get("/debug/queries", query_report)
+    app.router.add_post("/admin/profile", start_profile)
+    app.router.add_get("/admin/profile", profile_status)
+    app.router.add_get("/sync-state", sync_state_list)
+    app.router.add_post("/sync-state/lookup", sync_state_lookup)
+    app.router.add_get("/sync-state/by-rfq-number/{rfq_number}", sync_state_by_number)
+    app.router.add_get("/sync-state/{email_rfq_id}", sync_state_by_id)
+    if settings.ENABLE_METRICS:
+        app.router.add_get("/metrics", metrics)
+    return app
+
+
+async def start_http_server(port: int = settings.METRICS_PORT) -> web.AppRunner:
+    """Start serving on port. Call cleanup() on the returned runner to stop."""
+    runner = web.AppRunner(create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    logger.info("HTTP server started", port=port)
+    return runner
@@ -3,7 +3,7 @@
 # Configuration for RFQ Sync Service
 # =============================================================================
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,15 +21,25 @@ class Settings(BaseSettings):
     KAFKA_BOOTSTRAP_SERVERS: str = "kafka:29092"
     KAFKA_CONSUMER_GROUP: str = "rfq-sync-service"
     KAFKA_AUTO_OFFSET_RESET: str = "latest"
-    KAFKA_ENABLE_AUTO_COMMIT: bool = True
+    KAFKA_ENABLE_AUTO_COMMIT: bool = False  # Offsets are committed once messages finish
+    KAFKA_COMMIT_INTERVAL_SECONDS: float = 5.0
     KAFKA_SESSION_TIMEOUT_MS: int = 30000
     KAFKA_MAX_POLL_RECORDS: int = 100
+    # Static membership: a restart that rejoins within the session timeout
+    # keeps its partitions without a rebalance. Off by default; when on, the
+    # instance id is KAFKA_GROUP_INSTANCE_ID, else the POD_NAME environment
+    # variable, and it needs stable pod names (StatefulSet). With neither
+    # set the consumer joins as a dynamic member
+    KAFKA_STATIC_MEMBERSHIP: bool = False
+    KAFKA_GROUP_INSTANCE_ID: Optional[str] = None
+    KAFKA_PARTITION_ASSIGNMENT_STRATEGY: str = "sticky"  # range, roundrobin or sticky
 
     # Topics
     TOPIC_RFQ_CREATED: str = "rfq.created"
     TOPIC_RFQ_UPDATED: str = "rfq.updated"
     TOPIC_RFQ_STATUS_CHANGED: str = "rfq.status.changed"
     TOPIC_RFQ_SYNC_TO_MEDUSA: str = "rfq.sync.to_medusa"
+    TOPIC_RFQ_SYNC_TO_MEDUSA_PRIORITY: str = "rfq.sync.to_medusa.priority"  # Always urgent lane
     TOPIC_RFQ_SYNC_TO_EMAIL: str = "rfq.sync.to_email_service"
     TOPIC_RFQ_SYNC_COMPLETED: str = "rfq.sync.completed"
     TOPIC_RFQ_DLQ: str = "rfq.dlq"
@@ -53,6 +63,15 @@ class Settings(BaseSettings):
     MEDUSA_DB_NAME: str = "klapp-backend"
     MEDUSA_DB_USER: str = "postgres"
     MEDUSA_DB_PASSWORD: str = "postgres"
+    # Opened in full at startup; one connection per sync worker plus reserved
+    MEDUSA_DB_POOL_MIN_SIZE: int = 10
+    MEDUSA_DB_POOL_MAX_SIZE: int = 10
+    # Query instrumentation: statements slower than this are logged with
+    # their parameter sizes; a share of them has its plan captured (reads
+    # under EXPLAIN ANALYZE, writes with plain EXPLAIN)
+    MEDUSA_DB_SLOW_STATEMENT_MS: int = 200
+    MEDUSA_DB_EXPLAIN_SAMPLE_RATE: float = 0.0
+    MEDUSA_DB_SLOW_LOG_SIZE: int = 50
 
     @property
     def MEDUSA_DATABASE_URL(self) -> str:
@@ -60,6 +79,24 @@ class Settings(BaseSettings):
             f"postgresql://{self.MEDUSA_DB_USER}:{self.MEDUSA_DB_PASSWORD}@{self.MEDUSA_DB_HOST}:{self.MEDUSA_DB_PORT}/{self.MEDUSA_DB_NAME}"
         )
 
+    # Medusa read replica (optional): idempotency lookups. Unset host
+    # routes all reads to the primary.
+    MEDUSA_READ_DB_HOST: Optional[str] = None
+    MEDUSA_READ_DB_PORT: int = 5432
+    MEDUSA_READ_DB_POOL_MIN_SIZE: int = 2
+    MEDUSA_READ_DB_POOL_MAX_SIZE: int = 10
+    # "confirm_negative": a replica miss is re-checked on the primary (safe
+    # before INSERT under replication lag); "trust_replica": replica is final
+    MEDUSA_READ_STALENESS_STRATEGY: str = "confirm_negative"
+
+    @property
+    def MEDUSA_READ_DATABASE_URL(self) -> Optional[str]:
+        if not self.MEDUSA_READ_DB_HOST:
+            return None
+        return (
+            f"postgresql://{self.MEDUSA_DB_USER}:{self.MEDUSA_DB_PASSWORD}@{self.MEDUSA_READ_DB_HOST}:{self.MEDUSA_READ_DB_PORT}/{self.MEDUSA_DB_NAME}"
+        )
+
     # Medusa API (alternative to direct DB)
     MEDUSA_API_URL: str = "http://medusa:9000"
     MEDUSA_API_KEY: Optional[str] = None
@@ -70,27 +107,103 @@ class Settings(BaseSettings):
     REDIS_KEY_PREFIX: str = "rfq_sync:"
     REDIS_LOCK_TIMEOUT: int = 30
 
-    # Circuit Breaker
-    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
-    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: int = 60
-    CIRCUIT_BREAKER_EXPECTED_EXCEPTION: str = "Exception"
-
-    # Retry Configuration
+    # Circuit Breakers (one each for Medusa DB, Redis and the Kafka producer).
+    # While a breaker is open, the topics that need it are paused and fetched
+    # messages are held for retry, not failed. Half-open lets a few calls
+    # through and fetches one partition per topic until the breaker closes
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive connection failures
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: int = 10  # Seconds open before half-open
+    CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS: int = 2
+    CIRCUIT_BREAKER_SUCCESS_THRESHOLD: int = 3  # Half-open successes to close
+    CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS: float = 1.0
+
+    # Retry Configuration. A message whose dependency call fails while the
+    # breaker is closed (the dependency is up, the message may be at fault)
+    # is retried with exponential backoff and dead-lettered after
+    # RETRY_MAX_ATTEMPTS, raised to CIRCUIT_BREAKER_FAILURE_THRESHOLD + 1 so
+    # the breaker trips first when the dependency is down. Calls refused or
+    # failed while the breaker is open or half-open are held for the outage
+    # instead and do not count
     RETRY_MAX_ATTEMPTS: int = 3
     RETRY_WAIT_EXPONENTIAL_MULTIPLIER: float = 1.0
     RETRY_WAIT_EXPONENTIAL_MAX: int = 60
 
+    # Duplicate Filter (keyed on event idempotency_key)
+    DEDUP_ENABLED: bool = True
+    DEDUP_LOCAL_WINDOW_SECONDS: int = 600
+    DEDUP_LOCAL_BUCKET_SECONDS: int = 60
+    DEDUP_BLOOM_ENABLED: bool = True
+    DEDUP_BLOOM_EXPECTED_ITEMS: int = 1_000_000
+    DEDUP_BLOOM_FALSE_POSITIVE_RATE: float = 0.001  # Hits are confirmed in Medusa DB
+    DEDUP_BLOOM_TTL_SECONDS: int = 86400 * 7
+
+    # Claim Check (oversized rfq_data stored out of band)
+    CLAIM_CHECK_THRESHOLD_BYTES: int = 256 * 1024
+    BLOB_STORE_BACKEND: str = "local"
+    BLOB_STORE_LOCAL_PATH: str = "/tmp/rfq-sync-blobs"
+
+    # Transformation: "reference" (RFQTransformer) or "compiled" (src/services/mapping.py,
+    # checked against the reference in tests/test_mapping.py)
+    TRANSFORM_ENGINE: str = "reference"
+
+    # Sync Workers / Priority Lanes (urgent, high, medium, low)
+    SYNC_WORKERS: int = 8
+    PRIORITY_RESERVED_URGENT_WORKERS: int = 2
+    PRIORITY_LANE_CAPACITY: int = 500
+    PRIORITY_LANE_WEIGHTS: Dict[str, int] = {"urgent": 8, "high": 4, "medium": 2, "low": 1}
+    PRIORITY_LANE_SLA_SECONDS: Dict[str, float] = {
+        "urgent": 5.0,
+        "high": 30.0,
+        "medium": 300.0,
+        "low": 1800.0,
+    }
+
+    # Message handlers (each topic's handler has its own queue and workers;
+    # the sync handler uses the priority lanes above)
+    SYNC_HANDLER_TIMEOUT_SECONDS: float = 120.0
+    STATUS_HANDLER_CONCURRENCY: int = 2
+    STATUS_HANDLER_QUEUE_SIZE: int = 200
+    STATUS_HANDLER_TIMEOUT_SECONDS: float = 10.0
+
+    # Sync state API (/sync-state): latest attempt per RFQ, held in memory and
+    # snapshotted to Redis so it survives restarts
+    SYNC_STATE_MAX_ENTRIES: int = 200_000  # Oldest attempts are evicted (and not restored) beyond this
+    SYNC_STATE_SNAPSHOT_INTERVAL_SECONDS: float = 15.0
+    SYNC_STATE_SNAPSHOT_BATCH: int = 1000  # Entries per Redis round trip
+    SYNC_STATE_SNAPSHOT_TTL_SECONDS: int = 86400 * 30  # Per RFQ, from its last snapshot
+    SYNC_STATE_PAGE_SIZE: int = 100
+    SYNC_STATE_MAX_PAGE_SIZE: int = 1000
+    SYNC_STATE_MAX_LOOKUP: int = 1000  # Keys per bulk lookup request
+
+    # Shutdown: in-flight messages get this long to finish on SIGTERM
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = 20.0
+
     # Batch Processing
     BATCH_SIZE: int = 50
     BATCH_TIMEOUT_SECONDS: int = 5
 
-    # Monitoring
+    # Monitoring (also serves /health and /ready)
     METRICS_PORT: int = 9100
     ENABLE_METRICS: bool = True
 
+    # Runtime profiling (SIGUSR1, or POST /admin/profile). The admin
+    # endpoints (/admin/profile, /debug/queries) are off unless enabled and
+    # ADMIN_TOKEN is set; callers send it as "Authorization: Bearer <token>"
+    PROFILE_ADMIN_ENABLED: bool = False
+    ADMIN_TOKEN: Optional[str] = None
+    PROFILE_OUTPUT_DIR: str = "/tmp/rfq-sync-profiles"
+    PROFILE_KEEP_RESULTS: int = 5  # Older result directories are deleted
+    PROFILE_DEFAULT_SECONDS: int = 30
+    PROFILE_MAX_SECONDS: int = 300
+    PROFILE_SLOW_CALLBACK_MS: int = 100
+    PROFILE_TRACEMALLOC_FRAMES: int = 10
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped, never block
+    LOG_SAMPLE_BURST: int = 10  # Per-message events logged per event per interval
+    LOG_SUMMARY_INTERVAL_SECONDS: int = 60
 
     model_config = SettingsConfigDict(
         env_file=".env",
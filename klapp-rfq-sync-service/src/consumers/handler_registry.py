@@ -0,0 +1,115 @@
+# =============================================================================
+# FILE: src/consumers/handler_registry.py
+# Topic / event type -> handler routing
+# =============================================================================
+
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from src.consumers.worker_pool import WorkerPool
+
+ErrorCallback = Callable[[Any, Exception], Awaitable[None]]
+DoneCallback = Callable[[Any], None]
+
+
+class HandlerPool(Protocol):
+    """What the consumer needs from a handler's worker pool."""
+
+    def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    def put(self, message: Any) -> None: ...
+
+    def full(self, message: Any) -> bool: ...
+
+    async def wait_for_room(self, message: Any) -> None: ...
+
+    def pending(self) -> int: ...
+
+    def get_metrics(self) -> Dict[str, int]: ...
+
+
+class MessageHandler(ABC):
+    """
+    Handles the messages routed to it by a HandlerRegistry.
+    Every handler runs on its own pool, sized by the class attributes, so
+    a slow or noisy topic only ever backs up its own queue.
+
+    dependencies names the circuit breakers (see src/services/breakers.py)
+    the handler needs; while one is open, the handler's topics are paused.
+    """
+
+    name: str = "handler"
+    concurrency: int = 4
+    queue_size: int = 100
+    timeout_seconds: Optional[float] = 30.0
+    dependencies: Tuple[str, ...] = ()
+
+    @abstractmethod
+    async def handle(self, message: Any) -> None:
+        """
+        Handle one message. Exceptions and timeouts send it to the DLQ;
+        DependencyUnavailable holds it for retry instead (see run_handler).
+        """
+
+    def create_pool(self, on_error: ErrorCallback, on_done: DoneCallback) -> HandlerPool:
+        """Build this handler's worker pool (FIFO by default)."""
+        return WorkerPool(
+            self.name,
+            self.handle,
+            concurrency=self.concurrency,
+            queue_size=self.queue_size,
+            timeout_seconds=self.timeout_seconds,
+            on_error=on_error,
+            on_done=on_done,
+        )
+
+
+class HandlerRegistry:
+    """
+    Maps topics, and optionally event types within a topic, to handlers.
+    A route with an event type wins over the topic's catch-all route.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, Optional[str]], MessageHandler] = {}
+
+    def register(
+        self,
+        handler: MessageHandler,
+        topics: Sequence[str],
+        event_types: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Route topics (restricted to event_types, if given) to handler."""
+        for other in self.handlers:
+            if other.name == handler.name and other is not handler:
+                raise ValueError(f"Handler name already registered: {handler.name}")
+        for topic in topics:
+            for event_type in event_types or (None,):
+                existing = self._routes.get((topic, event_type))
+                if existing is not None and existing is not handler:
+                    raise ValueError(
+                        f"Route {topic}/{event_type or '*'} already registered to {existing.name}"
+                    )
+                self._routes[(topic, event_type)] = handler
+
+    def resolve(self, topic: str, event_type: Optional[str] = None) -> Optional[MessageHandler]:
+        """Handler for a message, or None if nothing is registered."""
+        return self._routes.get((topic, event_type)) or self._routes.get((topic, None))
+
+    def handlers_for(self, topic: str) -> List[MessageHandler]:
+        """Handlers with a route on topic, each once."""
+        return list({
+            id(h): h for (route_topic, _), h in self._routes.items() if route_topic == topic
+        }.values())
+
+    @property
+    def topics(self) -> List[str]:
+        """Topics to subscribe to."""
+        return list(dict.fromkeys(topic for topic, _ in self._routes))
+
+    @property
+    def handlers(self) -> List[MessageHandler]:
+        """Registered handlers, each once."""
+        return list({id(h): h for h in self._routes.values()}.values())
@@ -0,0 +1,160 @@
+# =============================================================================
+# FILE: src/consumers/handlers.py
+# Message handlers and the default topic routing
+# =============================================================================
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+from src.config import settings
+from src.consumers.handler_registry import (
+    DoneCallback,
+    ErrorCallback,
+    HandlerPool,
+    HandlerRegistry,
+    MessageHandler,
+)
+from src.consumers.priority_scheduler import PriorityScheduler
+from src.models.events import SyncDirection, SyncStatus
+from src.models.internal import SyncOutcome, SyncWork
+from src.services.dedup_filter import duplicate_filter
+from src.services.sync_processor import sync_processor
+from src.services.transformer import transformer
+from src.utils.log_sampling import SampledLogger
+from src.utils.startup import startup_tracker
+
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
+
+# send(topic, value, key)
+Send = Callable[[str, Dict[str, Any], Optional[str]], Awaitable[None]]
+
+
+class SyncToMedusaHandler(MessageHandler):
+    """Syncs email-service RFQs into Medusa, scheduled by priority lane."""
+
+    name = "sync_to_medusa"
+    timeout_seconds = settings.SYNC_HANDLER_TIMEOUT_SECONDS
+    dependencies = ("medusa_db", "redis", "kafka_producer")
+
+    def __init__(self, send: Send):
+        self._send = send
+
+    def create_pool(self, on_error: ErrorCallback, on_done: DoneCallback) -> HandlerPool:
+        return PriorityScheduler(
+            self.handle,
+            lane_for=self.lane_for,
+            timeout_seconds=self.timeout_seconds,
+            on_error=on_error,
+            on_done=on_done,
+            name=self.name,
+        )
+
+    @staticmethod
+    def lane_for(message) -> str:
+        """
+        Priority lane for a sync request. Runs on the fetch loop, so a
+        malformed payload gets "medium" here and fails in handle() instead.
+        """
+        if message.topic == settings.TOPIC_RFQ_SYNC_TO_MEDUSA_PRIORITY:
+            return "urgent"
+        event = message.value
+        if not isinstance(event, dict):
+            return "medium"
+        # Claim-checked events carry priority at the top level, and in the ref
+        priority = None
+        for source in (event, event.get("rfq_data"), event.get("rfq_data_ref")):
+            priority = source.get("priority") if isinstance(source, dict) else None
+            if priority:
+                break
+        if not isinstance(priority, str):
+            return "medium"
+        return transformer.PRIORITY_MAP.get(priority, "medium")
+
+    async def handle(self, message) -> None:
+        """Handle sync request to Medusa."""
+        event = message.value
+        dedup_key = event.get("idempotency_key") or event.get("event_id")
+        if settings.DEDUP_ENABLED and await duplicate_filter.is_duplicate(
+            dedup_key, event.get("email_rfq_id")
+        ):
+            logger.debug("Discarding duplicate delivery", idempotency_key=dedup_key)
+            await self._publish_duplicate(event, duplicate_filter.synced_medusa_id(dedup_key))
+            return
+
+        request = SyncWork.from_event(event)
+        result = await sync_processor.process_sync_to_medusa(request)
+
+        if result.sync_status == SyncStatus.COMPLETED:
+            startup_tracker.record_synced()
+            if settings.DEDUP_ENABLED:
+                await duplicate_filter.mark_synced(dedup_key, result.medusa_rfq_id)
+
+        # Publish result
+        await self._send(
+            settings.TOPIC_RFQ_SYNC_COMPLETED,
+            result.to_event(settings.SERVICE_NAME),
+            result.rfq_number,
+        )
+
+        sampled_logger.info(
+            "Sync completed",
+            rfq_number=result.rfq_number,
+            sync_status=result.sync_status.value,
+            medusa_rfq_id=result.medusa_rfq_id,
+            duration_ms=result.duration_ms,
+        )
+
+    async def _publish_duplicate(self, event: Dict[str, Any], medusa_rfq_id: Optional[str]) -> None:
+        """
+        A redelivery of an RFQ that is already in Medusa still gets its
+        rfq.sync.completed event, as it did when the sync path found it.
+        """
+        now = datetime.utcnow()
+        result = SyncOutcome(
+            email_rfq_id=event.get("email_rfq_id", ""),
+            rfq_number=event.get("rfq_number", ""),
+            sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+            sync_status=SyncStatus.COMPLETED,
+            sync_started_at=now,
+            sync_completed_at=now,
+            duration_ms=0,
+            medusa_rfq_id=medusa_rfq_id,
+        )
+        await self._send(
+            settings.TOPIC_RFQ_SYNC_COMPLETED,
+            result.to_event(settings.SERVICE_NAME),
+            result.rfq_number,
+        )
+
+
+class StatusChangedHandler(MessageHandler):
+    """Status changes made in Medusa."""
+
+    name = "status_changed"
+    concurrency = settings.STATUS_HANDLER_CONCURRENCY
+    queue_size = settings.STATUS_HANDLER_QUEUE_SIZE
+    timeout_seconds = settings.STATUS_HANDLER_TIMEOUT_SECONDS
+
+    async def handle(self, message) -> None:
+        """Handle status change event."""
+        event = message.value
+        # Only process events from Medusa
+        if event.get("source_service") == settings.SERVICE_NAME:
+            return
+
+        sampled_logger.info("Status change", rfq_number=event.get("rfq_number"))
+        # TODO: Implement status sync if needed
+
+
+def build_default_registry(send: Send) -> HandlerRegistry:
+    """The service's topic routing. New topics are added here."""
+    registry = HandlerRegistry()
+    registry.register(
+        SyncToMedusaHandler(send),
+        [settings.TOPIC_RFQ_SYNC_TO_MEDUSA, settings.TOPIC_RFQ_SYNC_TO_MEDUSA_PRIORITY],
+    )
+    registry.register(StatusChangedHandler(), [settings.TOPIC_RFQ_STATUS_CHANGED])
+    return registry
@@ -0,0 +1,65 @@
+# =============================================================================
+# FILE: src/consumers/offset_tracker.py
+# Commit-safe offsets for out-of-order message processing
+# =============================================================================
+
+from collections import deque
+from typing import Deque, Dict, Iterable, Set
+
+from aiokafka.structs import TopicPartition
+
+
+class OffsetTracker:
+    """
+    Tracks dispatched and finished offsets per partition.
+
+    Handlers finish messages out of order, so a partition's committable
+    offset is one past its longest finished prefix. A commit therefore
+    never covers a message that is still queued or in progress.
+    """
+
+    def __init__(self):
+        self._pending: Dict[TopicPartition, Deque[int]] = {}
+        self._finished: Dict[TopicPartition, Set[int]] = {}
+        self._committable: Dict[TopicPartition, int] = {}
+        self._committed: Dict[TopicPartition, int] = {}
+
+    def track(self, tp: TopicPartition, offset: int) -> None:
+        """Record a dispatched message. Offsets arrive in order per partition."""
+        self._pending.setdefault(tp, deque()).append(offset)
+
+    def finish(self, tp: TopicPartition, offset: int) -> None:
+        """Record a finished message (handled, discarded or dead-lettered)."""
+        pending = self._pending.get(tp)
+        if pending is None:
+            return  # Partition was revoked meanwhile
+        finished = self._finished.setdefault(tp, set())
+        finished.add(offset)
+        while pending and pending[0] in finished:
+            done = pending.popleft()
+            finished.discard(done)
+            self._committable[tp] = done + 1
+
+    def in_flight(self) -> int:
+        """Dispatched messages not yet finished."""
+        return sum(len(pending) for pending in self._pending.values())
+
+    def to_commit(self) -> Dict[TopicPartition, int]:
+        """Offsets that have advanced since the last commit."""
+        return {
+            tp: offset
+            for tp, offset in self._committable.items()
+            if self._committed.get(tp) != offset
+        }
+
+    def committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        """Record a successful commit."""
+        self._committed.update(offsets)
+
+    def forget(self, partitions: Iterable[TopicPartition]) -> None:
+        """Drop state for revoked partitions."""
+        for tp in partitions:
+            self._pending.pop(tp, None)
+            self._finished.pop(tp, None)
+            self._committable.pop(tp, None)
+            self._committed.pop(tp, None)
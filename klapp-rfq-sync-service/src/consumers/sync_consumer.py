@@ -4,76 +4,252 @@
 # =============================================================================
 
 import json
-import logging
 import asyncio
-from typing import Optional
+import os
+import time
+from typing import Any, Awaitable, Dict, Optional, Set
 from datetime import datetime
 
-from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
-from aiokafka.errors import KafkaError
+import structlog
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer, ConsumerRebalanceListener
+from aiokafka.coordinator.assignors.range import RangePartitionAssignor
+from aiokafka.coordinator.assignors.roundrobin import RoundRobinPartitionAssignor
+from aiokafka.coordinator.assignors.sticky.sticky_assignor import StickyPartitionAssignor
+from aiokafka.errors import KafkaConnectionError, KafkaError
+from aiokafka.structs import TopicPartition
 
 from src.config import settings
-from src.models.events import RFQSyncRequest, SyncDirection, SyncStatus
-from src.services.sync_processor import sync_processor
+from src.consumers.handler_registry import HandlerPool, HandlerRegistry
+from src.consumers.handlers import build_default_registry
+from src.consumers.offset_tracker import OffsetTracker
+from src.services.breakers import BREAKERS, kafka_producer_breaker
+from src.utils.circuit_breaker import HALF_OPEN, OPEN, DependencyBreaker, DependencyUnavailable
+from src.utils.log_sampling import SampledLogger
+from src.utils.metrics import TOPIC_PAUSED, TOPIC_PAUSES
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
+
+
+def deserialize_value(m: bytes) -> dict:
+    return json.loads(m.decode("utf-8"))
+
+
+def deserialize_key(k: Optional[bytes]) -> Optional[str]:
+    return k.decode("utf-8") if k else None
+
+
+def serialize_value(v: dict) -> bytes:
+    return json.dumps(v, default=str).encode("utf-8")
+
+
+def serialize_key(k: Optional[str]) -> Optional[bytes]:
+    return k.encode("utf-8") if k else None
+
+
+# aiokafka has no cooperative assignor; sticky keeps the most partitions in place
+ASSIGNORS = {
+    "range": RangePartitionAssignor,
+    "roundrobin": RoundRobinPartitionAssignor,
+    "sticky": StickyPartitionAssignor,
+}
+
+
+def group_instance_id() -> Optional[str]:
+    """
+    Static group member id: configured, else the pod name, else None.
+    Never derived from the hostname: two consumers sharing an id fence
+    each other out of the group.
+    """
+    if not settings.KAFKA_STATIC_MEMBERSHIP:
+        return None
+    return settings.KAFKA_GROUP_INSTANCE_ID or os.environ.get("POD_NAME") or None
+
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    """Forwards partition changes to the SyncConsumer."""
+
+    def __init__(self, sync_consumer: "SyncConsumer"):
+        self._sync_consumer = sync_consumer
+
+    async def on_partitions_revoked(self, revoked: Set[TopicPartition]) -> None:
+        await self._sync_consumer._on_partitions_revoked(revoked)
+
+    async def on_partitions_assigned(self, assigned: Set[TopicPartition]) -> None:
+        self._sync_consumer._on_partitions_assigned(assigned)
 
 
 class SyncConsumer:
     """
     Kafka consumer for RFQ sync service.
-    Listens to sync topics and processes sync requests.
+    Routes each message to its handler's pool via the handler registry.
+    The fetch loop never waits on a handler: when a pool is full, the
+    message's topic is paused until the pool drains, so a backed-up topic
+    cannot hold up the others.
+
+    Offsets are committed manually, and only up to messages that have
+    finished. On shutdown, drain() lets in-flight work finish first.
+    A message that cannot be routed goes to the DLQ.
+
+    When a dependency's circuit breaker opens, every topic whose handlers
+    need it is paused, and messages already fetched are held by their
+    workers until the breaker lets calls through again. Half-open fetches
+    one partition per topic; the rest resume once the breaker closes.
     """
 
-    def __init__(self):
-        self._consumer: Optional[AIOKafkaConsumer] = None
-        self._producer: Optional[AIOKafkaProducer] = None
+    def __init__(
+        self,
+        consumer: Optional[AIOKafkaConsumer] = None,
+        producer: Optional[AIOKafkaProducer] = None,
+        registry: Optional[HandlerRegistry] = None,
+    ):
+        # Pre-built clients may be injected (e.g. in-process stand-ins)
+        self._consumer: Optional[AIOKafkaConsumer] = consumer
+        self._producer: Optional[AIOKafkaProducer] = producer
         self._is_running = False
+        self._producer_started = False
+        self._registry = registry or build_default_registry(self._send)
+        self._pools: Dict[str, HandlerPool] = {
+            handler.name: handler.create_pool(self._on_handler_error, self._on_message_done)
+            for handler in self._registry.handlers
+        }
+        self._paused_topics: Dict[str, asyncio.Task] = {}
+        self._topic_dependencies: Dict[str, Set[str]] = {
+            topic: {
+                dependency
+                for handler in self._registry.handlers_for(topic)
+                for dependency in handler.dependencies
+            }
+            for topic in self._registry.topics
+        }
+        self._manual_commit = not settings.KAFKA_ENABLE_AUTO_COMMIT
+        self._offsets = OffsetTracker()
+        self._commit_task: Optional[asyncio.Task] = None
+        self._dead_letters: Set[asyncio.Task] = set()
+        self._draining = False
 
-    async def start(self) -> None:
-        """Start consumer and producer."""
-        if self._is_running:
+    async def start_producer(self) -> None:
+        """Start the producer and load metadata for the topics it writes to."""
+        if self._producer_started:
             return
 
-        # Create consumer
-        self._consumer = AIOKafkaConsumer(
-            settings.TOPIC_RFQ_SYNC_TO_MEDUSA,
-            settings.TOPIC_RFQ_STATUS_CHANGED,
-            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-            group_id=settings.KAFKA_CONSUMER_GROUP,
-            auto_offset_reset=settings.KAFKA_AUTO_OFFSET_RESET,
-            enable_auto_commit=settings.KAFKA_ENABLE_AUTO_COMMIT,
-            session_timeout_ms=settings.KAFKA_SESSION_TIMEOUT_MS,
-            max_poll_records=settings.KAFKA_MAX_POLL_RECORDS,
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
-            key_deserializer=lambda k: k.decode("utf-8") if k else None,
-        )
-
         # Create producer for responses
-        self._producer = AIOKafkaProducer(
+        self._producer = self._producer or AIOKafkaProducer(
             bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-            value_serializer=lambda v: json.dumps(v, default=str).encode("utf-8"),
-            key_serializer=lambda k: k.encode("utf-8") if k else None,
+            value_serializer=serialize_value,
+            key_serializer=serialize_key,
             acks="all",
             enable_idempotence=True,
         )
+        await self._producer.start()
+        self._producer_started = True
+        kafka_producer_breaker.set_probe(self._probe_producer)
 
+        # Fetch metadata now so the first send does not wait for it
+        topics = (settings.TOPIC_RFQ_SYNC_COMPLETED, settings.TOPIC_RFQ_DLQ)
+        results = await asyncio.gather(
+            *(self._producer.partitions_for(topic) for topic in topics),
+            return_exceptions=True,
+        )
+        for topic, result in zip(topics, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to load topic metadata", topic=topic, error=str(result))
+
+    async def start(self) -> None:
+        """
+        Start producer, handler pools and consumer.
+        The consumer starts last, so nothing is fetched before the
+        producer and the handlers are ready for it.
+        """
+        if self._is_running:
+            return
+
+        await self.start_producer()
+        for pool in self._pools.values():
+            pool.start()
+
+        # Create consumer
+        if self._consumer is None:
+            self._consumer = AIOKafkaConsumer(
+                bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+                group_id=settings.KAFKA_CONSUMER_GROUP,
+                group_instance_id=group_instance_id(),
+                partition_assignment_strategy=(
+                    ASSIGNORS[settings.KAFKA_PARTITION_ASSIGNMENT_STRATEGY],
+                ),
+                auto_offset_reset=settings.KAFKA_AUTO_OFFSET_RESET,
+                enable_auto_commit=settings.KAFKA_ENABLE_AUTO_COMMIT,
+                session_timeout_ms=settings.KAFKA_SESSION_TIMEOUT_MS,
+                max_poll_records=settings.KAFKA_MAX_POLL_RECORDS,
+                value_deserializer=deserialize_value,
+                key_deserializer=deserialize_key,
+            )
+            self._consumer.subscribe(self._registry.topics, listener=_RebalanceListener(self))
         await self._consumer.start()
-        await self._producer.start()
         self._is_running = True
+        self._draining = False
+        for breaker in BREAKERS.values():
+            breaker.add_listener(self._on_breaker_change)
+        if self._manual_commit:
+            self._commit_task = asyncio.create_task(self._commit_loop())
 
         logger.info(
-            f"Sync consumer started, listening to: "
-            f"{settings.TOPIC_RFQ_SYNC_TO_MEDUSA}, {settings.TOPIC_RFQ_STATUS_CHANGED}"
+            "Sync consumer started",
+            topics=self._registry.topics,
+            handlers=list(self._pools),
+            group_instance_id=group_instance_id(),
+        )
+
+    async def drain(self, timeout: float = settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS) -> None:
+        """
+        Shutdown phase before stop(): stop fetching, give queued and
+        in-flight messages up to timeout to finish, flush the producer and
+        commit final offsets. Unfinished messages stay uncommitted and are
+        redelivered after restart.
+        """
+        if not self._is_running:
+            return
+
+        self._draining = True
+        started = time.monotonic()
+        self._refresh_pauses()
+        logger.info("Draining", pending=self.pending(), timeout_seconds=timeout)
+
+        while self.pending() and time.monotonic() - started < timeout:
+            await asyncio.sleep(0.1)
+        abandoned = self.pending()
+
+        try:
+            await self._producer.flush()
+        except Exception as e:
+            logger.error("Failed to flush producer", error=str(e))
+        if self._manual_commit:
+            await self._commit()
+
+        logger.info(
+            "Drain complete",
+            abandoned=abandoned,
+            duration_ms=round((time.monotonic() - started) * 1000, 1),
         )
 
     async def stop(self) -> None:
         """Stop consumer and producer."""
         self._is_running = False
+        for breaker in BREAKERS.values():
+            breaker.remove_listener(self._on_breaker_change)
+        if self._commit_task:
+            self._commit_task.cancel()
+            self._commit_task = None
+        for task in self._paused_topics.values():
+            task.cancel()
+        self._paused_topics = {}
+        for pool in self._pools.values():
+            await pool.stop()
         if self._consumer:
             await self._consumer.stop()
         if self._producer:
             await self._producer.stop()
+        self._producer_started = False
         logger.info("Sync consumer stopped")
 
     async def run(self) -> None:
@@ -83,89 +259,202 @@ class SyncConsumer:
 
         try:
             async for message in self._consumer:
-                await self._process_message(message)
+                self._dispatch(message)
         except KafkaError as e:
-            logger.error(f"Kafka error: {e}")
+            logger.error("Kafka error", error=str(e))
             raise
 
-    async def _process_message(self, message) -> None:
-        """Process a single message."""
+    def pending(self) -> int:
+        """Messages queued or in progress across all handlers, or on their way to the DLQ."""
+        return sum(pool.pending() for pool in self._pools.values()) + len(self._dead_letters)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth per handler, the paused topics and breaker states."""
+        return {
+            "handlers": {name: pool.get_metrics() for name, pool in self._pools.items()},
+            "paused_topics": list(self._paused_topics),
+            "breakers": {name: breaker.state for name, breaker in BREAKERS.items()},
+        }
+
+    def _dispatch(self, message) -> None:
+        """Hand a message to its handler's pool; pause the topic if the pool is full."""
         topic = message.topic
         value = message.value
-        key = message.key
+        event_type = value.get("event_type") if isinstance(value, dict) else None
 
-        logger.debug(f"Received message from {topic}: {key}")
+        logger.debug("Received message", topic=topic, key=message.key)
+
+        if self._manual_commit:
+            self._offsets.track(TopicPartition(topic, message.partition), message.offset)
 
         try:
-            if topic == settings.TOPIC_RFQ_SYNC_TO_MEDUSA:
-                await self._handle_sync_to_medusa(value)
-            elif topic == settings.TOPIC_RFQ_STATUS_CHANGED:
-                await self._handle_status_changed(value)
-            else:
-                logger.warning(f"Unknown topic: {topic}")
+            handler = self._registry.resolve(topic, event_type)
+            if handler is None:
+                logger.warning("Unknown topic", topic=topic, event_type=event_type)
+                self._on_message_done(message)
+                return
+            pool = self._pools[handler.name]
+            pool.put(message)
+        except Exception as e:
+            # Never let one message stop the fetch loop
+            task = asyncio.create_task(self._dead_letter(message, e))
+            self._dead_letters.add(task)
+            task.add_done_callback(self._dead_letters.discard)
+            return
 
+        try:
+            if pool.full(message) and topic not in self._paused_topics:
+                self._pause_topic(topic, pool.wait_for_room(message))
         except Exception as e:
-            logger.error(f"Error processing message from {topic}: {e}")
-            await self._send_to_dlq(topic, value, str(e))
+            # The message is queued and finishes through its pool
+            sampled_logger.error("Failed to check handler queue", topic=topic, error=str(e))
 
-    async def _handle_sync_to_medusa(self, event: dict) -> None:
-        """Handle sync request to Medusa."""
+    async def _dead_letter(self, message, error: Exception) -> None:
+        """A message that could not be routed: send it to the DLQ, then mark it finished."""
         try:
-            request = RFQSyncRequest(**event)
-            result = await sync_processor.process_sync_to_medusa(request)
-
-            # Publish result
-            await self._producer.send_and_wait(
-                topic=settings.TOPIC_RFQ_SYNC_COMPLETED,
-                value={
-                    "event_id": f"sync_completed_{result.email_rfq_id}",
-                    "event_type": "rfq.sync.completed",
-                    "event_timestamp": result.sync_completed_at.isoformat(),
-                    "source_service": settings.SERVICE_NAME,
-                    "idempotency_key": f"sync_completed_{result.email_rfq_id}",
-                    "email_rfq_id": result.email_rfq_id,
-                    "medusa_rfq_id": result.medusa_rfq_id,
-                    "rfq_number": result.rfq_number,
-                    "sync_direction": result.sync_direction.value,
-                    "sync_status": result.sync_status.value,
-                    "sync_started_at": result.sync_started_at.isoformat(),
-                    "sync_completed_at": result.sync_completed_at.isoformat(),
-                    "sync_duration_ms": result.duration_ms,
-                    "error_message": result.error_message,
-                },
-                key=result.rfq_number,
-            )
+            await self._on_handler_error(message, error)
+        finally:
+            self._on_message_done(message)
 
-            logger.info(
-                f"Sync {result.sync_status.value} for {result.rfq_number}: "
-                f"medusa_id={result.medusa_rfq_id}"
-            )
+    def _pause_topic(self, topic: str, room: Awaitable[None]) -> None:
+        """Stop fetching a topic until its handler has room again."""
+        self._paused_topics[topic] = asyncio.create_task(self._resume_when(topic, room))
+        self._refresh_pauses()
+        TOPIC_PAUSED.labels(topic=topic).set(1)
+        TOPIC_PAUSES.labels(topic=topic).inc()
+        sampled_logger.warning("Handler queue full, pausing topic", topic=topic)
 
-        except Exception as e:
-            logger.error(f"Failed to process sync request: {e}")
-            raise
+    async def _resume_when(self, topic: str, room: Awaitable[None]) -> None:
+        await room
+        del self._paused_topics[topic]
+        TOPIC_PAUSED.labels(topic=topic).set(0)
+        self._refresh_pauses()
+        if not self._draining:
+            sampled_logger.info("Resuming topic", topic=topic)
+
+    def _refresh_pauses(self) -> None:
+        """
+        Pause or resume each assigned partition. A partition is paused while
+        draining, while its topic's handler queue is full, or while a breaker
+        its topic depends on is open. While such a breaker is half-open, only
+        the topic's lowest partition is fetched, so trial calls get live
+        traffic without the whole backlog being pulled in.
+        """
+        assignment = self._consumer.assignment()
+        trial: Dict[str, TopicPartition] = {}
+        for tp in assignment:
+            if tp.topic not in trial or tp.partition < trial[tp.topic].partition:
+                trial[tp.topic] = tp
+
+        paused = self._consumer.paused()
+        to_pause, to_resume = [], []
+        for tp in assignment:
+            if self._should_pause(tp, trial[tp.topic] == tp):
+                if tp not in paused:
+                    to_pause.append(tp)
+            elif tp in paused:
+                to_resume.append(tp)
+        if to_pause:
+            self._consumer.pause(*to_pause)
+        if to_resume:
+            self._consumer.resume(*to_resume)
+
+    def _should_pause(self, tp: TopicPartition, trial: bool) -> bool:
+        if self._draining or tp.topic in self._paused_topics:
+            return True
+        states = {BREAKERS[name].state for name in self._topic_dependencies.get(tp.topic, ())}
+        if OPEN in states:
+            return True
+        return HALF_OPEN in states and not trial
 
-    async def _handle_status_changed(self, event: dict) -> None:
-        """Handle status change event."""
-        # Only process events from Medusa
-        if event.get("source_service") == settings.SERVICE_NAME:
+    def _on_breaker_change(self, breaker: DependencyBreaker) -> None:
+        """Pause or resume the topics that depend on a breaker that changed state."""
+        topics = [
+            topic for topic, dependencies in self._topic_dependencies.items()
+            if breaker.name in dependencies
+        ]
+        if not topics or not self._is_running:
             return
+        self._refresh_pauses()
+        log = logger.warning if breaker.state == OPEN else logger.info
+        log(
+            "Dependency breaker changed, adjusting fetch",
+            dependency=breaker.name,
+            state=breaker.state,
+            topics=topics,
+        )
 
-        logger.info(f"Status change: {event.get('rfq_number')}")
-        # TODO: Implement status sync if needed
+    def _on_message_done(self, message) -> None:
+        if self._manual_commit:
+            self._offsets.finish(TopicPartition(message.topic, message.partition), message.offset)
 
-    async def _send_to_dlq(self, topic: str, event: dict, error: str) -> None:
-        """Send failed message to DLQ."""
+    async def _commit(self) -> None:
+        """Commit offsets of finished messages on partitions still assigned."""
+        assigned = self._consumer.assignment()
+        offsets = {tp: offset for tp, offset in self._offsets.to_commit().items() if tp in assigned}
+        if not offsets:
+            return
         try:
-            await self._producer.send_and_wait(
-                topic=settings.TOPIC_RFQ_DLQ,
-                value={
-                    "original_topic": topic,
-                    "original_event": event,
-                    "failure_reason": error,
-                    "failure_timestamp": datetime.utcnow().isoformat(),
-                },
-                key=f"dlq_{datetime.utcnow().timestamp()}",
-            )
-        except Exception as e:
-            logger.error(f"Failed to send to DLQ: {e}")
+            await self._consumer.commit(offsets)
+            self._offsets.committed(offsets)
+        except KafkaError as e:
+            # Retried on the next commit; a rebalance commits on revoke
+            sampled_logger.warning("Offset commit failed", error=str(e))
+
+    async def _commit_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.KAFKA_COMMIT_INTERVAL_SECONDS)
+            await self._commit()
+
+    async def _on_partitions_revoked(self, revoked: Set[TopicPartition]) -> None:
+        """Commit what has finished before the partitions move elsewhere."""
+        if self._manual_commit:
+            await self._commit()
+            self._offsets.forget(revoked)
+        logger.info("Partitions revoked", partitions=len(revoked))
+
+    def _on_partitions_assigned(self, assigned: Set[TopicPartition]) -> None:
+        """Keep paused topics (and everything, while draining) paused."""
+        self._refresh_pauses()
+        logger.info("Partitions assigned", partitions=len(assigned))
+
+    async def _send(self, topic: str, value: Dict[str, Any], key: Optional[str]) -> None:
+        """Publish a message (handlers' output) through the producer's breaker."""
+        async with kafka_producer_breaker.guard():
+            await self._producer.send_and_wait(topic=topic, value=value, key=key)
+
+    async def _probe_producer(self) -> None:
+        """Circuit breaker probe: a metadata round trip to the cluster."""
+        async with kafka_producer_breaker.guard():
+            if not await self._producer.client.force_metadata_update():
+                raise KafkaConnectionError("Metadata update failed")
+
+    async def _on_handler_error(self, message, error: Exception) -> None:
+        """A handler failed or timed out: send the message to the DLQ."""
+        if isinstance(error, asyncio.TimeoutError):
+            reason = "Handler timed out"
+        else:
+            reason = str(error)
+        sampled_logger.error("Error processing message", topic=message.topic, error=reason)
+        await self._send_to_dlq(message.topic, message.value, reason)
+
+    async def _send_to_dlq(self, topic: str, event: dict, error: str) -> None:
+        """
+        Send failed message to DLQ. While the producer is down the message
+        is held until its breaker lets sends through, so it is not lost.
+        """
+        value = {
+            "original_topic": topic,
+            "original_event": event,
+            "failure_reason": error,
+            "failure_timestamp": datetime.utcnow().isoformat(),
+        }
+        while True:
+            try:
+                await self._send(settings.TOPIC_RFQ_DLQ, value, f"dlq_{datetime.utcnow().timestamp()}")
+                return
+            except DependencyUnavailable as e:
+                await e.breaker.wait()
+            except Exception as e:
+                logger.error("Failed to send to DLQ", topic=topic, error=str(e))
+                return
@@ -0,0 +1,180 @@
+# =============================================================================
+# FILE: src/consumers/worker_pool.py
+# Per-handler FIFO worker pool
+# =============================================================================
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+from src.utils.circuit_breaker import CLOSED, DependencyUnavailable
+from src.utils.metrics import (
+    DEPENDENCY_RETRIES,
+    DEPENDENCY_RETRIES_EXHAUSTED,
+    HANDLER_DURATION,
+    HANDLER_QUEUE_DEPTH,
+    HANDLER_TIMEOUTS,
+    MESSAGES_HELD,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+async def run_handler(
+    handler: Callable[[Any], Awaitable[None]],
+    message: Any,
+    timeout_seconds: Optional[float],
+    max_attempts: int = settings.RETRY_MAX_ATTEMPTS,
+) -> None:
+    """
+    Run a handler on a message, each attempt under the timeout.
+    If a dependency is down the message is held rather than failed: the
+    worker waits for the dependency's breaker to let calls through again
+    and retries. Its offset stays uncommitted the whole time.
+
+    A dependency call that fails while its breaker is closed counts as an
+    attempt and is retried after an exponential backoff; once the attempts
+    run out the DependencyUnavailable is raised, so the message is
+    dead-lettered. There are at least failure_threshold + 1 of them, so a
+    message on its own against a dependency that is down trips the breaker
+    (and is then held) before it can use them up: only a message that keeps
+    failing while other calls succeed is dead-lettered. Refusals and
+    failures while the breaker is open or half-open belong to the outage
+    and are not counted.
+    """
+    attempts = 0
+    while True:
+        try:
+            await asyncio.wait_for(handler(message), timeout_seconds)
+            return
+        except DependencyUnavailable as e:
+            dependency = e.breaker.name
+            held = MESSAGES_HELD.labels(dependency=dependency)
+            if e.state == CLOSED:
+                attempts += 1
+                if attempts >= max(max_attempts, e.breaker.failure_threshold + 1):
+                    DEPENDENCY_RETRIES_EXHAUSTED.labels(dependency=dependency).inc()
+                    raise
+                DEPENDENCY_RETRIES.labels(dependency=dependency).inc()
+            held.inc()
+            try:
+                if e.state == CLOSED:
+                    await asyncio.sleep(retry_backoff(attempts))
+                await e.breaker.wait()
+            finally:
+                held.dec()
+
+
+def retry_backoff(attempt: int) -> float:
+    """Seconds to wait before retrying after the attempt-th failure."""
+    return min(
+        settings.RETRY_WAIT_EXPONENTIAL_MULTIPLIER * 2 ** (attempt - 1),
+        settings.RETRY_WAIT_EXPONENTIAL_MAX,
+    )
+
+
+class WorkerPool:
+    """
+    Runs one handler's messages on a fixed number of workers, in arrival order.
+
+    put() never blocks. Once queue_size messages are waiting, full() reports
+    it and the caller stops feeding the pool (the consumer pauses the topic)
+    until wait_for_room() returns. Each message runs under a timeout;
+    failures and timeouts are passed to on_error, while messages whose
+    dependency is down are held and retried (see run_handler), up to a
+    limit of failed attempts while the dependency is up. on_done is
+    called for every message once it is finished, whatever the outcome.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        concurrency: int,
+        queue_size: int,
+        timeout_seconds: Optional[float],
+        on_error: Callable[[Any, Exception], Awaitable[None]],
+        on_done: Optional[Callable[[Any], None]] = None,
+    ):
+        self.name = name
+        self._handler = handler
+        self._concurrency = concurrency
+        self._queue_size = queue_size
+        self._timeout = timeout_seconds
+        self._on_error = on_error
+        self._on_done = on_done
+
+        self._queue: Deque[Any] = deque()
+        self._work_available = asyncio.Event()
+        self._dequeued = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight = 0
+
+    def start(self) -> None:
+        """Start worker tasks."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._concurrency)]
+        logger.info("Worker pool started", name=self.name, concurrency=self._concurrency)
+
+    async def stop(self) -> None:
+        """Cancel worker tasks. Queued messages are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def put(self, message: Any) -> None:
+        """Queue a message."""
+        self._queue.append(message)
+        HANDLER_QUEUE_DEPTH.labels(handler=self.name).inc()
+        self._work_available.set()
+
+    def full(self, message: Any = None) -> bool:
+        """Whether the queue is at capacity."""
+        return len(self._queue) >= self._queue_size
+
+    async def wait_for_room(self, message: Any = None) -> None:
+        """Wait until the queue has drained to half its capacity."""
+        while len(self._queue) > self._queue_size // 2:
+            self._dequeued.clear()
+            await self._dequeued.wait()
+
+    def pending(self) -> int:
+        """Queued plus in-progress messages."""
+        return len(self._queue) + self._in_flight
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get queue depth."""
+        return {"queued": len(self._queue), "in_flight": self._in_flight}
+
+    async def _worker(self) -> None:
+        while True:
+            if not self._queue:
+                self._work_available.clear()
+                await self._work_available.wait()
+                continue
+
+            message = self._queue.popleft()
+            self._in_flight += 1
+            self._dequeued.set()
+            HANDLER_QUEUE_DEPTH.labels(handler=self.name).dec()
+
+            start = time.monotonic()
+            try:
+                await run_handler(self._handler, message, self._timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    HANDLER_TIMEOUTS.labels(handler=self.name).inc()
+                await self._on_error(message, e)
+            finally:
+                self._in_flight -= 1
+                HANDLER_DURATION.labels(handler=self.name).observe(time.monotonic() - start)
+                if self._on_done:
+                    self._on_done(message)
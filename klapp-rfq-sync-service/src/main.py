@@ -4,45 +4,40 @@
 # =============================================================================
 
 import asyncio
-import logging
+import importlib
 import signal
 import sys
+from typing import Optional
+
+# Imported first: starts the startup clock
+from src.utils.startup import startup_tracker
 
 import structlog
 
 from src.config import settings
-from src.consumers.sync_consumer import SyncConsumer
-from src.services.medusa_db import get_medusa_db
-from src.services.redis_client import get_redis_client, close_redis_client
-
-# Configure logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json"
-        else structlog.dev.ConsoleRenderer(),
-    ],
-    wrapper_class=structlog.stdlib.BoundLogger,
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+from src.utils.log_sampling import flush_sampled_loggers, run_summary_flusher
+from src.utils.logging_config import configure_logging, shutdown_logging
+from src.utils.profiling import runtime_profiler
 
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format="%(message)s",
-)
+configure_logging()
 
 logger = structlog.get_logger()
 
 
+# Imported by _import_dependencies, off the event loop
+DEFERRED_IMPORTS = (
+    "src.consumers.sync_consumer",
+    "src.services.medusa_db",
+    "src.services.redis_client",
+    "src.services.sync_state",
+)
+
+
+def _import_dependencies() -> None:
+    for module in DEFERRED_IMPORTS:
+        importlib.import_module(module)
+
+
 async def main() -> None:
     """Main entry point."""
     logger.info(
@@ -51,37 +46,90 @@ async def main() -> None:
         version=settings.SERVICE_VERSION,
         environment=settings.ENVIRONMENT,
     )
+    summary_task = asyncio.create_task(run_summary_flusher())
+
+    # Serve /health right away; /ready stays 503 until warm-up is done
+    from src.api.server import start_http_server
+
+    http_runner = await start_http_server()
 
-    # Initialize connections
-    logger.info("Initializing database connections...")
-    await get_medusa_db()
-    await get_redis_client()
+    # Kafka, asyncpg and redis are only imported once the process is live,
+    # on a worker thread so the loop keeps serving /health meanwhile
+    with startup_tracker.phase("imports"):
+        await asyncio.get_running_loop().run_in_executor(None, _import_dependencies)
+        from src.consumers.sync_consumer import SyncConsumer
+        from src.services.medusa_db import get_medusa_db
+        from src.services.redis_client import get_redis_client, close_redis_client
+        from src.services.sync_state import sync_state_index
 
-    # Create and start consumer
     consumer = SyncConsumer()
 
+    # Warm up connections before anything is fetched. They are independent,
+    # so they run concurrently: ready after the slowest, not their sum.
+    async def warm_medusa_db() -> None:
+        with startup_tracker.phase("medusa_db"):
+            await get_medusa_db()
+
+    async def warm_redis() -> None:
+        with startup_tracker.phase("redis"):
+            redis = await get_redis_client()
+            await redis.ping()
+        with startup_tracker.phase("sync_state"):
+            await sync_state_index.restore()
+
+    async def warm_producer() -> None:
+        with startup_tracker.phase("kafka_producer"):
+            await consumer.start_producer()
+
+    await asyncio.gather(warm_medusa_db(), warm_redis(), warm_producer())
+    sync_state_index.start()
+
+    with startup_tracker.phase("kafka_consumer"):
+        await consumer.start()
+
+    startup_tracker.mark_ready()
+
     # Handle shutdown signals
     loop = asyncio.get_event_loop()
 
-    async def shutdown():
+    shutdown_task: Optional[asyncio.Task] = None
+
+    async def shutdown(drain: bool = True):
         logger.info("Shutting down...")
+        startup_tracker.mark_not_ready()
+        if drain:
+            await consumer.drain()
         await consumer.stop()
+        await sync_state_index.stop()
         await close_redis_client()
+        await http_runner.cleanup()
+        summary_task.cancel()
+        flush_sampled_loggers()
         logger.info("Shutdown complete")
+        shutdown_logging()
+
+    def request_shutdown():
+        nonlocal shutdown_task
+        if shutdown_task is None:
+            shutdown_task = asyncio.create_task(shutdown())
 
     for sig in (signal.SIGTERM, signal.SIGINT):
-        loop.add_signal_handler(
-            sig,
-            lambda: asyncio.create_task(shutdown()),
-        )
+        loop.add_signal_handler(sig, request_shutdown)
+
+    # SIGUSR1 profiles the running process (results under PROFILE_OUTPUT_DIR)
+    loop.add_signal_handler(signal.SIGUSR1, runtime_profiler.start)
 
     try:
         await consumer.run()
     except Exception as e:
         logger.error("Fatal error", error=str(e))
-        await shutdown()
+        await shutdown(drain=False)
         sys.exit(1)
 
+    # The consumer loop ends once shutdown has stopped it; let shutdown finish
+    if shutdown_task:
+        await shutdown_task
+
 
 if __name__ == "__main__":
     asyncio.run(main())
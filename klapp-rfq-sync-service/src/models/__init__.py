@@ -5,10 +5,16 @@ from .events import (
     LineItem,
     CustomerInfo,
     DeliveryInfo,
+    ClaimCheckRef,
     RFQSyncRequest,
     RFQSyncResult,
     MedusaRFQ,
 )
+from .internal import (
+    SyncWork,
+    MedusaRFQRecord,
+    SyncOutcome,
+)
 
 __all__ = [
     "SyncDirection",
@@ -16,7 +22,11 @@ __all__ = [
     "LineItem",
     "CustomerInfo",
     "DeliveryInfo",
+    "ClaimCheckRef",
     "RFQSyncRequest",
     "RFQSyncResult",
     "MedusaRFQ",
+    "SyncWork",
+    "MedusaRFQRecord",
+    "SyncOutcome",
 ]
@@ -7,7 +7,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List, Dict, Any
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class SyncDirection(str, Enum):
@@ -52,6 +52,14 @@ class DeliveryInfo(BaseModel):
     payment_terms: Optional[str] = None
 
 
+class ClaimCheckRef(BaseModel):
+    """Reference to an rfq_data payload stored out of band."""
+    uri: str
+    size_bytes: int
+    line_item_count: int = 0
+    priority: Optional[str] = None  # Copied from rfq_data for routing
+
+
 class RFQSyncRequest(BaseModel):
     """Request to sync RFQ."""
     event_id: str
@@ -63,12 +71,22 @@ class RFQSyncRequest(BaseModel):
 
     email_rfq_id: str
     rfq_number: str
-    rfq_data: Dict[str, Any]
+    rfq_data: Dict[str, Any] = Field(default_factory=dict)
+    rfq_data_ref: Optional[ClaimCheckRef] = None  # Set when rfq_data is claim-checked
 
     sync_direction: SyncDirection = SyncDirection.EMAIL_TO_MEDUSA
     retry_count: int = 0
     max_retries: int = 3
 
+    @model_validator(mode="after")
+    def _one_payload(self) -> "RFQSyncRequest":
+        """Exactly one of rfq_data (inline) and rfq_data_ref (claim-checked)."""
+        if self.rfq_data_ref is None and "rfq_data" not in self.model_fields_set:
+            raise ValueError("one of rfq_data or rfq_data_ref is required")
+        if self.rfq_data_ref is not None and self.rfq_data:
+            raise ValueError("rfq_data and rfq_data_ref are mutually exclusive")
+        return self
+
 
 class RFQSyncResult(BaseModel):
     """Result of sync operation."""
@@ -0,0 +1,191 @@
+# =============================================================================
+# FILE: src/models/internal.py
+# Slotted hot-path representations of in-flight sync work
+# =============================================================================
+#
+# Pydantic models in events.py validate data at the trust boundary (Kafka
+# events in, events out). Once validated, work is carried through the
+# pipeline in these plain slotted dataclasses: no per-instance __dict__, no
+# re-validation, and no defensive copies of nested dicts and lists.
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.models.events import (
+    ClaimCheckRef,
+    MedusaRFQ,
+    RFQSyncRequest,
+    RFQSyncResult,
+    SyncDirection,
+    SyncStatus,
+)
+
+
+@dataclass(slots=True)
+class SyncWork:
+    """A validated sync request in flight."""
+    event_id: str
+    idempotency_key: str
+    email_rfq_id: str
+    rfq_number: str
+    rfq_data: Dict[str, Any]
+    rfq_data_ref: Optional[ClaimCheckRef] = None
+    correlation_id: Optional[str] = None
+    sync_direction: SyncDirection = SyncDirection.EMAIL_TO_MEDUSA
+    retry_count: int = 0
+    max_retries: int = 3
+
+    @classmethod
+    def from_event(cls, event: Dict[str, Any]) -> "SyncWork":
+        """Validate a raw Kafka event and convert it."""
+        return cls.from_model(RFQSyncRequest(**event))
+
+    @classmethod
+    def from_model(cls, request: RFQSyncRequest) -> "SyncWork":
+        return cls(
+            event_id=request.event_id,
+            idempotency_key=request.idempotency_key,
+            email_rfq_id=request.email_rfq_id,
+            rfq_number=request.rfq_number,
+            rfq_data=request.rfq_data,
+            rfq_data_ref=request.rfq_data_ref,
+            correlation_id=request.correlation_id,
+            sync_direction=request.sync_direction,
+            retry_count=request.retry_count,
+            max_retries=request.max_retries,
+        )
+
+
+@dataclass(slots=True)
+class MedusaRFQRecord:
+    """RFQ in Medusa format, as passed to the INSERT. Mirrors MedusaRFQ."""
+    rfq_number: str
+    customer_email: str
+    external_id: str
+    customer_name: Optional[str] = None
+    customer_company: Optional[str] = None
+    customer_id: Optional[str] = None
+    company_id: Optional[str] = None
+    description: Optional[str] = None
+    line_items: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "received"
+    priority: str = "medium"
+    currency: str = "EUR"
+    estimated_value: Optional[float] = None
+    requirements: Optional[Dict[str, Any]] = None
+    delivery_address: Optional[Dict[str, Any]] = None
+    attachments: Optional[Dict[str, Any]] = None
+    ai_confidence_score: Optional[float] = None
+    ai_analysis: Optional[Dict[str, Any]] = None
+    external_source: str = "email"
+    sync_status: str = "synced"
+
+    def to_model(self) -> MedusaRFQ:
+        return MedusaRFQ(
+            rfq_number=self.rfq_number,
+            customer_email=self.customer_email,
+            customer_name=self.customer_name,
+            customer_company=self.customer_company,
+            customer_id=self.customer_id,
+            company_id=self.company_id,
+            description=self.description,
+            line_items=self.line_items,
+            status=self.status,
+            priority=self.priority,
+            currency=self.currency,
+            estimated_value=self.estimated_value,
+            requirements=self.requirements,
+            delivery_address=self.delivery_address,
+            attachments=self.attachments,
+            ai_confidence_score=self.ai_confidence_score,
+            ai_analysis=self.ai_analysis,
+            external_id=self.external_id,
+            external_source=self.external_source,
+            sync_status=self.sync_status,
+        )
+
+
+@dataclass(slots=True)
+class SyncOutcome:
+    """Result of a sync operation. Mirrors RFQSyncResult."""
+    email_rfq_id: str
+    rfq_number: str
+    sync_direction: SyncDirection
+    sync_status: SyncStatus
+    sync_started_at: datetime
+    sync_completed_at: datetime
+    duration_ms: int
+    medusa_rfq_id: Optional[str] = None
+    error_message: Optional[str] = None
+
+    def to_model(self) -> RFQSyncResult:
+        return RFQSyncResult(
+            email_rfq_id=self.email_rfq_id,
+            medusa_rfq_id=self.medusa_rfq_id,
+            rfq_number=self.rfq_number,
+            sync_direction=self.sync_direction,
+            sync_status=self.sync_status,
+            sync_started_at=self.sync_started_at,
+            sync_completed_at=self.sync_completed_at,
+            duration_ms=self.duration_ms,
+            error_message=self.error_message,
+        )
+
+    def to_event(self, source_service: str) -> Dict[str, Any]:
+        """Build the rfq.sync.completed event payload."""
+        return {
+            "event_id": f"sync_completed_{self.email_rfq_id}",
+            "event_type": "rfq.sync.completed",
+            "event_timestamp": self.sync_completed_at.isoformat(),
+            "source_service": source_service,
+            "idempotency_key": f"sync_completed_{self.email_rfq_id}",
+            "email_rfq_id": self.email_rfq_id,
+            "medusa_rfq_id": self.medusa_rfq_id,
+            "rfq_number": self.rfq_number,
+            "sync_direction": self.sync_direction.value,
+            "sync_status": self.sync_status.value,
+            "sync_started_at": self.sync_started_at.isoformat(),
+            "sync_completed_at": self.sync_completed_at.isoformat(),
+            "sync_duration_ms": self.duration_ms,
+            "error_message": self.error_message,
+        }
+
+
+@dataclass(slots=True)
+class SyncState:
+    """Latest sync attempt for one RFQ, as served by the sync state API."""
+    email_rfq_id: str
+    rfq_number: str
+    sync_status: str
+    last_attempt_at: datetime
+    medusa_rfq_id: Optional[str] = None
+    duration_ms: Optional[int] = None
+    error_message: Optional[str] = None
+    attempts: int = 1
+    sequence: int = 0  # Position in the index; not part of the state
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "email_rfq_id": self.email_rfq_id,
+            "rfq_number": self.rfq_number,
+            "sync_status": self.sync_status,
+            "medusa_rfq_id": self.medusa_rfq_id,
+            "last_attempt_at": self.last_attempt_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "error_message": self.error_message,
+            "attempts": self.attempts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SyncState":
+        return cls(
+            email_rfq_id=data["email_rfq_id"],
+            rfq_number=data["rfq_number"],
+            sync_status=data["sync_status"],
+            last_attempt_at=datetime.fromisoformat(data["last_attempt_at"]),
+            medusa_rfq_id=data.get("medusa_rfq_id"),
+            duration_ms=data.get("duration_ms"),
+            error_message=data.get("error_message"),
+            attempts=data.get("attempts", 1),
+        )
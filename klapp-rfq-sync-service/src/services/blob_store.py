@@ -0,0 +1,112 @@
+# =============================================================================
+# FILE: src/services/blob_store.py
+# Out-of-band storage for oversized event payloads
+# =============================================================================
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional
+
+import structlog
+
+from src.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class BlobStore(ABC):
+    """
+    Line-oriented blob storage.
+    Blobs are written once and read back as a stream of lines, so readers
+    never need to hold the whole blob in memory.
+    """
+
+    @abstractmethod
+    async def put(self, key: str, lines: Iterable[bytes]) -> str:
+        """Store lines under key. Returns the blob URI."""
+
+    @abstractmethod
+    def iter_lines(self, uri: str) -> AsyncIterator[bytes]:
+        """Stream the lines of a blob, without trailing newlines."""
+
+    @abstractmethod
+    async def delete(self, uri: str) -> None:
+        """Delete a blob."""
+
+
+class LocalFileBlobStore(BlobStore):
+    """
+    Blob store backed by a local directory.
+    Used for development and tests, or with a shared volume mount.
+    """
+
+    SCHEME = "file://"
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, base_dir: str = settings.BLOB_STORE_LOCAL_PATH):
+        self._base_dir = Path(base_dir).resolve()
+
+    def _path_for_uri(self, uri: str) -> Path:
+        if not uri.startswith(self.SCHEME):
+            raise ValueError(f"Unsupported blob URI: {uri}")
+        path = Path(uri[len(self.SCHEME):]).resolve()
+        if not path.is_relative_to(self._base_dir):
+            raise ValueError(f"Blob URI outside store: {uri}")
+        return path
+
+    async def put(self, key: str, lines: Iterable[bytes]) -> str:
+        path = (self._base_dir / key).resolve()
+        if not path.is_relative_to(self._base_dir):
+            raise ValueError(f"Invalid blob key: {key}")
+
+        def _write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                for line in lines:
+                    f.write(line)
+                    f.write(b"\n")
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(_write)
+        return f"{self.SCHEME}{path}"
+
+    async def iter_lines(self, uri: str) -> AsyncIterator[bytes]:
+        path = self._path_for_uri(uri)
+        f = await asyncio.to_thread(open, path, "rb")
+        try:
+            pending = b""
+            while True:
+                chunk = await asyncio.to_thread(f.read, self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                pending += chunk
+                *complete, pending = pending.split(b"\n")
+                for line in complete:
+                    if line:
+                        yield line
+            if pending:
+                yield pending
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete(self, uri: str) -> None:
+        path = self._path_for_uri(uri)
+        await asyncio.to_thread(path.unlink, True)
+
+
+# Singleton
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get or create the configured blob store."""
+    global _blob_store
+    if _blob_store is None:
+        if settings.BLOB_STORE_BACKEND != "local":
+            raise ValueError(f"Unknown blob store backend: {settings.BLOB_STORE_BACKEND}")
+        _blob_store = LocalFileBlobStore()
+        logger.info("Using local blob store", path=settings.BLOB_STORE_LOCAL_PATH)
+    return _blob_store
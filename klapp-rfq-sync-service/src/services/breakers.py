@@ -0,0 +1,56 @@
+# =============================================================================
+# FILE: src/services/breakers.py
+# Circuit breakers for the service's dependencies
+# =============================================================================
+
+import asyncio
+from typing import Dict
+
+import asyncpg
+from aiokafka.errors import KafkaError, KafkaTimeoutError
+from redis import exceptions as redis_exceptions
+
+from src.utils.circuit_breaker import DependencyBreaker
+
+
+def is_medusa_db_failure(error: BaseException) -> bool:
+    """
+    Lost or refused connections, including timing out while connecting
+    (see MedusaDBClient._acquire); not SQL or data errors. A statement
+    that timed out on a live connection is slow, not an outage.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return False
+    return isinstance(error, (
+        OSError,
+        asyncpg.PostgresConnectionError,
+        asyncpg.CannotConnectNowError,
+        asyncpg.TooManyConnectionsError,
+    ))
+
+
+def is_redis_failure(error: BaseException) -> bool:
+    """Connection errors and timeouts; not command errors."""
+    return isinstance(error, (
+        OSError,
+        redis_exceptions.ConnectionError,
+        redis_exceptions.TimeoutError,
+    ))
+
+
+def is_kafka_producer_failure(error: BaseException) -> bool:
+    """Connection errors, timeouts and other retriable broker errors."""
+    if isinstance(error, KafkaError):
+        return error.retriable or isinstance(error, KafkaTimeoutError)
+    return isinstance(error, OSError)
+
+
+medusa_db_breaker = DependencyBreaker("medusa_db", is_medusa_db_failure)
+redis_breaker = DependencyBreaker("redis", is_redis_failure)
+kafka_producer_breaker = DependencyBreaker("kafka_producer", is_kafka_producer_failure)
+
+# Keyed by the names handlers list in MessageHandler.dependencies
+BREAKERS: Dict[str, DependencyBreaker] = {
+    breaker.name: breaker
+    for breaker in (medusa_db_breaker, redis_breaker, kafka_producer_breaker)
+}
@@ -0,0 +1,107 @@
+# =============================================================================
+# FILE: src/services/claim_check.py
+# Claim-check handling for oversized rfq_data payloads
+# =============================================================================
+
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+import structlog
+
+from src.config import settings
+from src.models.events import ClaimCheckRef
+from src.services.blob_store import BlobStore, get_blob_store
+
+logger = structlog.get_logger(__name__)
+
+# Blob layout (JSON Lines):
+#   line 1:  rfq_data without "line_items"
+#   line 2+: one line item per line
+
+# rfq_data fields consumers route on; copied to the top level of a
+# claim-checked event so they can be read without opening the blob
+ROUTING_FIELDS = ("priority",)
+
+
+def _payload_lines(rfq_data: Dict[str, Any]) -> Iterator[bytes]:
+    header = {k: v for k, v in rfq_data.items() if k != "line_items"}
+    yield json.dumps(header, default=str).encode("utf-8")
+    for item in rfq_data.get("line_items", []):
+        yield json.dumps(item, default=str).encode("utf-8")
+
+
+async def check_in(
+    event: Dict[str, Any],
+    store: Optional[BlobStore] = None,
+) -> Dict[str, Any]:
+    """
+    Move an event's rfq_data out of band if it exceeds the threshold.
+    Returns the event to publish: unchanged, or with rfq_data replaced by
+    an rfq_data_ref claim check (and ROUTING_FIELDS copied to the top level).
+    """
+    rfq_data = event.get("rfq_data") or {}
+    size_bytes = len(json.dumps(rfq_data, default=str).encode("utf-8"))
+    if size_bytes <= settings.CLAIM_CHECK_THRESHOLD_BYTES:
+        return event
+
+    store = store or get_blob_store()
+    uri = await store.put(
+        f"rfq_data/{event['email_rfq_id']}/{event['event_id']}.jsonl",
+        _payload_lines(rfq_data),
+    )
+    ref = ClaimCheckRef(
+        uri=uri,
+        size_bytes=size_bytes,
+        line_item_count=len(rfq_data.get("line_items", [])),
+        priority=rfq_data.get("priority"),
+    )
+    logger.info("Checked in rfq_data", rfq_number=event.get("rfq_number"), size_bytes=size_bytes)
+
+    checked_in = {k: v for k, v in event.items() if k != "rfq_data"}
+    checked_in["rfq_data_ref"] = ref.model_dump()
+    for field in ROUTING_FIELDS:
+        if field in rfq_data:
+            checked_in.setdefault(field, rfq_data[field])
+    return checked_in
+
+
+async def check_out(
+    ref: ClaimCheckRef,
+    store: Optional[BlobStore] = None,
+) -> Tuple[Dict[str, Any], AsyncIterator[Dict[str, Any]]]:
+    """
+    Open a claim-checked payload.
+    Returns the rfq_data header and a lazy iterator over its line items.
+    The iterator must be consumed (or closed) to release the blob.
+    """
+    store = store or get_blob_store()
+    lines = store.iter_lines(ref.uri)
+
+    try:
+        header = json.loads(await lines.__anext__())
+    except StopAsyncIteration:
+        raise ValueError(f"Empty claim-check payload: {ref.uri}")
+    except Exception:
+        await lines.aclose()
+        raise
+
+    async def _line_items() -> AsyncIterator[Dict[str, Any]]:
+        try:
+            async for line in lines:
+                yield json.loads(line)
+        finally:
+            await lines.aclose()
+
+    return header, _line_items()
+
+
+async def release(ref: ClaimCheckRef, store: Optional[BlobStore] = None) -> None:
+    """
+    Delete a claim-checked payload once its sync has completed.
+    Errors are logged, never raised: a leftover blob is only wasted space.
+    """
+    store = store or get_blob_store()
+    try:
+        await store.delete(ref.uri)
+    except Exception as e:
+        logger.warning("Failed to delete claim-check blob", uri=ref.uri, error=str(e))
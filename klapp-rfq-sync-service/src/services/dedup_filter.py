@@ -0,0 +1,211 @@
+# =============================================================================
+# FILE: src/services/dedup_filter.py
+# Front-of-pipeline duplicate filter for sync deliveries
+# =============================================================================
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+from src.services.breakers import redis_breaker
+from src.services.medusa_db import get_medusa_db
+from src.services.redis_client import get_redis_client
+from src.utils.log_sampling import SampledLogger
+from src.utils.metrics import DUPLICATES_DISCARDED, DEDUP_BLOOM_FALSE_POSITIVES
+
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
+
+
+class DuplicateFilter:
+    """
+    Discards duplicate deliveries of already-synced events.
+
+    Two layers, checked in order:
+    - an in-process set of recently completed idempotency keys, split into
+      time buckets so old keys expire without per-key bookkeeping
+    - a Bloom filter stored as a Redis bitmap, shared by all replicas
+
+    A local hit is exact. A Bloom hit may be a false positive, so it is
+    confirmed against the Medusa DB before the event is discarded.
+
+    The local set also remembers each key's Medusa RFQ id, so the handler
+    can still publish rfq.sync.completed for a discarded redelivery.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = settings.DEDUP_LOCAL_WINDOW_SECONDS,
+        bucket_seconds: int = settings.DEDUP_LOCAL_BUCKET_SECONDS,
+        bloom_enabled: bool = settings.DEDUP_BLOOM_ENABLED,
+        expected_items: int = settings.DEDUP_BLOOM_EXPECTED_ITEMS,
+        false_positive_rate: float = settings.DEDUP_BLOOM_FALSE_POSITIVE_RATE,
+        bloom_ttl_seconds: int = settings.DEDUP_BLOOM_TTL_SECONDS,
+    ):
+        self._bucket_seconds = bucket_seconds
+        self._max_buckets = max(1, math.ceil(window_seconds / bucket_seconds))
+        # Per bucket: idempotency key -> Medusa RFQ id (None if not known)
+        self._buckets: "OrderedDict[int, Dict[str, Optional[str]]]" = OrderedDict()
+
+        self._bloom_enabled = bloom_enabled
+        self._bloom_ttl = bloom_ttl_seconds
+        self._bloom_bits, self._bloom_hashes = self.bloom_parameters(
+            expected_items, false_positive_rate
+        )
+
+        self._metrics = {
+            "local_hits": 0,
+            "bloom_hits_confirmed": 0,
+            "bloom_false_positives": 0,
+            "misses": 0,
+        }
+
+    @staticmethod
+    def bloom_parameters(expected_items: int, false_positive_rate: float) -> tuple[int, int]:
+        """Return (bit count, hash count) for the target false-positive rate."""
+        bits = math.ceil(
+            -expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)
+        )
+        hashes = max(1, round(bits / expected_items * math.log(2)))
+        return bits, hashes
+
+    async def is_duplicate(self, key: Optional[str], email_rfq_id: Optional[str]) -> bool:
+        """
+        Check whether an event with this idempotency key was already synced.
+        Errors never discard an event; the sync path's own idempotency check
+        stays authoritative.
+        """
+        if not key:
+            return False
+
+        if self._seen_locally(key):
+            self._metrics["local_hits"] += 1
+            DUPLICATES_DISCARDED.labels(layer="local").inc()
+            return True
+
+        if not self._bloom_enabled or not email_rfq_id:
+            self._metrics["misses"] += 1
+            return False
+
+        try:
+            if not await self._bloom_contains(key):
+                self._metrics["misses"] += 1
+                return False
+
+            medusa_db = await get_medusa_db()
+            existing = await medusa_db.find_rfq_by_external_id(email_rfq_id)
+        except Exception as e:
+            sampled_logger.warning(
+                "Duplicate filter check failed", idempotency_key=key, error=str(e)
+            )
+            return False
+
+        if existing:
+            self._metrics["bloom_hits_confirmed"] += 1
+            DUPLICATES_DISCARDED.labels(layer="bloom").inc()
+            self._remember_locally(key, existing.get("id"))
+            return True
+
+        self._metrics["bloom_false_positives"] += 1
+        DEDUP_BLOOM_FALSE_POSITIVES.inc()
+        return False
+
+    def synced_medusa_id(self, key: Optional[str]) -> Optional[str]:
+        """Medusa RFQ id of a key is_duplicate() has just reported."""
+        for keys in reversed(self._buckets.values()):
+            if key in keys:
+                return keys[key]
+        return None
+
+    async def mark_synced(self, key: Optional[str], medusa_rfq_id: Optional[str] = None) -> None:
+        """Record an idempotency key whose sync has completed."""
+        if not key:
+            return
+
+        self._remember_locally(key, medusa_rfq_id)
+
+        if not self._bloom_enabled:
+            return
+        try:
+            await self._bloom_add(key)
+        except Exception as e:
+            sampled_logger.warning(
+                "Failed to add key to duplicate filter", idempotency_key=key, error=str(e)
+            )
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get duplicate filter metrics."""
+        return self._metrics.copy()
+
+    # -------------------------------------------------------------------------
+    # Local time-bucketed set
+    # -------------------------------------------------------------------------
+
+    def _current_bucket(self) -> int:
+        bucket = int(time.monotonic() // self._bucket_seconds)
+        if bucket not in self._buckets:
+            self._buckets[bucket] = {}
+            while len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+        return bucket
+
+    def _seen_locally(self, key: str) -> bool:
+        self._current_bucket()
+        return any(key in keys for keys in self._buckets.values())
+
+    def _remember_locally(self, key: str, medusa_rfq_id: Optional[str]) -> None:
+        self._buckets[self._current_bucket()][key] = medusa_rfq_id
+
+    # -------------------------------------------------------------------------
+    # Redis bitmap Bloom filter
+    # -------------------------------------------------------------------------
+
+    def _bloom_keys(self) -> List[str]:
+        """Current and previous generation; each generation lives for one TTL."""
+        generation = int(time.time() // self._bloom_ttl)
+        prefix = f"{settings.REDIS_KEY_PREFIX}dedup:bloom:"
+        return [f"{prefix}{generation}", f"{prefix}{generation - 1}"]
+
+    def _bloom_offsets(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._bloom_bits for i in range(self._bloom_hashes)]
+
+    async def _bloom_contains(self, key: str) -> bool:
+        redis = await get_redis_client()
+        offsets = self._bloom_offsets(key)
+        bloom_keys = self._bloom_keys()
+
+        pipe = redis.pipeline(transaction=False)
+        for bloom_key in bloom_keys:
+            for offset in offsets:
+                pipe.getbit(bloom_key, offset)
+        async with redis_breaker.guard():
+            bits = await pipe.execute()
+
+        count = len(offsets)
+        return any(
+            all(bits[i * count:(i + 1) * count])
+            for i in range(len(bloom_keys))
+        )
+
+    async def _bloom_add(self, key: str) -> None:
+        redis = await get_redis_client()
+        bloom_key = self._bloom_keys()[0]
+
+        pipe = redis.pipeline(transaction=False)
+        for offset in self._bloom_offsets(key):
+            pipe.setbit(bloom_key, offset, 1)
+        pipe.expire(bloom_key, self._bloom_ttl * 2)
+        async with redis_breaker.guard():
+            await pipe.execute()
+
+
+# Singleton
+duplicate_filter = DuplicateFilter()
@@ -0,0 +1,298 @@
+# =============================================================================
+# FILE: src/services/mapping.py
+# Declarative field mappings, compiled into batch transform functions
+# =============================================================================
+
+import ast
+import dataclasses
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.models.internal import MedusaRFQRecord
+from src.services.transformer import RFQTransformer
+
+# Email service RFQ -> Medusa RFQ. Mirrors RFQTransformer.transform_email_to_record,
+# which stays the reference implementation (see tests/test_mapping.py)
+EMAIL_TO_MEDUSA_MAPPING: Dict[str, Any] = {
+    "rfq_number": {"path": "rfq_number", "default": ""},
+    "customer_email": {"path": "customer.email", "default": ""},
+    "customer_name": {"path": "customer.name"},
+    "customer_company": {"path": "customer.company"},
+    "description": {"first_of": [
+        {"path": "description"},
+        {"path": "title"},
+        {"summary": {
+            "path": "line_items",
+            "field": "description",
+            "default": "",
+            "limit": 3,
+            "separator": "; ",
+            "more": " (+{more} more items)",
+        }},
+    ]},
+    "line_items": {"each": "line_items", "fields": {
+        "description": {"path": "description", "default": ""},
+        "quantity": {"path": "quantity", "default": 1},
+        "unit": {"path": "unit", "default": "pcs"},
+        "part_number": {"path": "part_number"},
+        "manufacturer": {"path": "manufacturer"},
+        "specifications": {"path": "specifications", "default": {}},
+        "unit_price": {"path": "unit_price"},
+        "total_price": {"path": "total_price"},
+    }},
+    "status": {
+        "path": "status",
+        "default": "received",
+        "map": RFQTransformer.EMAIL_TO_MEDUSA_STATUS,
+        "map_default": "received",
+    },
+    "priority": {
+        "path": "priority",
+        "default": "medium",
+        "map": RFQTransformer.PRIORITY_MAP,
+        "map_default": "medium",
+    },
+    "currency": {"path": "currency", "default": "EUR"},
+    "estimated_value": {"path": "estimated_value"},
+    "delivery_address": {"from": "delivery", "fields": {
+        "city": {"path": "city"},
+        "country": {"path": "country"},
+        "address": {"path": "address"},
+        "required_date": {"path": "required_date"},
+        "payment_terms": {"path": "payment_terms"},
+        "special_instructions": {"path": "special_instructions"},
+    }},
+    "ai_confidence_score": {"path": "ai_confidence_score"},
+    "ai_analysis": {"fields": {
+        "source": {"const": "email"},
+        "email_rfq_id": {"path": "email_rfq_id"},
+        "confidence": {"path": "ai_confidence_score"},
+        "language": {"path": "language"},
+    }},
+    "external_id": {"path": "email_rfq_id", "default": "", "type": "str"},
+    "external_source": {"const": "email"},
+}
+
+SOURCE_KEYS = ("path", "const", "first_of", "summary", "fields", "each")
+NODE_KEYS = {
+    "path": {"default", "map", "map_default", "type"},
+    "const": set(),
+    "first_of": {"map", "map_default", "type"},
+    "summary": {"map", "map_default", "type"},
+    "fields": {"from"},
+    "each": {"fields"},
+}
+SUMMARY_KEYS = {"path", "field", "default", "limit", "separator", "more"}
+TYPES = {"str": "str", "int": "int", "float": "float", "bool": "bool"}
+
+ROOT = "r"  # Variable holding the source record in generated code
+
+
+class CompiledMapping:
+    """
+    A declarative mapping spec compiled into a specialized transform function.
+
+    The spec maps each target field to a node (plain data, so it can be
+    edited without touching code). A node has one source:
+    - {"path": "a.b", "default": x}: nested lookup; default if the last key is missing
+    - {"const": x}
+    - {"first_of": [node, ...]}: first truthy value, like chained `or`
+    - {"summary": {"path", "field", "default", "limit", "separator", "more"}}:
+      joins field of a list's first limit elements, "more" is appended
+      (formatted with the remaining count) if there are more; it is
+      skipped by first_of when the list is empty
+    - {"fields": {name: node}, "from": "a.b"}: an object; with "from", its
+      paths are relative to that value and a falsy value gives None
+    - {"each": "a.b", "fields": {name: node}}: one object per list element
+    and optionally "map" (with "map_default") and "type" ("str", "int", ...).
+
+    Compiling generates Python source for one function: nested values used
+    more than once are looked up once, every field is an inline expression
+    and the target is built positionally. Compile once (at import);
+    transforming is then free of per-field interpretation.
+    """
+
+    def __init__(self, spec: Dict[str, Any], target: type = MedusaRFQRecord, name: str = "mapping"):
+        self.name = name
+        self._namespace: Dict[str, Any] = {"_E": {}, "_SKIP": object(), "_T": target}
+        self._lines: List[str] = []
+        self._locals: Dict[Tuple, str] = {}
+        self._counter = 0
+
+        target_fields = {f.name: f for f in dataclasses.fields(target)}
+        unknown = set(spec) - set(target_fields)
+        if unknown:
+            raise ValueError(f"{name}: unknown target fields {sorted(unknown)}")
+
+        args = []
+        for field_name, target_field in target_fields.items():
+            if field_name in spec:
+                args.append(self._expr(spec[field_name], ROOT, field_name))
+            elif target_field.default is not dataclasses.MISSING:
+                args.append(self._const(target_field.default))
+            else:
+                args.append(f"{self._bind('factory', target_field.default_factory)}()")
+
+        body = "".join(f"    {line}\n" for line in self._lines)
+        self.source = f"def transform({ROOT}):\n{body}    return _T(\n"
+        self.source += "".join(f"        {arg},\n" for arg in args) + "    )\n"
+        exec(compile(self.source, f"<mapping {name}>", "exec"), self._namespace)
+        self._transform: Callable[[Dict[str, Any]], Any] = self._namespace["transform"]
+
+    def transform(self, record: Dict[str, Any]) -> Any:
+        """Transform a single source record."""
+        return self._transform(record)
+
+    def transform_batch(self, records: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Transform a batch of source records, in order."""
+        return list(map(self._transform, records))
+
+    # -------------------------------------------------------------------------
+    # Code generation
+    # -------------------------------------------------------------------------
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"_{prefix}{self._counter}"
+
+    def _bind(self, prefix: str, value: Any) -> str:
+        """Put a value in the function's namespace; returns its name."""
+        name = self._name(prefix)
+        self._namespace[name] = value
+        return name
+
+    def _const(self, value: Any) -> str:
+        """Source for a constant: a literal (fresh per call) when possible."""
+        try:
+            if ast.literal_eval(repr(value)) == value:
+                return repr(value)
+        except (ValueError, SyntaxError):
+            pass
+        return self._bind("c", value)
+
+    def _local(self, parts: Tuple[str, ...], default: str = "_E") -> str:
+        """A local holding the record's value at parts, looked up once."""
+        key = (parts, default)
+        if key not in self._locals:
+            parent = self._local(parts[:-1]) if len(parts) > 1 else ROOT
+            name = self._name("v")
+            self._lines.append(f"{name} = {parent}.get({parts[-1]!r}, {default})")
+            self._locals[key] = name
+        return self._locals[key]
+
+    def _lookup(self, path: str, default: Optional[str], scope: str) -> str:
+        """Expression for a dotted path under scope (the record or a list element)."""
+        parts = tuple(path.split("."))
+        tail = f"{parts[-1]!r}" if default is None else f"{parts[-1]!r}, {default}"
+        if scope == ROOT:
+            parent = self._local(parts[:-1]) if len(parts) > 1 else ROOT
+            return f"{parent}.get({tail})"
+        expr = scope
+        for part in parts[:-1]:
+            expr = f"{expr}.get({part!r}, _E)"
+        return f"{expr}.get({tail})"
+
+    def _value(self, path: str, default: str, scope: str) -> str:
+        """Like _lookup, but held in a local when under the record."""
+        if scope != ROOT:
+            return self._lookup(path, default, scope)
+        return self._local(tuple(path.split(".")), default)
+
+    def _expr(self, node: Any, scope: str, where: str) -> str:
+        """Expression for a node."""
+        if not isinstance(node, dict):
+            raise ValueError(f"{self.name}.{where}: node must be an object")
+        sources = [key for key in SOURCE_KEYS if key in node]
+        if not sources or (len(sources) > 1 and sources != ["fields", "each"]):
+            raise ValueError(f"{self.name}.{where}: expected one of {SOURCE_KEYS}")
+        source = "each" if "each" in node else sources[0]
+        extra = set(node) - NODE_KEYS[source] - {source}
+        if extra:
+            raise ValueError(f"{self.name}.{where}: unexpected keys {sorted(extra)}")
+
+        if source == "path":
+            default = self._const(node["default"]) if "default" in node else None
+            expr = self._lookup(node["path"], default, scope)
+        elif source == "const":
+            expr = self._const(node["const"])
+        elif source == "first_of":
+            expr = self._first_of(node["first_of"], scope, where)
+        elif source == "summary":
+            expr = f"(None if (_s := {self._summary(node['summary'], scope, where)}) is _SKIP else _s)"
+        elif source == "fields":
+            expr = self._object(node, scope, where)
+        else:
+            expr = self._each(node, scope, where)
+
+        if "map" in node:
+            mapping = self._bind("map", dict(node["map"]))
+            if "map_default" in node:
+                expr = f"{mapping}.get({expr}, {self._const(node['map_default'])})"
+            else:
+                expr = f"{mapping}.get((_m := {expr}), _m)"
+        if "type" in node:
+            if node["type"] not in TYPES:
+                raise ValueError(f"{self.name}.{where}: unknown type {node['type']!r}")
+            expr = f"{TYPES[node['type']]}({expr})"
+        return expr
+
+    def _first_of(self, nodes: List[Any], scope: str, where: str) -> str:
+        """
+        First truthy value. A summary is only allowed last: when its list is
+        empty it is skipped, leaving the previous value (as `a or b` would).
+        """
+        if not nodes:
+            raise ValueError(f"{self.name}.{where}: first_of needs at least one node")
+        for node in nodes[:-1]:
+            if isinstance(node, dict) and "summary" in node:
+                raise ValueError(f"{self.name}.{where}: summary must be last in first_of")
+
+        last = nodes[-1]
+        if len(nodes) > 1 and isinstance(last, dict) and set(last) == {"summary"}:
+            exprs = [self._expr(node, scope, f"{where}[{i}]") for i, node in enumerate(nodes[:-1])]
+            previous = self._name("p")
+            head = " or ".join(exprs[:-1] + [f"({previous} := {exprs[-1]})"])
+            summary = self._summary(last["summary"], scope, where)
+            return f"({head} or ({previous} if (_s := {summary}) is _SKIP else _s))"
+
+        exprs = [self._expr(node, scope, f"{where}[{i}]") for i, node in enumerate(nodes)]
+        return f"({' or '.join(exprs)})"
+
+    def _summary(self, spec: Any, scope: str, where: str) -> str:
+        if not isinstance(spec, dict) or not {"path", "field"} <= set(spec) or set(spec) - SUMMARY_KEYS:
+            raise ValueError(f"{self.name}.{where}: summary needs path and field, and only {sorted(SUMMARY_KEYS)}")
+        items = self._value(spec["path"], "[]", scope)
+        limit = int(spec.get("limit", 3))
+        separator = self._const(spec.get("separator", "; "))
+        default = self._const(spec.get("default", ""))
+        item = self._name("i")
+        joined = (
+            f"{separator}.join([{item}.get({spec['field']!r}, {default}) "
+            f"for {item} in {items}[:{limit}]])"
+        )
+        if spec.get("more"):
+            more = self._bind("more", spec["more"])
+            joined = f"({joined} + ({more}.format(more=len({items}) - {limit}) if len({items}) > {limit} else ''))"
+        return f"({joined} if {items} else _SKIP)"
+
+    def _object(self, node: Dict[str, Any], scope: str, where: str) -> str:
+        fields = node["fields"]
+        if not isinstance(fields, dict):
+            raise ValueError(f"{self.name}.{where}: fields must be an object")
+        inner = self._value(node["from"], "_E", scope) if "from" in node else scope
+        items = ", ".join(
+            f"{key!r}: {self._expr(child, inner, f'{where}.{key}')}"
+            for key, child in fields.items()
+        )
+        if "from" in node:
+            return f"({{{items}}} if {inner} else None)"
+        return f"{{{items}}}"
+
+    def _each(self, node: Dict[str, Any], scope: str, where: str) -> str:
+        items = self._value(node["each"], "[]", scope)
+        item = self._name("i")
+        element = self._object({"fields": node.get("fields", {})}, item, f"{where}[]")
+        return f"[{element} for {item} in {items}]"
+
+
+# Compiled once, at import
+email_to_medusa_mapping = CompiledMapping(EMAIL_TO_MEDUSA_MAPPING, MedusaRFQRecord, "email_to_medusa")
@@ -3,16 +3,122 @@
 # Direct database client for MedusaJS PostgreSQL
 # =============================================================================
 
-import logging
-from typing import Optional, Dict, Any
+import asyncio
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Optional, Dict, Any, AsyncIterator, Tuple, Union
 from datetime import datetime
+from uuid import uuid4
 import asyncpg
+import structlog
 from asyncpg import Pool
+from asyncpg.prepared_stmt import PreparedStatement
 
 from src.config import settings
 from src.models.events import MedusaRFQ
+from src.models.internal import MedusaRFQRecord
+from src.services.breakers import medusa_db_breaker
+from src.services.query_stats import query_stats
+from src.utils.log_sampling import SampledLogger
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
+
+FIND_RFQ_BY_EXTERNAL_ID_SQL = """
+    SELECT id, rfq_number, status, external_id, sync_status
+    FROM rfq
+    WHERE external_id = $1
+    LIMIT 1
+"""
+
+UPDATE_RFQ_STATUS_SQL = """
+    UPDATE rfq
+    SET status = $1, updated_at = $2
+    WHERE id = $3
+"""
+
+INSERT_RFQ_SQL = """
+    INSERT INTO rfq (
+        id, rfq_number, customer_id, company_id,
+        customer_email, customer_company, customer_name,
+        description, line_items, status, priority,
+        estimated_value, currency, requirements,
+        delivery_address, attachments,
+        ai_confidence_score, ai_analysis,
+        external_id, external_source, sync_status, synced_at,
+        created_at, updated_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11,
+        $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24
+    )
+"""
+
+# Named statements, prepared on every pooled connection when it is opened
+STATEMENTS: Dict[str, str] = {
+    "find_rfq_by_external_id": FIND_RFQ_BY_EXTERNAL_ID_SQL,
+    "insert_rfq": INSERT_RFQ_SQL,
+    "update_rfq_status": UPDATE_RFQ_STATUS_SQL,
+}
+READ_STATEMENTS = ("find_rfq_by_external_id",)
+
+
+def _rows_affected(status: Optional[str]) -> int:
+    """Row count from a command tag such as "INSERT 0 1" or "SELECT 3"."""
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except (AttributeError, ValueError):
+        return 0
+
+
+def _param_size(value: Any) -> int:
+    """Approximate size of a statement parameter, in bytes."""
+    if value is None:
+        return 0
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (list, tuple)):
+        return sum(_param_size(v) for v in value)
+    return len(str(value))
+
+
+def build_insert_args(
+    rfq_id: str,
+    rfq: Union[MedusaRFQ, MedusaRFQRecord],
+    line_items_json: Optional[str] = None,
+) -> tuple:
+    """Build the positional arguments for INSERT_RFQ_SQL."""
+    now = datetime.utcnow()
+    return (
+        rfq_id,
+        rfq.rfq_number,
+        rfq.customer_id,
+        rfq.company_id,
+        rfq.customer_email,
+        rfq.customer_company,
+        rfq.customer_name,
+        rfq.description,
+        line_items_json if line_items_json is not None else json.dumps(rfq.line_items),
+        rfq.status,
+        rfq.priority,
+        rfq.estimated_value,
+        rfq.currency,
+        json.dumps(rfq.requirements) if rfq.requirements else None,
+        json.dumps(rfq.delivery_address) if rfq.delivery_address else None,
+        json.dumps(rfq.attachments) if rfq.attachments else None,
+        rfq.ai_confidence_score,
+        json.dumps(rfq.ai_analysis) if rfq.ai_analysis else None,
+        rfq.external_id,
+        rfq.external_source,
+        "synced",
+        now,
+        now,
+        now,
+    )
 
 
 class MedusaDBClient:
@@ -23,98 +129,217 @@ class MedusaDBClient:
 
     def __init__(self):
         self._pool: Optional[Pool] = None
+        self._read_pool: Optional[Pool] = None
+        # (pool role, backend pid) -> {statement name: prepared statement}
+        self._prepared: Dict[Tuple[str, int], Dict[str, PreparedStatement]] = {}
+        self._explain_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
-        """Connect to Medusa database."""
+        """
+        Connect to Medusa database (and read replica, if configured).
+        Pools are opened at their minimum size up front, and every new
+        connection prepares the hot statements before it is handed out.
+        """
         if self._pool:
             return
 
         self._pool = await asyncpg.create_pool(
             dsn=settings.MEDUSA_DATABASE_URL,
-            min_size=2,
-            max_size=10,
+            min_size=settings.MEDUSA_DB_POOL_MIN_SIZE,
+            max_size=settings.MEDUSA_DB_POOL_MAX_SIZE,
             command_timeout=30,
+            init=partial(self._init_connection, "primary"),
         )
-        logger.info("Connected to Medusa database")
+        logger.info("Connected to Medusa database", pool_size=self._pool.get_size())
+
+        if settings.MEDUSA_READ_DATABASE_URL:
+            self._read_pool = await asyncpg.create_pool(
+                dsn=settings.MEDUSA_READ_DATABASE_URL,
+                min_size=settings.MEDUSA_READ_DB_POOL_MIN_SIZE,
+                max_size=settings.MEDUSA_READ_DB_POOL_MAX_SIZE,
+                command_timeout=30,
+                init=partial(self._init_connection, "replica"),
+            )
+            logger.info(
+                "Connected to Medusa read replica",
+                host=settings.MEDUSA_READ_DB_HOST,
+                pool_size=self._read_pool.get_size(),
+            )
 
     async def disconnect(self) -> None:
         """Disconnect from database."""
+        if self._read_pool:
+            await self._read_pool.close()
+            self._read_pool = None
         if self._pool:
             await self._pool.close()
             self._pool = None
             logger.info("Disconnected from Medusa database")
+        self._prepared.clear()
+
+    async def _init_connection(self, role: str, conn: asyncpg.Connection) -> None:
+        """Pool init hook: prepare the hot statements on a new connection."""
+        names = STATEMENTS if role == "primary" else READ_STATEMENTS
+        key = (role, conn.get_server_pid())
+        self._prepared[key] = {name: await conn.prepare(STATEMENTS[name]) for name in names}
+        conn.add_termination_listener(lambda _: self._prepared.pop(key, None))
+
+    async def _statement(self, role: str, conn, name: str) -> PreparedStatement:
+        """Prepared statement on conn, preparing it now if the init hook did not."""
+        prepared = self._prepared.setdefault((role, conn.get_server_pid()), {})
+        statement = prepared.get(name)
+        if statement is None:
+            statement = prepared[name] = await conn.prepare(STATEMENTS[name])
+        return statement
+
+    @asynccontextmanager
+    async def _acquire(self, role: str, pool: Pool) -> AsyncIterator[Any]:
+        """
+        Acquire a pooled connection, recording how long the wait took.
+        Everything done with it runs through the Medusa DB circuit breaker.
+        Timing out while connecting is raised as a ConnectionError, so the
+        breaker can tell it from a statement timeout.
+        """
+        async with medusa_db_breaker.guard():
+            start = time.perf_counter()
+            conn = None
+            try:
+                async with pool.acquire() as conn:
+                    query_stats.record_acquire(role, time.perf_counter() - start)
+                    yield conn
+            except asyncio.TimeoutError as e:
+                if conn is not None:
+                    raise
+                raise ConnectionError("Timed out connecting to the Medusa database") from e
+
+    async def _run(self, role: str, conn, name: str, method: str, *args: Any) -> Any:
+        """Execute a named statement, recording its duration and row count."""
+        statement = await self._statement(role, conn, name)
+        start = time.perf_counter()
+        try:
+            result = await getattr(statement, method)(*args)
+        except Exception:
+            query_stats.record_error(name)
+            raise
+        elapsed = time.perf_counter() - start
+
+        query_stats.record_statement(name, elapsed, _rows_affected(statement.get_statusmsg()))
+        if elapsed * 1000 >= settings.MEDUSA_DB_SLOW_STATEMENT_MS:
+            self._on_slow_statement(role, name, elapsed, args)
+        return result
+
+    def _on_slow_statement(self, role: str, name: str, elapsed: float, args: tuple) -> None:
+        """Log a slow execution and maybe capture its plan in the background."""
+        param_bytes = [_param_size(arg) for arg in args]
+        sampled_logger.warning(
+            "Slow statement",
+            statement=name,
+            pool=role,
+            duration_ms=round(elapsed * 1000, 1),
+            param_bytes=param_bytes,
+        )
+        entry = query_stats.record_slow(name, role, elapsed, param_bytes)
+
+        # One plan capture at a time, so a struggling database is not piled on
+        if (
+            random.random() < settings.MEDUSA_DB_EXPLAIN_SAMPLE_RATE
+            and (self._explain_task is None or self._explain_task.done())
+        ):
+            self._explain_task = asyncio.create_task(self._explain(role, name, args, entry))
+
+    async def _explain(self, role: str, name: str, args: tuple, entry: Dict[str, Any]) -> None:
+        """
+        Capture a slow statement's plan and attach it to its slow-statement
+        entry. Reads are re-run under EXPLAIN (ANALYZE, BUFFERS); writes are
+        never executed again, so they only get the estimated plan. The
+        connection is taken through the circuit breaker like any other.
+        """
+        pool = self._pool if role == "primary" else self._read_pool
+        sql = STATEMENTS[name]
+        try:
+            async with self._acquire(role, pool) as conn:
+                plan = None
+                if name in READ_STATEMENTS:
+                    try:
+                        plan = await conn.fetchval(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", *args)
+                    except asyncpg.PostgresError:
+                        pass
+
+                entry["analyzed"] = plan is not None
+                if plan is None:
+                    plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *args)
+        except Exception as e:
+            logger.warning("Failed to capture statement plan", statement=name, error=str(e))
+            return
+
+        entry["plan"] = json.loads(plan)[0]
+        logger.info(
+            "Captured slow statement plan",
+            statement=name,
+            analyzed=entry["analyzed"],
+            execution_ms=entry["plan"].get("Execution Time"),
+        )
+
+    async def ping(self) -> None:
+        """Round trip to the primary (circuit breaker probe)."""
+        async with self._acquire("primary", self._pool) as conn:
+            await conn.fetchval("SELECT 1")
+
+    def get_query_report(self) -> Dict[str, Any]:
+        """Statement and pool statistics, for the on-demand query report."""
+        report = query_stats.report()
+        report["pools"] = {
+            role: {
+                "size": pool.get_size(),
+                "idle": pool.get_idle_size(),
+                "max_size": pool.get_max_size(),
+            }
+            for role, pool in (("primary", self._pool), ("replica", self._read_pool))
+            if pool is not None
+        }
+        return report
 
     async def find_rfq_by_external_id(
         self,
         external_id: str,
+        consistent: bool = False,
     ) -> Optional[Dict[str, Any]]:
-        """Find existing RFQ by external_id (idempotency check)."""
-        async with self._pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT id, rfq_number, status, external_id, sync_status
-                FROM rfq
-                WHERE external_id = $1
-                LIMIT 1
-                """,
-                external_id,
-            )
+        """
+        Find existing RFQ by external_id (idempotency check).
+        Reads from the replica when configured; with the confirm_negative
+        strategy a miss there is re-checked on the primary, since the row
+        may not have replicated yet. consistent=True always uses the primary.
+        """
+        if self._read_pool and not consistent:
+            async with self._acquire("replica", self._read_pool) as conn:
+                row = await self._run("replica", conn, "find_rfq_by_external_id", "fetchrow", external_id)
+            if row or settings.MEDUSA_READ_STALENESS_STRATEGY == "trust_replica":
+                return dict(row) if row else None
+
+        async with self._acquire("primary", self._pool) as conn:
+            row = await self._run("primary", conn, "find_rfq_by_external_id", "fetchrow", external_id)
             return dict(row) if row else None
 
-    async def create_rfq(self, rfq: MedusaRFQ) -> str:
+    async def create_rfq(
+        self,
+        rfq: Union[MedusaRFQ, MedusaRFQRecord],
+        line_items_json: Optional[str] = None,
+    ) -> str:
         """
         Create RFQ in Medusa database.
+        line_items_json, if given, is used for the line_items column instead
+        of serializing rfq.line_items (claim-checked RFQs stream it in).
         Returns the created RFQ ID.
         """
-        import json
-        from uuid import uuid4
-
         rfq_id = f"rfq_{uuid4().hex[:24]}"  # Medusa ID format
 
-        async with self._pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO rfq (
-                    id, rfq_number, customer_id, company_id,
-                    customer_email, customer_company, customer_name,
-                    description, line_items, status, priority,
-                    estimated_value, currency, requirements,
-                    delivery_address, attachments,
-                    ai_confidence_score, ai_analysis,
-                    external_id, external_source, sync_status, synced_at,
-                    created_at, updated_at
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11,
-                    $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24
-                )
-                """,
-                rfq_id,
-                rfq.rfq_number,
-                rfq.customer_id,
-                rfq.company_id,
-                rfq.customer_email,
-                rfq.customer_company,
-                rfq.customer_name,
-                rfq.description,
-                json.dumps(rfq.line_items),
-                rfq.status,
-                rfq.priority,
-                rfq.estimated_value,
-                rfq.currency,
-                json.dumps(rfq.requirements) if rfq.requirements else None,
-                json.dumps(rfq.delivery_address) if rfq.delivery_address else None,
-                json.dumps(rfq.attachments) if rfq.attachments else None,
-                rfq.ai_confidence_score,
-                json.dumps(rfq.ai_analysis) if rfq.ai_analysis else None,
-                rfq.external_id,
-                rfq.external_source,
-                "synced",
-                datetime.utcnow(),
-                datetime.utcnow(),
-                datetime.utcnow(),
+        async with self._acquire("primary", self._pool) as conn:
+            await self._run(
+                "primary", conn, "insert_rfq", "fetch",
+                *build_insert_args(rfq_id, rfq, line_items_json),
             )
 
-        logger.info(f"Created RFQ in Medusa: {rfq_id} ({rfq.rfq_number})")
+        sampled_logger.info("Created RFQ in Medusa", medusa_rfq_id=rfq_id, rfq_number=rfq.rfq_number)
         return rfq_id
 
     async def update_rfq_status(
@@ -124,18 +349,12 @@ class MedusaDBClient:
         updated_by: Optional[str] = None,
     ) -> None:
         """Update RFQ status."""
-        async with self._pool.acquire() as conn:
-            await conn.execute(
-                """
-                UPDATE rfq
-                SET status = $1, updated_at = $2
-                WHERE id = $3
-                """,
-                status,
-                datetime.utcnow(),
-                rfq_id,
+        async with self._acquire("primary", self._pool) as conn:
+            await self._run(
+                "primary", conn, "update_rfq_status", "fetch",
+                status, datetime.utcnow(), rfq_id,
             )
-        logger.info(f"Updated RFQ {rfq_id} status to {status}")
+        sampled_logger.info("Updated RFQ status", medusa_rfq_id=rfq_id, status=status)
 
 
 # Singleton
@@ -148,4 +367,12 @@ async def get_medusa_db() -> MedusaDBClient:
     if _medusa_db is None:
         _medusa_db = MedusaDBClient()
         await _medusa_db.connect()
+        medusa_db_breaker.set_probe(_medusa_db.ping)
     return _medusa_db
+
+
+def set_medusa_db(client: MedusaDBClient) -> None:
+    """Replace the Medusa DB client (load harness and local stand-ins)."""
+    global _medusa_db
+    _medusa_db = client
+    medusa_db_breaker.set_probe(client.ping)
@@ -0,0 +1,101 @@
+# =============================================================================
+# FILE: src/services/query_stats.py
+# Statistics for Medusa DB statements and connection acquisition
+# =============================================================================
+
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List
+
+from src.config import settings
+from src.utils.metrics import (
+    DB_ACQUIRE_WAIT,
+    DB_SLOW_STATEMENTS,
+    DB_STATEMENT_DURATION,
+    DB_STATEMENT_ERRORS,
+    DB_STATEMENT_ROWS,
+)
+
+
+def _new_entry() -> Dict[str, float]:
+    return {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+
+def _new_statement_entry() -> Dict[str, float]:
+    return {**_new_entry(), "errors": 0, "rows": 0}
+
+
+class QueryStats:
+    """
+    Running totals behind the on-demand query report.
+    Every observation is also exported as a Prometheus metric; the report
+    adds the recent slow statements (with captured plans) on top.
+    """
+
+    def __init__(self, slow_log_size: int = settings.MEDUSA_DB_SLOW_LOG_SIZE):
+        self._statements: Dict[str, Dict[str, float]] = {}
+        self._acquire: Dict[str, Dict[str, float]] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+
+    def record_acquire(self, pool: str, seconds: float) -> None:
+        """Record the wait for a pooled connection."""
+        DB_ACQUIRE_WAIT.labels(pool=pool).observe(seconds)
+        self._add(self._acquire.setdefault(pool, _new_entry()), seconds)
+
+    def record_statement(self, name: str, seconds: float, rows: int) -> None:
+        """Record a successful execution of a named statement."""
+        DB_STATEMENT_DURATION.labels(statement=name).observe(seconds)
+        if rows:
+            DB_STATEMENT_ROWS.labels(statement=name).inc(rows)
+        entry = self._statements.setdefault(name, _new_statement_entry())
+        self._add(entry, seconds)
+        entry["rows"] += rows
+
+    def record_error(self, name: str) -> None:
+        """Record a failed execution of a named statement."""
+        DB_STATEMENT_ERRORS.labels(statement=name).inc()
+        self._statements.setdefault(name, _new_statement_entry())["errors"] += 1
+
+    def record_slow(
+        self,
+        name: str,
+        pool: str,
+        seconds: float,
+        param_bytes: List[int],
+    ) -> Dict[str, Any]:
+        """Keep a slow execution for the report. A plan may be attached later."""
+        DB_SLOW_STATEMENTS.labels(statement=name).inc()
+        entry = {
+            "statement": name,
+            "pool": pool,
+            "duration_ms": round(seconds * 1000, 1),
+            "param_bytes": param_bytes,
+            "at": datetime.utcnow().isoformat(),
+        }
+        self._slow.append(entry)
+        return entry
+
+    def report(self) -> Dict[str, Any]:
+        """Per-statement and per-pool totals plus recent slow statements."""
+        return {
+            "statements": {name: self._summary(e) for name, e in self._statements.items()},
+            "acquire_wait": {pool: self._summary(e) for pool, e in self._acquire.items()},
+            "slow_statements": list(self._slow),
+        }
+
+    @staticmethod
+    def _add(entry: Dict[str, float], seconds: float) -> None:
+        ms = seconds * 1000
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+
+    @staticmethod
+    def _summary(entry: Dict[str, float]) -> Dict[str, Any]:
+        summary = {key: round(value, 1) for key, value in entry.items()}
+        summary["mean_ms"] = round(entry["total_ms"] / entry["count"], 2) if entry["count"] else None
+        return summary
+
+
+# Singleton
+query_stats = QueryStats()
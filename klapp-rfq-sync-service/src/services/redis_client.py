@@ -3,13 +3,14 @@
 # Redis client for distributed locking and caching
 # =============================================================================
 
-import logging
 from typing import Optional
 import redis.asyncio as redis
+import structlog
 
 from src.config import settings
+from src.services.breakers import redis_breaker
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
 
 _redis_client: Optional[redis.Redis] = None
 
@@ -23,10 +24,26 @@ async def get_redis_client() -> redis.Redis:
             encoding="utf-8",
             decode_responses=True,
         )
-        logger.info(f"Connected to Redis at {settings.REDIS_URL}")
+        redis_breaker.set_probe(_ping)
+        logger.info("Connected to Redis", url=settings.REDIS_URL)
     return _redis_client
 
 
+def set_redis_client(client: redis.Redis) -> None:
+    """Replace the Redis client (load harness and local stand-ins)."""
+    global _redis_client
+    _redis_client = client
+    redis_breaker.set_probe(_ping)
+
+
+async def _ping() -> None:
+    """Circuit breaker probe."""
+    if _redis_client is None:
+        return
+    async with redis_breaker.guard():
+        await _redis_client.ping()
+
+
 async def close_redis_client() -> None:
     """Close Redis connection."""
     global _redis_client
@@ -1,38 +1,43 @@
 # =============================================================================
 # FILE: src/services/sync_processor.py
-# Main sync processing logic with circuit breaker and retry
+# Main sync processing logic
 # =============================================================================
 
-import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import asyncio
 
-from circuitbreaker import circuit
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
+import structlog
 
 from src.config import settings
 from src.models.events import (
     RFQSyncRequest,
-    RFQSyncResult,
     SyncDirection,
     SyncStatus,
 )
+from src.models.internal import SyncWork, SyncOutcome
 from src.services.transformer import transformer
+from src.services.breakers import redis_breaker
+from src.services.claim_check import check_out, release
+from src.services.mapping import email_to_medusa_mapping
 from src.services.medusa_db import get_medusa_db
 from src.services.redis_client import get_redis_client
+from src.services.sync_state import sync_state_index
+from src.utils.circuit_breaker import DependencyUnavailable
+from src.utils.log_sampling import SampledLogger
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
 
 
 class SyncProcessor:
     """
-    Main sync processor with circuit breaker and retry logic.
+    Main sync processor.
+    Medusa DB and Redis calls go through their circuit breakers. When one
+    of them is down, DependencyUnavailable is raised instead of returning
+    a FAILED outcome, so the consumer holds the request and retries it
+    (see run_handler).
+    Every outcome and deferral is recorded in the sync state index.
     """
 
     def __init__(self):
@@ -40,31 +45,31 @@ class SyncProcessor:
             "total_syncs": 0,
             "successful_syncs": 0,
             "failed_syncs": 0,
-            "retries": 0,
+            "deferred_syncs": 0,
         }
 
-    @circuit(
-        failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
-        recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
-    )
-    @retry(
-        stop=stop_after_attempt(settings.RETRY_MAX_ATTEMPTS),
-        wait=wait_exponential(
-            multiplier=settings.RETRY_WAIT_EXPONENTIAL_MULTIPLIER,
-            max=settings.RETRY_WAIT_EXPONENTIAL_MAX,
-        ),
-        retry=retry_if_exception_type(Exception),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Retrying sync (attempt {retry_state.attempt_number})"
-        ),
-    )
     async def process_sync_to_medusa(
         self,
-        request: RFQSyncRequest,
-    ) -> RFQSyncResult:
+        request: Union[SyncWork, RFQSyncRequest],
+    ) -> SyncOutcome:
         """
         Process sync request from email service to MedusaJS.
+        A claim-checked payload is deleted once its sync has completed.
         """
+        try:
+            outcome = await self._sync_to_medusa(request)
+        except DependencyUnavailable as e:
+            sync_state_index.record_deferred(request.email_rfq_id, request.rfq_number, str(e))
+            raise
+        sync_state_index.record(outcome)
+        if request.rfq_data_ref and outcome.sync_status == SyncStatus.COMPLETED:
+            await release(request.rfq_data_ref)
+        return outcome
+
+    async def _sync_to_medusa(
+        self,
+        request: Union[SyncWork, RFQSyncRequest],
+    ) -> SyncOutcome:
         sync_started = datetime.utcnow()
         self._metrics["total_syncs"] += 1
 
@@ -73,16 +78,17 @@ class SyncProcessor:
             redis = await get_redis_client()
             lock_key = f"{settings.REDIS_KEY_PREFIX}lock:{request.email_rfq_id}"
 
-            lock_acquired = await redis.set(
-                lock_key,
-                "1",
-                ex=settings.REDIS_LOCK_TIMEOUT,
-                nx=True,
-            )
+            async with redis_breaker.guard():
+                lock_acquired = await redis.set(
+                    lock_key,
+                    "1",
+                    ex=settings.REDIS_LOCK_TIMEOUT,
+                    nx=True,
+                )
 
             if not lock_acquired:
-                logger.warning(f"Lock not acquired for {request.rfq_number}, skipping")
-                return RFQSyncResult(
+                sampled_logger.info("Lock not acquired, skipping", rfq_number=request.rfq_number)
+                return SyncOutcome(
                     email_rfq_id=request.email_rfq_id,
                     rfq_number=request.rfq_number,
                     sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
@@ -99,10 +105,12 @@ class SyncProcessor:
                 existing = await medusa_db.find_rfq_by_external_id(request.email_rfq_id)
 
                 if existing:
-                    logger.info(
-                        f"RFQ {request.rfq_number} already exists in Medusa ({existing['id']})"
+                    sampled_logger.info(
+                        "RFQ already exists in Medusa",
+                        rfq_number=request.rfq_number,
+                        medusa_rfq_id=existing["id"],
                     )
-                    return RFQSyncResult(
+                    return SyncOutcome(
                         email_rfq_id=request.email_rfq_id,
                         medusa_rfq_id=existing["id"],
                         rfq_number=request.rfq_number,
@@ -113,28 +121,42 @@ class SyncProcessor:
                         duration_ms=int((datetime.utcnow() - sync_started).total_seconds() * 1000),
                     )
 
-                # Validate data
-                is_valid, errors = transformer.validate_for_sync(request.rfq_data)
-                if not is_valid:
-                    raise ValueError(f"Validation failed: {', '.join(errors)}")
-
-                # Transform data
-                medusa_rfq = transformer.transform_email_to_medusa(request.rfq_data)
+                line_items_json = None
+                if request.rfq_data_ref:
+                    # Claim-checked payload: validate and transform while streaming
+                    header, line_items = await check_out(request.rfq_data_ref)
+                    medusa_rfq, line_items_json = (
+                        await transformer.transform_email_to_medusa_streaming(
+                            header, line_items
+                        )
+                    )
+                else:
+                    # Validate data
+                    is_valid, errors = transformer.validate_for_sync(request.rfq_data)
+                    if not is_valid:
+                        raise ValueError(f"Validation failed: {', '.join(errors)}")
+
+                    # Transform data
+                    if settings.TRANSFORM_ENGINE == "reference":
+                        medusa_rfq = transformer.transform_email_to_record(request.rfq_data)
+                    else:
+                        medusa_rfq = email_to_medusa_mapping.transform(request.rfq_data)
 
                 # Create in Medusa
-                medusa_rfq_id = await medusa_db.create_rfq(medusa_rfq)
+                medusa_rfq_id = await medusa_db.create_rfq(medusa_rfq, line_items_json)
 
                 # Cache the mapping
-                await redis.set(
-                    f"{settings.REDIS_KEY_PREFIX}map:{request.email_rfq_id}",
-                    medusa_rfq_id,
-                    ex=86400 * 30,  # 30 days
-                )
+                async with redis_breaker.guard():
+                    await redis.set(
+                        f"{settings.REDIS_KEY_PREFIX}map:{request.email_rfq_id}",
+                        medusa_rfq_id,
+                        ex=86400 * 30,  # 30 days
+                    )
 
                 self._metrics["successful_syncs"] += 1
 
                 sync_completed = datetime.utcnow()
-                return RFQSyncResult(
+                return SyncOutcome(
                     email_rfq_id=request.email_rfq_id,
                     medusa_rfq_id=medusa_rfq_id,
                     rfq_number=request.rfq_number,
@@ -146,14 +168,24 @@ class SyncProcessor:
                 )
 
             finally:
-                # Release lock
-                await redis.delete(lock_key)
+                # Release lock (it expires on its own if Redis is down)
+                try:
+                    async with redis_breaker.guard():
+                        await redis.delete(lock_key)
+                except DependencyUnavailable as e:
+                    sampled_logger.warning("Failed to release lock", rfq_number=request.rfq_number, error=str(e))
+
+        except DependencyUnavailable as e:
+            # Not the request's fault: the consumer holds it and retries
+            self._metrics["deferred_syncs"] += 1
+            sampled_logger.warning("Sync deferred", rfq_number=request.rfq_number, error=str(e))
+            raise
 
         except Exception as e:
             self._metrics["failed_syncs"] += 1
-            logger.error(f"Sync failed for {request.rfq_number}: {e}")
+            sampled_logger.error("Sync failed", rfq_number=request.rfq_number, error=str(e))
 
-            return RFQSyncResult(
+            return SyncOutcome(
                 email_rfq_id=request.email_rfq_id,
                 rfq_number=request.rfq_number,
                 sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
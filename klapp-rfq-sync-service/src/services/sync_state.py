@@ -0,0 +1,434 @@
+# =============================================================================
+# FILE: src/services/sync_state.py
+# In-memory index of the latest sync attempt per RFQ, snapshotted to Redis
+# =============================================================================
+
+import asyncio
+import json
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import structlog
+
+from src.config import settings
+from src.models.events import SyncStatus
+from src.models.internal import SyncOutcome, SyncState
+from src.services.breakers import redis_breaker
+from src.services.redis_client import get_redis_client
+from src.utils.log_sampling import SampledLogger
+from src.utils.metrics import SYNC_STATE_ENTRIES, SYNC_STATE_SNAPSHOT_FAILURES
+
+logger = structlog.get_logger(__name__)
+sampled_logger = SampledLogger(logger)
+
+
+def _score(attempted_at: datetime) -> float:
+    """Recency score of an attempt (naive datetimes are UTC)."""
+    if attempted_at.tzinfo is None:
+        attempted_at = attempted_at.replace(tzinfo=timezone.utc)
+    return attempted_at.timestamp()
+
+
+class _SequenceLog:
+    """
+    (sequence, email_rfq_id) pairs in sequence order, for paging.
+    A pair is superseded once its RFQ is attempted again or evicted; the
+    reader skips those, and compact() drops them.
+    """
+
+    def __init__(self):
+        self._sequences: List[int] = []
+        self._ids: List[str] = []
+
+    def append(self, sequence: int, email_rfq_id: str) -> None:
+        self._sequences.append(sequence)
+        self._ids.append(email_rfq_id)
+
+    def before(self, cursor: Optional[int]) -> Iterator[Tuple[int, str]]:
+        """Pairs below cursor (all of them if None), newest first."""
+        end = len(self._sequences) if cursor is None else bisect_left(self._sequences, cursor)
+        for i in range(end - 1, -1, -1):
+            yield self._sequences[i], self._ids[i]
+
+    def compact(self, entries: Dict[str, SyncState]) -> None:
+        """Drop superseded pairs."""
+        live = [
+            (sequence, key)
+            for sequence, key in zip(self._sequences, self._ids)
+            if key in entries and entries[key].sequence == sequence
+        ]
+        self._sequences = [sequence for sequence, _ in live]
+        self._ids = [key for _, key in live]
+
+    def __len__(self) -> int:
+        return len(self._sequences)
+
+
+class SyncStateIndex:
+    """
+    Latest sync attempt per RFQ, keyed by email_rfq_id and rfq_number.
+
+    SyncProcessor records every outcome (and every deferral) here, so the
+    sync state API answers from memory and never queries the Medusa DB.
+    Entries are kept in attempt order, newest last; beyond max_entries the
+    oldest are evicted. Pages are read from sequence-ordered logs (one for
+    all entries, one per status), so a page costs its own size, not a scan.
+
+    Changed entries are written to Redis every snapshot interval: one key
+    per RFQ and one per rfq_number, each expiring snapshot_ttl after its
+    last write, plus a sorted set of the most recently attempted RFQs,
+    trimmed to max_entries. Replicas share these keys, so local eviction
+    never deletes from Redis, and a replica does not overwrite a more
+    recent attempt written by another. Lookups that miss this replica's
+    index fall back to Redis, so RFQs synced by another replica are found
+    once that replica has taken its next snapshot. Pages only list this
+    replica's index. Startup restores the newest max_entries RFQs.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.SYNC_STATE_MAX_ENTRIES,
+        snapshot_interval: float = settings.SYNC_STATE_SNAPSHOT_INTERVAL_SECONDS,
+        snapshot_batch: int = settings.SYNC_STATE_SNAPSHOT_BATCH,
+        snapshot_ttl: int = settings.SYNC_STATE_SNAPSHOT_TTL_SECONDS,
+        key_prefix: str = settings.REDIS_KEY_PREFIX,
+    ):
+        self._max_entries = max_entries
+        self._snapshot_interval = snapshot_interval
+        self._snapshot_batch = snapshot_batch
+        self._snapshot_ttl = snapshot_ttl
+        self._state_prefix = f"{key_prefix}sync_state:rfq:"
+        self._number_prefix = f"{key_prefix}sync_state:number:"
+        self._recent_key = f"{key_prefix}sync_state:recent"
+
+        self._entries: "OrderedDict[str, SyncState]" = OrderedDict()
+        self._by_number: Dict[str, str] = {}
+        self._sequence = 0
+        self._log = _SequenceLog()
+        self._status_logs: Dict[str, _SequenceLog] = {}
+        self._status_counts: Counter = Counter()
+        # Updated ids not yet in Redis
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        self._metrics = {
+            "recorded": 0,
+            "evicted": 0,
+            "restored": 0,
+            "snapshots": 0,
+            "snapshot_failures": 0,
+            "snapshot_lookups": 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def record(self, outcome: SyncOutcome) -> None:
+        """Record the outcome of a sync attempt."""
+        self._update(
+            outcome.email_rfq_id,
+            outcome.rfq_number,
+            outcome.sync_status.value,
+            outcome.sync_completed_at,
+            outcome.medusa_rfq_id,
+            outcome.duration_ms,
+            outcome.error_message,
+        )
+
+    def record_deferred(self, email_rfq_id: str, rfq_number: str, error: str) -> None:
+        """Record an attempt deferred because a dependency is unavailable."""
+        self._update(
+            email_rfq_id,
+            rfq_number,
+            SyncStatus.PENDING.value,
+            datetime.utcnow(),
+            None,
+            None,
+            error,
+        )
+
+    def _update(
+        self,
+        email_rfq_id: str,
+        rfq_number: str,
+        sync_status: str,
+        attempted_at: datetime,
+        medusa_rfq_id: Optional[str],
+        duration_ms: Optional[int],
+        error_message: Optional[str],
+    ) -> None:
+        self._sequence += 1
+        state = self._entries.get(email_rfq_id)
+        if state is None:
+            state = SyncState(
+                email_rfq_id=email_rfq_id,
+                rfq_number=rfq_number,
+                sync_status=sync_status,
+                last_attempt_at=attempted_at,
+                attempts=0,
+            )
+            self._entries[email_rfq_id] = state
+        else:
+            self._entries.move_to_end(email_rfq_id)
+            self._status_counts[state.sync_status] -= 1
+            if state.rfq_number != rfq_number and self._by_number.get(state.rfq_number) == email_rfq_id:
+                del self._by_number[state.rfq_number]
+
+        state.rfq_number = rfq_number
+        state.sync_status = sync_status
+        state.last_attempt_at = attempted_at
+        # A failed or deferred retry does not lose the Medusa id
+        state.medusa_rfq_id = medusa_rfq_id or state.medusa_rfq_id
+        state.duration_ms = duration_ms
+        state.error_message = error_message
+        state.attempts += 1
+        state.sequence = self._sequence
+
+        self._by_number[rfq_number] = email_rfq_id
+        self._index(state)
+        self._dirty.add(email_rfq_id)
+        self._metrics["recorded"] += 1
+
+        while len(self._entries) > self._max_entries:
+            self._evict()
+        SYNC_STATE_ENTRIES.set(len(self._entries))
+
+    def _index(self, state: SyncState) -> None:
+        """Add an entry to the page logs; a log is compacted once mostly superseded."""
+        self._status_counts[state.sync_status] += 1
+        status_log = self._status_logs.setdefault(state.sync_status, _SequenceLog())
+        for log, live in (
+            (self._log, len(self._entries)),
+            (status_log, self._status_counts[state.sync_status]),
+        ):
+            log.append(state.sequence, state.email_rfq_id)
+            if len(log) > 2 * live + 64:
+                log.compact(self._entries)
+
+    def _evict(self) -> None:
+        """Drop the oldest entry from memory; its Redis keys expire on their own."""
+        email_rfq_id, state = self._entries.popitem(last=False)
+        self._status_counts[state.sync_status] -= 1
+        if self._by_number.get(state.rfq_number) == email_rfq_id:
+            del self._by_number[state.rfq_number]
+        self._dirty.discard(email_rfq_id)
+        self._metrics["evicted"] += 1
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    async def lookup(
+        self,
+        email_rfq_ids: Iterable[str] = (),
+        rfq_numbers: Iterable[str] = (),
+    ) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Look up RFQs by email_rfq_id and by rfq_number.
+        Returns {"email_rfq_ids": {id: state}, "rfq_numbers": {number: state}},
+        with None for RFQs that are not known.
+        """
+        by_id = {key: self._entries.get(key) for key in email_rfq_ids}
+        by_number = {
+            key: self._entries.get(self._by_number.get(key, ""))
+            for key in rfq_numbers
+        }
+
+        missing_ids = [key for key, state in by_id.items() if state is None]
+        missing_numbers = [key for key, state in by_number.items() if state is None]
+        if missing_ids or missing_numbers:
+            found_ids, found_numbers = await self._snapshot_lookup(missing_ids, missing_numbers)
+            by_id.update(found_ids)
+            by_number.update(found_numbers)
+
+        return {
+            "email_rfq_ids": {key: state.to_dict() if state else None for key, state in by_id.items()},
+            "rfq_numbers": {key: state.to_dict() if state else None for key, state in by_number.items()},
+        }
+
+    def page(
+        self,
+        limit: int = settings.SYNC_STATE_PAGE_SIZE,
+        cursor: Optional[int] = None,
+        sync_status: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        One page of entries, most recent attempt first.
+        Pass the returned cursor to get the next page (None on the last).
+        RFQs attempted again while paging move to the front, so they are
+        not repeated.
+        """
+        log = self._status_logs.get(sync_status) if sync_status else self._log
+        items: List[SyncState] = []
+        for sequence, key in log.before(cursor) if log else ():
+            state = self._entries.get(key)
+            if state is None or state.sequence != sequence:
+                continue  # Attempted again since, or evicted
+            if len(items) == limit:
+                return [s.to_dict() for s in items], items[-1].sequence
+            items.append(state)
+        return [s.to_dict() for s in items], None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get index metrics."""
+        metrics = self._metrics.copy()
+        metrics["entries"] = len(self._entries)
+        metrics["unsaved"] = len(self._dirty)
+        return metrics
+
+    # -------------------------------------------------------------------------
+    # Redis snapshot
+    # -------------------------------------------------------------------------
+
+    async def restore(self) -> int:
+        """
+        Load the newest max_entries RFQs from Redis, snapshot_batch per
+        round trip; returns the number of entries restored.
+        """
+        states: List[SyncState] = []
+        try:
+            redis = await get_redis_client()
+            async with redis_breaker.guard():
+                keys = await redis.zrevrange(self._recent_key, 0, self._max_entries - 1)
+            for start in range(0, len(keys), self._snapshot_batch):
+                chunk = keys[start:start + self._snapshot_batch]
+                async with redis_breaker.guard():
+                    values = await redis.mget([self._state_prefix + key for key in chunk])
+                states.extend(SyncState.from_dict(json.loads(value)) for value in values if value)
+        except Exception as e:
+            logger.warning("Sync state restore failed, starting empty", error=str(e))
+            return 0
+
+        # Anything recorded since startup wins
+        states.sort(key=lambda s: _score(s.last_attempt_at))
+        restored = [s for s in states if s.email_rfq_id not in self._entries]
+        current = list(self._entries.values())
+        self._entries.clear()
+        self._by_number.clear()
+        self._log = _SequenceLog()
+        self._status_logs.clear()
+        self._status_counts.clear()
+        self._sequence = 0
+        for state in restored + current:
+            self._sequence += 1
+            state.sequence = self._sequence
+            self._entries[state.email_rfq_id] = state
+            self._by_number[state.rfq_number] = state.email_rfq_id
+            self._index(state)
+        while len(self._entries) > self._max_entries:
+            self._evict()
+
+        self._metrics["restored"] = len(restored)
+        SYNC_STATE_ENTRIES.set(len(self._entries))
+        logger.info("Sync state restored", entries=len(restored))
+        return len(restored)
+
+    async def snapshot(self) -> int:
+        """Write changes since the last snapshot; returns the number written."""
+        if not self._dirty:
+            return 0
+
+        dirty, self._dirty = self._dirty, set()
+        # Serialized now: later updates mark the entry dirty again
+        values = [
+            (s.email_rfq_id, s.rfq_number, _score(s.last_attempt_at), json.dumps(s.to_dict()))
+            for s in (self._entries[key] for key in dirty if key in self._entries)
+        ]
+        batch = self._snapshot_batch
+        written = 0
+
+        try:
+            redis = await get_redis_client()
+            for start in range(0, len(values), batch):
+                chunk = values[start:start + batch]
+                async with redis_breaker.guard():
+                    stored = await redis.mget([self._state_prefix + key for key, _, _, _ in chunk])
+                # Skip RFQs another replica has attempted more recently
+                chunk = [
+                    item for item, current in zip(chunk, stored)
+                    if not current or _score(SyncState.from_dict(json.loads(current)).last_attempt_at) <= item[2]
+                ]
+                if not chunk:
+                    continue
+
+                pipe = redis.pipeline(transaction=False)
+                for key, number, _, value in chunk:
+                    pipe.set(self._state_prefix + key, value, ex=self._snapshot_ttl)
+                    pipe.set(self._number_prefix + number, key, ex=self._snapshot_ttl)
+                pipe.zadd(self._recent_key, {key: score for key, _, score, _ in chunk})
+                pipe.zremrangebyrank(self._recent_key, 0, -self._max_entries - 1)
+                pipe.expire(self._recent_key, self._snapshot_ttl)
+                async with redis_breaker.guard():
+                    await pipe.execute()
+                written += len(chunk)
+        except Exception as e:
+            # Writes are idempotent: keep everything for the next snapshot
+            self._dirty |= {key for key in dirty if key in self._entries}
+            self._metrics["snapshot_failures"] += 1
+            SYNC_STATE_SNAPSHOT_FAILURES.inc()
+            sampled_logger.warning("Sync state snapshot failed", error=str(e))
+            return 0
+
+        self._metrics["snapshots"] += 1
+        return written
+
+    async def _snapshot_lookup(
+        self,
+        email_rfq_ids: List[str],
+        rfq_numbers: List[str],
+    ) -> Tuple[Dict[str, SyncState], Dict[str, SyncState]]:
+        """Look up RFQs this replica does not hold in the shared snapshot."""
+        self._metrics["snapshot_lookups"] += 1
+        try:
+            redis = await get_redis_client()
+            async with redis_breaker.guard():
+                number_ids = (
+                    await redis.mget([self._number_prefix + number for number in rfq_numbers])
+                    if rfq_numbers else []
+                )
+                keys = list(dict.fromkeys(email_rfq_ids + [key for key in number_ids if key]))
+                values = await redis.mget([self._state_prefix + key for key in keys]) if keys else []
+        except Exception as e:
+            sampled_logger.warning("Sync state snapshot lookup failed", error=str(e))
+            return {}, {}
+
+        found = {
+            key: SyncState.from_dict(json.loads(value))
+            for key, value in zip(keys, values)
+            if value
+        }
+        by_id = {key: found[key] for key in email_rfq_ids if key in found}
+        by_number = {
+            number: found[key]
+            for number, key in zip(rfq_numbers, number_ids)
+            if key in found
+        }
+        return by_id, by_number
+
+    def start(self) -> None:
+        """Start taking periodic snapshots."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self) -> None:
+        """Stop periodic snapshots and take a final one."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.snapshot()
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            await self.snapshot()
+
+
+# Singleton
+sync_state_index = SyncStateIndex()
@@ -3,13 +3,16 @@
 # Data transformation between email service and Medusa formats
 # =============================================================================
 
-import logging
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
 
+import structlog
+
 from src.models.events import MedusaRFQ, LineItem, CustomerInfo, DeliveryInfo
+from src.models.internal import MedusaRFQRecord
 
-logger = logging.getLogger(__name__)
+logger = structlog.get_logger(__name__)
 
 
 class RFQTransformer:
@@ -61,9 +64,16 @@ class RFQTransformer:
         """
         Transform RFQ data from email service format to Medusa format.
         """
-        # Extract customer info
-        customer = email_rfq_data.get("customer", {})
+        return self.transform_email_to_record(email_rfq_data).to_model()
 
+    def transform_email_to_record(
+        self,
+        email_rfq_data: Dict[str, Any],
+    ) -> MedusaRFQRecord:
+        """
+        Same as transform_email_to_medusa, returning the slotted record used
+        on the sync hot path instead of the pydantic model.
+        """
         # Extract line items
         raw_line_items = email_rfq_data.get("line_items", [])
         line_items = [
@@ -71,6 +81,62 @@ class RFQTransformer:
             for item in raw_line_items
         ]
 
+        return self._build_medusa_rfq(
+            email_rfq_data,
+            line_items,
+            leading_items=raw_line_items[:3],
+            item_count=len(raw_line_items),
+        )
+
+    async def transform_email_to_medusa_streaming(
+        self,
+        header: Dict[str, Any],
+        line_items: AsyncIterator[Dict[str, Any]],
+    ) -> tuple[MedusaRFQRecord, str]:
+        """
+        Validate and transform a claim-checked RFQ whose line items arrive
+        as a stream. Each item is transformed and serialized as it is read,
+        so the only full copy is the JSON text for the line_items column.
+        Returns the record (with empty line_items) and that JSON text.
+        Raises ValueError if validation fails.
+        """
+        errors = self._validate_header(header)
+        leading_items = []
+        serialized = []
+        item_count = 0
+
+        async for item in line_items:
+            item_count += 1
+            if not item.get("description"):
+                errors.append(f"Line item {item_count} missing description")
+            if item_count <= 3:
+                leading_items.append(item)
+            serialized.append(json.dumps(self._transform_line_item(item)))
+
+        if item_count == 0:
+            errors.append("No line items found")
+        if errors:
+            raise ValueError(f"Validation failed: {', '.join(errors)}")
+
+        medusa_rfq = self._build_medusa_rfq(
+            header,
+            [],
+            leading_items=leading_items,
+            item_count=item_count,
+        )
+        return medusa_rfq, "[" + ", ".join(serialized) + "]"
+
+    def _build_medusa_rfq(
+        self,
+        email_rfq_data: Dict[str, Any],
+        line_items: List[Dict[str, Any]],
+        leading_items: List[Dict[str, Any]],
+        item_count: int,
+    ) -> MedusaRFQRecord:
+        """Build the Medusa record from RFQ fields and already transformed line items."""
+        # Extract customer info
+        customer = email_rfq_data.get("customer", {})
+
         # Extract delivery info
         delivery = email_rfq_data.get("delivery", {})
         delivery_address = None
@@ -86,12 +152,12 @@ class RFQTransformer:
 
         # Build description from line items if not provided
         description = email_rfq_data.get("description") or email_rfq_data.get("title")
-        if not description and line_items:
+        if not description and item_count:
             description = "; ".join(
-                item.get("description", "") for item in raw_line_items[:3]
+                item.get("description", "") for item in leading_items[:3]
             )
-            if len(raw_line_items) > 3:
-                description += f" (+{len(raw_line_items) - 3} more items)"
+            if item_count > 3:
+                description += f" (+{item_count - 3} more items)"
 
         # Map status
         email_status = email_rfq_data.get("status", "received")
@@ -101,7 +167,7 @@ class RFQTransformer:
         email_priority = email_rfq_data.get("priority", "medium")
         medusa_priority = self.PRIORITY_MAP.get(email_priority, "medium")
 
-        return MedusaRFQ(
+        return MedusaRFQRecord(
             rfq_number=email_rfq_data.get("rfq_number", ""),
             customer_email=customer.get("email", ""),
             customer_name=customer.get("name"),
@@ -165,15 +231,7 @@ class RFQTransformer:
         Validate RFQ data before sync.
         Returns (is_valid, list of error messages).
         """
-        errors = []
-
-        # Required fields
-        if not rfq_data.get("rfq_number"):
-            errors.append("Missing rfq_number")
-
-        customer = rfq_data.get("customer", {})
-        if not customer.get("email"):
-            errors.append("Missing customer email")
+        errors = self._validate_header(rfq_data)
 
         line_items = rfq_data.get("line_items", [])
         if not line_items:
@@ -185,6 +243,20 @@ class RFQTransformer:
 
         return len(errors) == 0, errors
 
+    def _validate_header(self, rfq_data: Dict[str, Any]) -> list[str]:
+        """Validate the RFQ fields other than line items."""
+        errors = []
+
+        # Required fields
+        if not rfq_data.get("rfq_number"):
+            errors.append("Missing rfq_number")
+
+        customer = rfq_data.get("customer", {})
+        if not customer.get("email"):
+            errors.append("Missing customer email")
+
+        return errors
+
 
 # Singleton instance
 transformer = RFQTransformer()
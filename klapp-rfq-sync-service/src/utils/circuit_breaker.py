@@ -0,0 +1,223 @@
+# =============================================================================
+# FILE: src/utils/circuit_breaker.py
+# Circuit breaker for a single downstream dependency
+# =============================================================================
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+from src.utils.metrics import BREAKER_OPENS, BREAKER_REJECTED, BREAKER_STATE
+
+logger = structlog.get_logger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class DependencyUnavailable(Exception):
+    """
+    A call was refused, or failed, because a dependency is down.
+    The message that needed it is held and retried once the dependency's
+    breaker lets calls through again (see run_handler).
+
+    state is the breaker's state when the call was made: a call refused
+    or failed while open or half-open is evidence of an outage, one that
+    failed while closed may be down to the message itself.
+    """
+
+    def __init__(self, breaker: "DependencyBreaker", reason: str, state: str):
+        super().__init__(f"{breaker.name} unavailable: {reason}")
+        self.breaker = breaker
+        self.state = state
+
+
+class DependencyBreaker:
+    """
+    Circuit breaker for one dependency (a database, a cache, a producer).
+
+    - closed: calls go through; failure_threshold consecutive failures
+      open the breaker
+    - open: calls are refused with DependencyUnavailable; after
+      recovery_timeout the breaker goes half-open
+    - half_open: at most half_open_max_calls calls run at a time;
+      success_threshold successes close the breaker, a failure re-opens it
+
+    Only errors accepted by is_failure (lost connections, timeouts) count
+    as failures. Any other error means the dependency answered, so it
+    counts as a success and is re-raised unchanged.
+
+    While half-open, the probe (if set) runs every probe_interval, so the
+    breaker can close without waiting for traffic. Listeners are called on
+    every state change.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        is_failure: Callable[[BaseException], bool],
+        failure_threshold: int = settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = settings.CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS,
+        success_threshold: int = settings.CIRCUIT_BREAKER_SUCCESS_THRESHOLD,
+        probe_interval: float = settings.CIRCUIT_BREAKER_PROBE_INTERVAL_SECONDS,
+    ):
+        self.name = name
+        self._is_failure = is_failure
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.probe_interval = probe_interval
+
+        self._state = CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._trial_calls = 0
+        self._opened_count = 0
+        self._probe: Optional[Callable[[], Awaitable[None]]] = None
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[["DependencyBreaker"], None]] = []
+        self._waiters: List[asyncio.Future] = []
+        BREAKER_STATE.labels(dependency=name).set(STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def set_probe(self, probe: Optional[Callable[[], Awaitable[None]]]) -> None:
+        """Set the half-open health check. It must make its call through guard()."""
+        self._probe = probe
+
+    def add_listener(self, listener: Callable[["DependencyBreaker"], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[["DependencyBreaker"], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def allows(self) -> bool:
+        """Whether a call would be let through right now."""
+        if self._state == CLOSED:
+            return True
+        if self._state == HALF_OPEN:
+            return self._trial_calls < self.half_open_max_calls
+        return False
+
+    async def wait(self) -> None:
+        """Wait until a call would be let through."""
+        while not self.allows():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        Run the enclosed calls through the breaker.
+        Raises DependencyUnavailable when refused, or when the calls fail
+        with an error that counts as a failure.
+        """
+        state = self._state
+        if not self.allows():
+            BREAKER_REJECTED.labels(dependency=self.name).inc()
+            raise DependencyUnavailable(self, "circuit open", state)
+
+        trial = state == HALF_OPEN
+        if trial:
+            self._trial_calls += 1
+        try:
+            yield
+        except Exception as e:
+            if not self._is_failure(e):
+                self._record_success()
+                raise
+            self._record_failure(e)
+            raise DependencyUnavailable(self, str(e) or type(e).__name__, state) from e
+        else:
+            self._record_success()
+        finally:
+            if trial:
+                self._trial_calls -= 1
+                self._wake_waiters()
+
+    def get_metrics(self) -> Dict[str, object]:
+        """Get breaker state."""
+        return {
+            "state": self._state,
+            "consecutive_failures": self._failures,
+            "opened_count": self._opened_count,
+        }
+
+    def _record_success(self) -> None:
+        if self._state == CLOSED:
+            self._failures = 0
+        elif self._state == HALF_OPEN:
+            self._successes += 1
+            if self._successes >= self.success_threshold:
+                self._set_state(CLOSED)
+
+    def _record_failure(self, error: BaseException) -> None:
+        if self._state == CLOSED:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open(error)
+        elif self._state == HALF_OPEN:
+            self._open(error)
+
+    def _open(self, error: BaseException) -> None:
+        self._opened_count += 1
+        BREAKER_OPENS.labels(dependency=self.name).inc()
+        logger.warning(
+            "Circuit breaker opened",
+            dependency=self.name,
+            error=str(error) or type(error).__name__,
+            recovery_timeout=self.recovery_timeout,
+        )
+        self._set_state(OPEN)
+        self._recovery_task = asyncio.create_task(self._recover())
+
+    async def _recover(self) -> None:
+        """Go half-open after recovery_timeout, then probe until the state changes."""
+        await asyncio.sleep(self.recovery_timeout)
+        if self._recovery_task is not asyncio.current_task():
+            return
+        self._set_state(HALF_OPEN)
+
+        while self._state == HALF_OPEN and self._recovery_task is asyncio.current_task():
+            if self._probe and self.allows():
+                try:
+                    await self._probe()
+                except Exception:
+                    pass  # Recorded by the probe's guard()
+            await asyncio.sleep(self.probe_interval)
+
+    def _set_state(self, state: str) -> None:
+        previous, self._state = self._state, state
+        self._failures = 0
+        self._successes = 0
+        BREAKER_STATE.labels(dependency=self.name).set(STATE_VALUES[state])
+        if state != OPEN:
+            logger.info("Circuit breaker state changed", dependency=self.name, previous=previous, state=state)
+
+        self._wake_waiters()
+        for listener in list(self._listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                logger.error("Circuit breaker listener failed", dependency=self.name, error=str(e))
+
+    def _wake_waiters(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
@@ -0,0 +1,105 @@
+# =============================================================================
+# FILE: src/utils/log_sampling.py
+# Rate-limited logging for high-volume per-message events
+# =============================================================================
+
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from src.config import settings
+
+_samplers: "weakref.WeakSet[SampledLogger]" = weakref.WeakSet()
+
+# How often run_summary_flusher checks for intervals that have ended
+FLUSH_CHECK_SECONDS = 1.0
+
+
+class SampledLogger:
+    """
+    Wraps a structlog logger for per-message events.
+
+    Within each interval the first `burst` occurrences of a debug or info
+    event are logged as usual; further occurrences are only counted. When
+    the interval ends, one "Log summary" record reports how often each
+    event fired, so log volume stays bounded however high throughput gets.
+
+    Warnings and errors are never sampled: every failure is logged.
+    """
+
+    def __init__(
+        self,
+        logger,
+        burst: int = settings.LOG_SAMPLE_BURST,
+        interval_seconds: float = settings.LOG_SUMMARY_INTERVAL_SECONDS,
+    ):
+        self._logger = logger
+        self._burst = burst
+        self._interval = interval_seconds
+        self._window_start = time.monotonic()
+        self._counts: Dict[str, list] = {}  # event -> [logged, suppressed]
+        _samplers.add(self)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self._log("debug", event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self._log("info", event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self._logger.warning(event, **fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self._logger.error(event, **fields)
+
+    def _log(self, level: str, event: str, fields: Dict[str, Any]) -> None:
+        self.flush_if_due()
+
+        counts = self._counts.get(event)
+        if counts is None:
+            counts = self._counts[event] = [0, 0]
+        if counts[0] < self._burst:
+            counts[0] += 1
+            getattr(self._logger, level)(event, **fields)
+        else:
+            counts[1] += 1
+
+    def flush_if_due(self, now: Optional[float] = None) -> None:
+        """Flush if the current interval has ended."""
+        now = now or time.monotonic()
+        if now - self._window_start >= self._interval:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Emit the summary for the current interval and start a new one."""
+        now = now or time.monotonic()
+        if any(suppressed for _, suppressed in self._counts.values()):
+            self._logger.info(
+                "Log summary",
+                interval_seconds=round(now - self._window_start, 1),
+                events={
+                    event: {"logged": logged, "suppressed": suppressed}
+                    for event, (logged, suppressed) in self._counts.items()
+                },
+            )
+        self._counts = {}
+        self._window_start = now
+
+
+def flush_sampled_loggers() -> None:
+    """Emit pending summaries of all sampled loggers (e.g. on shutdown)."""
+    for sampler in list(_samplers):
+        sampler.flush()
+
+
+async def run_summary_flusher() -> None:
+    """
+    Emit summaries as intervals end. Without this, a burst that stops is
+    only summarized when its logger is next called.
+    """
+    while True:
+        await asyncio.sleep(FLUSH_CHECK_SECONDS)
+        now = time.monotonic()
+        for sampler in list(_samplers):
+            sampler.flush_if_due(now)
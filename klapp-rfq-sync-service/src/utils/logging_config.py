@@ -0,0 +1,119 @@
+# =============================================================================
+# FILE: src/utils/logging_config.py
+# Logging setup: structlog front end, queue-based background writer
+# =============================================================================
+#
+# Log calls on the event loop only build an event dict and enqueue it.
+# Rendering (JSON/console), exception formatting and the blocking write to
+# stdout happen on a QueueListener thread.
+
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+import structlog
+
+from src.config import settings
+from src.utils.metrics import LOG_RECORDS_DROPPED
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves structlog records unformatted, so rendering
+    runs on the listener thread, and drops records when the queue is full
+    instead of blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Freeze %-style args of stdlib records; their args may be mutated later
+        if not isinstance(record.msg, dict) and record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _capture_exc_info(logger, method_name, event_dict):
+    """Resolve exc_info=True now; sys.exc_info() is empty on the listener thread."""
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+def configure_logging() -> None:
+    """Configure structlog and route all logging through the background writer."""
+    global _listener
+    if _listener:
+        return
+
+    renderer = (
+        structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json"
+        else structlog.dev.ConsoleRenderer()
+    )
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            _capture_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+    # Runs on the listener thread
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            renderer,
+        ],
+        # Records from stdlib loggers (aiokafka, asyncpg, ...)
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(getattr(logging, settings.LOG_LEVEL))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background writer."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,163 @@
+# =============================================================================
+# FILE: src/utils/metrics.py
+# Prometheus metrics exported by the sync service
+# =============================================================================
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Duplicate filter
+DUPLICATES_DISCARDED = Counter(
+    "rfq_sync_duplicates_discarded_total",
+    "Duplicate sync deliveries discarded before processing",
+    ["layer"],
+)
+DEDUP_BLOOM_FALSE_POSITIVES = Counter(
+    "rfq_sync_dedup_bloom_false_positives_total",
+    "Bloom filter hits that the Medusa DB check showed to be new RFQs",
+)
+
+# Priority lanes
+LANE_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800)
+LANE_DEPTH = Gauge(
+    "rfq_sync_lane_depth",
+    "Sync requests queued per priority lane",
+    ["lane"],
+)
+LANE_QUEUE_WAIT = Histogram(
+    "rfq_sync_lane_queue_wait_seconds",
+    "Time from enqueue to start of processing per priority lane",
+    ["lane"],
+    buckets=LANE_LATENCY_BUCKETS,
+)
+LANE_LATENCY = Histogram(
+    "rfq_sync_lane_latency_seconds",
+    "Time from enqueue to end of processing per priority lane",
+    ["lane"],
+    buckets=LANE_LATENCY_BUCKETS,
+)
+LANE_SLA_BREACHES = Counter(
+    "rfq_sync_lane_sla_breaches_total",
+    "Sync requests that exceeded their lane's latency SLA",
+    ["lane"],
+)
+
+# Startup
+STARTUP_PHASE_SECONDS = Gauge(
+    "rfq_sync_startup_phase_seconds",
+    "Duration of each startup phase",
+    ["phase"],
+)
+SERVICE_READY = Gauge(
+    "rfq_sync_ready",
+    "1 once startup warm-up has finished and the service is consuming",
+)
+TIME_TO_FIRST_SYNC = Gauge(
+    "rfq_sync_time_to_first_sync_seconds",
+    "Time from process start to the first completed sync",
+)
+
+# Medusa DB queries
+DB_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_ACQUIRE_WAIT = Histogram(
+    "rfq_sync_db_acquire_wait_seconds",
+    "Time spent waiting for a pooled Medusa DB connection",
+    ["pool"],
+    buckets=DB_LATENCY_BUCKETS,
+)
+DB_STATEMENT_DURATION = Histogram(
+    "rfq_sync_db_statement_seconds",
+    "Execution time per named Medusa DB statement",
+    ["statement"],
+    buckets=DB_LATENCY_BUCKETS,
+)
+DB_STATEMENT_ROWS = Counter(
+    "rfq_sync_db_statement_rows_total",
+    "Rows returned or affected per named Medusa DB statement",
+    ["statement"],
+)
+DB_STATEMENT_ERRORS = Counter(
+    "rfq_sync_db_statement_errors_total",
+    "Failed executions per named Medusa DB statement",
+    ["statement"],
+)
+DB_SLOW_STATEMENTS = Counter(
+    "rfq_sync_db_slow_statements_total",
+    "Medusa DB statements slower than MEDUSA_DB_SLOW_STATEMENT_MS",
+    ["statement"],
+)
+
+# Handler pools and topic flow control
+HANDLER_QUEUE_DEPTH = Gauge(
+    "rfq_sync_handler_queue_depth",
+    "Messages queued per handler pool",
+    ["handler"],
+)
+HANDLER_DURATION = Histogram(
+    "rfq_sync_handler_duration_seconds",
+    "Time to handle a message per handler",
+    ["handler"],
+    buckets=LANE_LATENCY_BUCKETS,
+)
+HANDLER_TIMEOUTS = Counter(
+    "rfq_sync_handler_timeouts_total",
+    "Messages whose handler exceeded its timeout",
+    ["handler"],
+)
+TOPIC_PAUSED = Gauge(
+    "rfq_sync_topic_paused",
+    "1 while a topic's partitions are paused because its handler queue is full",
+    ["topic"],
+)
+TOPIC_PAUSES = Counter(
+    "rfq_sync_topic_pauses_total",
+    "Times a topic was paused because its handler queue was full",
+    ["topic"],
+)
+
+# Dependency circuit breakers
+BREAKER_STATE = Gauge(
+    "rfq_sync_breaker_state",
+    "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+    ["dependency"],
+)
+BREAKER_OPENS = Counter(
+    "rfq_sync_breaker_opens_total",
+    "Times a dependency's circuit breaker opened",
+    ["dependency"],
+)
+BREAKER_REJECTED = Counter(
+    "rfq_sync_breaker_rejected_total",
+    "Calls refused because a dependency's circuit breaker was open",
+    ["dependency"],
+)
+MESSAGES_HELD = Gauge(
+    "rfq_sync_messages_held",
+    "Messages held for retry until an unavailable dependency recovers",
+    ["dependency"],
+)
+DEPENDENCY_RETRIES = Counter(
+    "rfq_sync_dependency_retries_total",
+    "Messages retried after a dependency call failed while its breaker was closed",
+    ["dependency"],
+)
+DEPENDENCY_RETRIES_EXHAUSTED = Counter(
+    "rfq_sync_dependency_retries_exhausted_total",
+    "Messages dead-lettered after RETRY_MAX_ATTEMPTS failed dependency calls",
+    ["dependency"],
+)
+
+# Sync state index
+SYNC_STATE_ENTRIES = Gauge(
+    "rfq_sync_state_entries",
+    "RFQs held in the in-memory sync state index",
+)
+SYNC_STATE_SNAPSHOT_FAILURES = Counter(
+    "rfq_sync_state_snapshot_failures_total",
+    "Sync state snapshots to Redis that failed and will be retried",
+)
+
+# Logging
+LOG_RECORDS_DROPPED = Counter(
+    "rfq_sync_log_records_dropped_total",
+    "Log records dropped because the background writer's queue was full",
+)
@@ -0,0 +1,231 @@
+# =============================================================================
+# FILE: src/utils/profiling.py
+# On-demand CPU, asyncio and allocation profiling of the running process
+# =============================================================================
+
+import asyncio
+import cProfile
+import io
+import json
+import linecache
+import logging
+import pstats
+import shutil
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from src.config import settings
+
+logger = structlog.get_logger(__name__)
+
+MAX_SLOW_CALLBACKS = 10_000
+TOP_STATS = 50
+
+# Allocations made by the profiling itself (debug-mode source tracebacks)
+_OWN_ALLOCATIONS = [
+    tracemalloc.Filter(False, module.__file__)
+    for module in (linecache, traceback, tracemalloc)
+]
+
+
+def _memory_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_OWN_ALLOCATIONS)
+
+
+class _SlowCallbackCollector(logging.Handler):
+    """Collects asyncio's "Executing <handle> took N seconds" warnings."""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.records: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if len(self.records) < MAX_SLOW_CALLBACKS:
+            self.records.append(f"{datetime.utcnow().isoformat()} {record.getMessage()}")
+
+
+def _coroutine_name(task: asyncio.Task) -> str:
+    coro = task.get_coro()
+    return getattr(coro, "__qualname__", repr(coro))
+
+
+def _task_dump(tasks: List[asyncio.Task]) -> List[Dict[str, Any]]:
+    """Live tasks grouped by coroutine, with one sample stack per group."""
+    groups: Dict[str, List[asyncio.Task]] = {}
+    for task in tasks:
+        groups.setdefault(_coroutine_name(task), []).append(task)
+
+    dump = []
+    for name, group in sorted(groups.items(), key=lambda g: -len(g[1])):
+        stack = io.StringIO()
+        group[0].print_stack(limit=20, file=stack)
+        dump.append({"coroutine": name, "count": len(group), "stack": stack.getvalue()})
+    return dump
+
+
+class RuntimeProfiler:
+    """
+    Profiles the live process for a bounded window and writes the results
+    to a timestamped directory under PROFILE_OUTPUT_DIR:
+
+    - cpu.prof / cpu.txt: cProfile of the event loop thread
+    - slow_callbacks.txt: callbacks that blocked the loop for longer than
+      PROFILE_SLOW_CALLBACK_MS (asyncio debug mode is on for the window)
+    - tasks.json: live task counts per coroutine, sampled every second,
+      and a stack per coroutine at the end
+    - memory.txt / memory.snapshot: tracemalloc top allocations and growth
+      over the window. Unless tracing was already on, only allocations
+      made during the window are seen.
+
+    Only one window runs at a time, and only the last PROFILE_KEEP_RESULTS
+    result directories are kept. Snapshots and result files are taken and
+    written off the event loop.
+    """
+
+    def __init__(self, output_dir: str = settings.PROFILE_OUTPUT_DIR):
+        self._output_dir = Path(output_dir)
+        self._task: Optional[asyncio.Task] = None
+        self._capturing = False
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._capturing or (self._task is not None and not self._task.done())
+
+    def start(self, seconds: float = settings.PROFILE_DEFAULT_SECONDS) -> bool:
+        """Start a profiling window in the background. False if one is running."""
+        if self.running:
+            logger.warning("Profiling already running")
+            return False
+        seconds = max(1.0, min(float(seconds), settings.PROFILE_MAX_SECONDS))
+        self._task = asyncio.create_task(self.capture(seconds))
+        self._task.add_done_callback(self._on_done)
+        return True
+
+    @staticmethod
+    def _on_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            logger.error("Profiling failed", error=str(task.exception()))
+
+    async def capture(self, seconds: float) -> Dict[str, Any]:
+        """Profile for `seconds` and write the result files."""
+        if self._capturing:
+            raise RuntimeError("Profiling already running")
+        self._capturing = True
+        try:
+            return await self._capture(seconds)
+        finally:
+            self._capturing = False
+
+    async def _capture(self, seconds: float) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        output_dir = self._output_dir / datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
+        logger.info("Profiling started", seconds=seconds, output_dir=str(output_dir))
+
+        asyncio_logger = logging.getLogger("asyncio")
+        slow_callbacks = _SlowCallbackCollector()
+        previous_debug = loop.get_debug()
+        previous_slow_callback = loop.slow_callback_duration
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(settings.PROFILE_TRACEMALLOC_FRAMES)
+        memory_before = await asyncio.to_thread(_memory_snapshot)
+        task_samples: List[Dict[str, Any]] = []
+        profiler = cProfile.Profile()
+
+        asyncio_logger.addHandler(slow_callbacks)
+        loop.slow_callback_duration = settings.PROFILE_SLOW_CALLBACK_MS / 1000
+        loop.set_debug(True)
+        started = time.monotonic()
+        profiler.enable()
+        try:
+            while (remaining := seconds - (time.monotonic() - started)) > 0:
+                counts = Counter(_coroutine_name(t) for t in asyncio.all_tasks())
+                task_samples.append({
+                    "t": round(time.monotonic() - started, 1),
+                    "total": sum(counts.values()),
+                    "by_coroutine": dict(counts.most_common(20)),
+                })
+                await asyncio.sleep(min(1.0, remaining))
+        finally:
+            profiler.disable()
+            loop.set_debug(previous_debug)
+            loop.slow_callback_duration = previous_slow_callback
+            asyncio_logger.removeHandler(slow_callbacks)
+            memory_after = await asyncio.to_thread(_memory_snapshot)
+            if started_tracing:
+                tracemalloc.stop()
+
+        tasks = {"samples": task_samples, "final": _task_dump(list(asyncio.all_tasks()))}
+        files = await asyncio.to_thread(
+            self._write_results,
+            output_dir,
+            profiler,
+            slow_callbacks.records,
+            tasks,
+            memory_before,
+            memory_after,
+        )
+        await asyncio.to_thread(self._remove_old_results, settings.PROFILE_KEEP_RESULTS)
+
+        self.last_result = {
+            "output_dir": str(output_dir),
+            "seconds": seconds,
+            "finished_at": datetime.utcnow().isoformat(),
+            "slow_callbacks": len(slow_callbacks.records),
+            "files": files,
+        }
+        logger.info(
+            "Profiling finished",
+            output_dir=str(output_dir),
+            slow_callbacks=len(slow_callbacks.records),
+        )
+        return self.last_result
+
+    @staticmethod
+    def _write_results(
+        output_dir: Path,
+        profiler: cProfile.Profile,
+        slow_callbacks: List[str],
+        tasks: Dict[str, Any],
+        memory_before: tracemalloc.Snapshot,
+        memory_after: tracemalloc.Snapshot,
+    ) -> List[str]:
+        profiler.dump_stats(output_dir / "cpu.prof")
+        with open(output_dir / "cpu.txt", "w") as f:
+            stats = pstats.Stats(profiler, stream=f)
+            for key in ("cumulative", "tottime"):
+                f.write(f"==== Sorted by {key} ====\n")
+                stats.sort_stats(key).print_stats(TOP_STATS)
+
+        (output_dir / "slow_callbacks.txt").write_text("\n".join(slow_callbacks) + "\n")
+        (output_dir / "tasks.json").write_text(json.dumps(tasks, indent=2))
+
+        memory_after.dump(str(output_dir / "memory.snapshot"))
+        with open(output_dir / "memory.txt", "w") as f:
+            f.write(f"==== Top {TOP_STATS} allocations by line ====\n")
+            for stat in memory_after.statistics("lineno")[:TOP_STATS]:
+                f.write(f"{stat}\n")
+            f.write(f"\n==== Top {TOP_STATS} changes over the window ====\n")
+            for stat in memory_after.compare_to(memory_before, "lineno")[:TOP_STATS]:
+                f.write(f"{stat}\n")
+
+        return sorted(path.name for path in output_dir.iterdir())
+
+    def _remove_old_results(self, keep: int) -> None:
+        """Delete all but the newest `keep` (at least one) result directories."""
+        results = sorted(path for path in self._output_dir.iterdir() if path.is_dir())
+        for path in results[:-max(keep, 1)]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# Singleton
+runtime_profiler = RuntimeProfiler()
@@ -0,0 +1,81 @@
+# =============================================================================
+# FILE: src/utils/startup.py
+# Startup phase timing and readiness state
+# =============================================================================
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import structlog
+
+from src.utils.metrics import SERVICE_READY, STARTUP_PHASE_SECONDS, TIME_TO_FIRST_SYNC
+
+logger = structlog.get_logger(__name__)
+
+
+class StartupTracker:
+    """
+    Times the startup phases and holds the readiness flag.
+    The clock starts when this module is first imported, which src.main
+    does before any heavy dependency is loaded.
+    """
+
+    def __init__(self):
+        self._started_at = time.monotonic()
+        self._phases: Dict[str, float] = {}
+        self._ready_at: Optional[float] = None
+        self._first_sync_at: Optional[float] = None
+        self.ready = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a startup phase."""
+        start = time.monotonic()
+        yield
+        elapsed = time.monotonic() - start
+        self._phases[name] = elapsed
+        STARTUP_PHASE_SECONDS.labels(phase=name).set(elapsed)
+        logger.info("Startup phase complete", phase=name, duration_ms=round(elapsed * 1000, 1))
+
+    def mark_ready(self) -> None:
+        """Warm-up finished; report ready."""
+        self._ready_at = time.monotonic()
+        self.ready = True
+        SERVICE_READY.set(1)
+        logger.info(
+            "Service ready",
+            startup_ms=round((self._ready_at - self._started_at) * 1000, 1),
+            phases_ms={name: round(s * 1000, 1) for name, s in self._phases.items()},
+        )
+
+    def mark_not_ready(self) -> None:
+        """Stop reporting ready (shutdown)."""
+        self.ready = False
+        SERVICE_READY.set(0)
+
+    def record_synced(self) -> None:
+        """Record a completed sync; the first one sets time-to-first-sync."""
+        if self._first_sync_at is not None:
+            return
+        self._first_sync_at = time.monotonic()
+        elapsed = self._first_sync_at - self._started_at
+        TIME_TO_FIRST_SYNC.set(elapsed)
+        logger.info("First message synced", time_to_first_sync_ms=round(elapsed * 1000, 1))
+
+    def report(self) -> Dict[str, Any]:
+        """Startup timings so far, in milliseconds."""
+
+        def since_start(at: Optional[float]) -> Optional[float]:
+            return round((at - self._started_at) * 1000, 1) if at is not None else None
+
+        return {
+            "ready": self.ready,
+            "phases_ms": {name: round(s * 1000, 1) for name, s in self._phases.items()},
+            "ready_ms": since_start(self._ready_at),
+            "time_to_first_sync_ms": since_start(self._first_sync_at),
+        }
+
+
+# Singleton
+startup_tracker = StartupTracker()
@@ -0,0 +1,27 @@
+# =============================================================================
+# FILE: tests/conftest.py
+# Shared fixtures: the harness stand-ins for Redis and the Medusa database
+# =============================================================================
+
+import pytest
+
+from benchmarks.harness.fakes import FaultModel, InMemoryMedusaDB, InMemoryRedis
+
+
+@pytest.fixture
+def redis_fault() -> FaultModel:
+    return FaultModel()
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch, redis_fault: FaultModel) -> InMemoryRedis:
+    client = InMemoryRedis(redis_fault)
+    monkeypatch.setattr("src.services.redis_client._redis_client", client)
+    return client
+
+
+@pytest.fixture
+def medusa_db(monkeypatch: pytest.MonkeyPatch) -> InMemoryMedusaDB:
+    client = InMemoryMedusaDB()
+    monkeypatch.setattr("src.services.medusa_db._medusa_db", client)
+    return client
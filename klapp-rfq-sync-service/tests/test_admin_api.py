@@ -0,0 +1,128 @@
+# =============================================================================
+# FILE: tests/test_admin_api.py
+# Access to the admin endpoints and the profiler's session handling
+# =============================================================================
+
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api import server
+from src.api.server import create_app
+from src.config import settings
+from src.services import medusa_db
+from src.services.medusa_db import MedusaDBClient
+from src.utils.profiling import RuntimeProfiler
+from src.utils.startup import StartupTracker
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def profiler(monkeypatch: pytest.MonkeyPatch, tmp_path) -> RuntimeProfiler:
+    profiler = RuntimeProfiler(output_dir=str(tmp_path))
+    monkeypatch.setattr(server, "runtime_profiler", profiler)
+    return profiler
+
+
+@pytest.fixture
+async def client(profiler: RuntimeProfiler):
+    async with TestClient(TestServer(create_app())) as client:
+        yield client
+    if profiler.running:
+        profiler._task.cancel()
+
+
+def enable_admin(monkeypatch: pytest.MonkeyPatch, token=TOKEN) -> None:
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", token)
+
+
+async def test_profile_endpoint_is_off_by_default(client):
+    assert (await client.post("/admin/profile")).status == 404
+    assert (await client.get("/admin/profile")).status == 404
+
+
+async def test_profile_endpoint_needs_a_token_even_when_enabled(client, monkeypatch):
+    enable_admin(monkeypatch, token=None)
+
+    response = await client.post("/admin/profile", headers={"Authorization": "Bearer "})
+
+    assert response.status == 404
+
+
+@pytest.mark.parametrize("header", [None, "Bearer wrong", TOKEN, f"Basic {TOKEN}"])
+async def test_profile_endpoint_rejects_bad_credentials(client, monkeypatch, profiler, header):
+    enable_admin(monkeypatch)
+    headers = {"Authorization": header} if header else {}
+
+    response = await client.post("/admin/profile", headers=headers)
+
+    assert response.status == 401
+    assert not profiler.running
+
+
+async def test_profile_endpoint_starts_once(client, monkeypatch, profiler):
+    enable_admin(monkeypatch)
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+
+    first = await client.post("/admin/profile?seconds=5", headers=headers)
+    second = await client.post("/admin/profile?seconds=5", headers=headers)
+    status = await client.get("/admin/profile", headers=headers)
+
+    assert first.status == 202
+    assert second.status == 409
+    assert status.status == 200
+    assert (await status.json())["running"] is True
+
+
+@pytest.fixture
+def ready_db(monkeypatch: pytest.MonkeyPatch) -> None:
+    tracker = StartupTracker()
+    tracker.mark_ready()
+    client = MedusaDBClient()
+
+    async def get_medusa_db():
+        return client
+
+    monkeypatch.setattr(server, "startup_tracker", tracker)
+    monkeypatch.setattr(medusa_db, "get_medusa_db", get_medusa_db)
+
+
+async def test_query_report_needs_the_admin_token(client, monkeypatch, ready_db):
+    assert (await client.get("/debug/queries")).status == 404
+
+    enable_admin(monkeypatch)
+    assert (await client.get("/debug/queries")).status == 401
+    response = await client.get("/debug/queries", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status == 200
+    assert "slow_statements" in await response.json()
+
+
+async def test_overlapping_capture_is_rejected(profiler):
+    first = asyncio.create_task(profiler.capture(0.2))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(RuntimeError):
+        await profiler.capture(0.1)
+    assert not profiler.start()
+
+    result = await first
+    assert "cpu.prof" in result["files"]
+    assert not profiler.running
+
+
+async def test_old_results_are_removed(profiler, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILE_KEEP_RESULTS", 2)
+    for name in ("20260101T000000Z", "20260101T000001Z", "20260101T000002Z"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "cpu.txt").write_text("old")
+
+    result = await profiler.capture(0.05)
+
+    remaining = sorted(path.name for path in tmp_path.iterdir())
+    assert len(remaining) == 2
+    assert remaining[-1] == result["output_dir"].rsplit("/", 1)[-1]
+    assert remaining[0] == "20260101T000002Z"
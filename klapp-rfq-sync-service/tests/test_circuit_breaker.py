@@ -0,0 +1,308 @@
+# =============================================================================
+# FILE: tests/test_circuit_breaker.py
+# Dependency breaker state transitions, failure classification and retries
+# =============================================================================
+
+import asyncio
+
+import asyncpg
+import pytest
+
+from src.config import settings
+from src.consumers.worker_pool import run_handler
+from src.services import medusa_db
+from src.services.breakers import is_medusa_db_failure
+from src.services.medusa_db import MedusaDBClient
+from src.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    DependencyBreaker,
+    DependencyUnavailable,
+)
+
+
+def make_breaker(**overrides) -> DependencyBreaker:
+    options = dict(
+        failure_threshold=3,
+        recovery_timeout=0.05,
+        half_open_max_calls=1,
+        success_threshold=2,
+        probe_interval=0.01,
+    )
+    options.update(overrides)
+    return DependencyBreaker("test", lambda e: isinstance(e, ConnectionError), **options)
+
+
+async def call(breaker: DependencyBreaker, error: Exception = None) -> None:
+    async with breaker.guard():
+        if error:
+            raise error
+
+
+async def fail(breaker: DependencyBreaker, times: int = 1) -> None:
+    for _ in range(times):
+        with pytest.raises(DependencyUnavailable):
+            await call(breaker, ConnectionError("down"))
+
+
+async def until_state(breaker: DependencyBreaker, state: str, timeout: float = 1.0) -> None:
+    async def poll():
+        while breaker.state != state:
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+# -----------------------------------------------------------------------------
+# State transitions
+# -----------------------------------------------------------------------------
+
+async def test_consecutive_failures_open_the_breaker():
+    breaker = make_breaker()
+    await fail(breaker, 2)
+    await call(breaker)  # A success resets the count
+    await fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+    await fail(breaker)
+    assert breaker.state == OPEN
+
+    with pytest.raises(DependencyUnavailable) as refused:
+        await call(breaker)
+    assert refused.value.state == OPEN
+    assert refused.value.__cause__ is None
+
+
+async def test_other_errors_count_as_success_and_pass_through():
+    breaker = make_breaker()
+    await fail(breaker, 2)
+
+    with pytest.raises(ValueError):
+        await call(breaker, ValueError("bad row"))
+    await fail(breaker, 2)
+
+    assert breaker.state == CLOSED
+
+
+async def test_half_open_closes_after_enough_successes():
+    breaker = make_breaker()
+    changes = []
+    breaker.add_listener(lambda b: changes.append(b.state))
+    await fail(breaker, 3)
+
+    await until_state(breaker, HALF_OPEN)
+    await call(breaker)
+    assert breaker.state == HALF_OPEN
+    await call(breaker)
+
+    assert breaker.state == CLOSED
+    assert changes == [OPEN, HALF_OPEN, CLOSED]
+
+
+async def test_half_open_failure_reopens():
+    breaker = make_breaker()
+    await fail(breaker, 3)
+    await until_state(breaker, HALF_OPEN)
+
+    with pytest.raises(DependencyUnavailable) as failed:
+        await call(breaker, ConnectionError("still down"))
+
+    assert failed.value.state == HALF_OPEN
+    assert breaker.state == OPEN
+    assert breaker.get_metrics()["opened_count"] == 2
+
+
+async def test_half_open_limits_concurrent_trial_calls():
+    breaker = make_breaker()
+    await fail(breaker, 3)
+    await until_state(breaker, HALF_OPEN)
+
+    release = asyncio.Event()
+
+    async def slow_call():
+        async with breaker.guard():
+            await release.wait()
+
+    trial = asyncio.create_task(slow_call())
+    await asyncio.sleep(0)
+    assert not breaker.allows()
+    with pytest.raises(DependencyUnavailable):
+        await call(breaker)
+
+    release.set()
+    await trial
+    assert breaker.allows()
+
+
+async def test_probe_closes_the_breaker_without_traffic():
+    breaker = make_breaker()
+    breaker.set_probe(lambda: call(breaker))
+    await fail(breaker, 3)
+
+    await until_state(breaker, CLOSED)
+
+
+async def test_wait_returns_once_calls_are_let_through():
+    breaker = make_breaker()
+    await fail(breaker, 3)
+
+    waiter = asyncio.create_task(breaker.wait())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await asyncio.wait_for(waiter, 1.0)
+    assert breaker.state == HALF_OPEN
+
+
+# -----------------------------------------------------------------------------
+# Medusa DB failure classification
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("error, counts", [
+    (ConnectionRefusedError(), True),
+    (ConnectionError("Timed out connecting to the Medusa database"), True),
+    (asyncpg.CannotConnectNowError(), True),
+    (asyncpg.TooManyConnectionsError(), True),
+    (asyncio.TimeoutError(), False),
+    (asyncpg.UniqueViolationError(), False),
+    (ValueError(), False),
+])
+def test_medusa_db_failures(error, counts):
+    assert is_medusa_db_failure(error) is counts
+
+
+class TimingOutPool:
+    def __init__(self, on_acquire: bool):
+        self.on_acquire = on_acquire
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                if pool.on_acquire:
+                    raise asyncio.TimeoutError()
+                return object()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+@pytest.fixture
+def medusa_breaker(monkeypatch: pytest.MonkeyPatch) -> DependencyBreaker:
+    breaker = DependencyBreaker("medusa_db", is_medusa_db_failure, failure_threshold=1)
+    monkeypatch.setattr(medusa_db, "medusa_db_breaker", breaker)
+    return breaker
+
+
+async def test_connect_timeout_counts_against_the_breaker(medusa_breaker):
+    client = MedusaDBClient()
+
+    with pytest.raises(DependencyUnavailable):
+        async with client._acquire("primary", TimingOutPool(on_acquire=True)):
+            pass
+
+    assert medusa_breaker.state == OPEN
+
+
+async def test_statement_timeout_does_not(medusa_breaker):
+    client = MedusaDBClient()
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with client._acquire("primary", TimingOutPool(on_acquire=False)):
+            raise asyncio.TimeoutError()
+
+    assert medusa_breaker.state == CLOSED
+
+
+# -----------------------------------------------------------------------------
+# run_handler retries
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "RETRY_WAIT_EXPONENTIAL_MULTIPLIER", 0.001)
+
+
+async def test_failures_while_others_succeed_are_retried_then_raised(no_backoff):
+    breaker = make_breaker(failure_threshold=3)
+    calls = []
+
+    async def handler(message):
+        await call(breaker)  # Other traffic keeps the breaker closed
+        calls.append(message)
+        await call(breaker, ConnectionError("reset"))
+
+    with pytest.raises(DependencyUnavailable):
+        await run_handler(handler, "m", timeout_seconds=1.0, max_attempts=6)
+
+    assert breaker.state == CLOSED
+    assert calls == ["m"] * 6
+
+
+async def test_attempts_outlast_the_failure_threshold(no_backoff):
+    breaker = make_breaker(failure_threshold=5)
+    calls = []
+
+    async def handler(message):
+        await call(breaker)
+        calls.append(message)
+        await call(breaker, ConnectionError("reset"))
+
+    with pytest.raises(DependencyUnavailable):
+        await run_handler(handler, "m", timeout_seconds=1.0, max_attempts=3)
+
+    assert calls == ["m"] * 6
+
+
+async def test_single_message_against_a_down_dependency_is_held(no_backoff):
+    breaker = make_breaker(failure_threshold=5, recovery_timeout=0.1)
+    down = True
+    breaker.set_probe(lambda: call(breaker, ConnectionError("down") if down else None))
+    calls = []
+
+    async def handler(message):
+        calls.append(message)
+        await call(breaker, ConnectionError("down") if down else None)
+
+    task = asyncio.create_task(run_handler(handler, "m", timeout_seconds=1.0, max_attempts=3))
+    await until_state(breaker, OPEN)
+    await asyncio.sleep(0.3)  # Half-open trials keep failing
+    assert not task.done()
+
+    down = False
+    await asyncio.wait_for(task, 2.0)
+    assert breaker.state == CLOSED
+    assert len(calls) >= 6
+
+
+async def test_outage_does_not_use_up_attempts(no_backoff):
+    breaker = make_breaker(failure_threshold=1)
+    breaker.set_probe(lambda: call(breaker))
+    calls = []
+
+    async def handler(message):
+        calls.append(message)
+        await call(breaker, ConnectionError("down") if len(calls) == 1 else None)
+
+    await asyncio.wait_for(run_handler(handler, "m", timeout_seconds=1.0, max_attempts=2), 2.0)
+
+    assert breaker.state == CLOSED
+    assert calls == ["m", "m"]
+
+
+async def test_refused_calls_are_held_not_counted(no_backoff):
+    breaker = make_breaker()
+    await fail(breaker, 3)
+    refused = []
+
+    async def handler(message):
+        if breaker.state == OPEN:
+            refused.append(message)
+        await call(breaker)
+
+    await asyncio.wait_for(run_handler(handler, "m", timeout_seconds=1.0, max_attempts=1), 2.0)
+
+    assert refused == ["m"]
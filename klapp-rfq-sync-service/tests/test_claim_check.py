@@ -0,0 +1,99 @@
+# =============================================================================
+# FILE: tests/test_claim_check.py
+# Claim check round trip through the local blob store
+# =============================================================================
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from src.config import settings
+from src.models.events import ClaimCheckRef, RFQSyncRequest
+from src.services.blob_store import LocalFileBlobStore
+from src.services.claim_check import check_in, check_out, release
+
+
+def make_event(items: int, priority: str = "urgent") -> dict:
+    return {
+        "event_id": "evt-1",
+        "event_type": "rfq.sync.to_medusa",
+        "event_timestamp": datetime(2026, 1, 1).isoformat(),
+        "source_service": "email-service",
+        "idempotency_key": "key-1",
+        "email_rfq_id": "email-1",
+        "rfq_number": "RFQ-1",
+        "rfq_data": {
+            "rfq_number": "RFQ-1",
+            "priority": priority,
+            "customer": {"email": "buyer@example.com"},
+            "line_items": [{"description": f"Part {i}", "quantity": i} for i in range(items)],
+        },
+    }
+
+
+@pytest.fixture
+def store(tmp_path) -> LocalFileBlobStore:
+    return LocalFileBlobStore(str(tmp_path))
+
+
+@pytest.fixture
+def small_threshold(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CLAIM_CHECK_THRESHOLD_BYTES", 512)
+
+
+async def test_small_payload_stays_inline(store):
+    event = make_event(2)
+    assert await check_in(event, store) is event
+
+
+async def test_round_trip(store, small_threshold):
+    event = make_event(50)
+
+    checked_in = await check_in(event, store)
+
+    assert "rfq_data" not in checked_in
+    ref = ClaimCheckRef(**checked_in["rfq_data_ref"])
+    assert ref.line_item_count == 50
+    header, line_items = await check_out(ref, store)
+    assert header == {k: v for k, v in event["rfq_data"].items() if k != "line_items"}
+    assert [item async for item in line_items] == event["rfq_data"]["line_items"]
+
+
+async def test_routing_fields_are_copied(store, small_threshold):
+    checked_in = await check_in(make_event(50, priority="urgent"), store)
+    assert checked_in["priority"] == "urgent"
+
+
+async def test_release_deletes_blob(store, small_threshold):
+    ref = ClaimCheckRef(**(await check_in(make_event(50), store))["rfq_data_ref"])
+
+    await release(ref, store)
+    await release(ref, store)  # Already gone: not an error
+
+    with pytest.raises(FileNotFoundError):
+        await check_out(ref, store)
+
+
+async def test_blob_outside_store_is_rejected(store):
+    with pytest.raises(ValueError):
+        await store.put("../escape.jsonl", [b"{}"])
+    with pytest.raises(ValueError):
+        await check_out(ClaimCheckRef(uri="file:///etc/passwd", size_bytes=1), store)
+
+
+async def test_checked_in_event_validates(store, small_threshold):
+    request = RFQSyncRequest(**await check_in(make_event(50), store))
+    assert request.rfq_data == {}
+    assert request.rfq_data_ref is not None
+
+
+def test_request_needs_exactly_one_payload():
+    event = make_event(1)
+    ref = {"uri": "file:///tmp/x.jsonl", "size_bytes": 1}
+
+    with pytest.raises(ValidationError):
+        RFQSyncRequest(**{k: v for k, v in event.items() if k != "rfq_data"})
+    with pytest.raises(ValidationError):
+        RFQSyncRequest(**event, rfq_data_ref=ref)
+    assert RFQSyncRequest(**event).rfq_data_ref is None
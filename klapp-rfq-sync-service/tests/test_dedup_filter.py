@@ -0,0 +1,115 @@
+# =============================================================================
+# FILE: tests/test_dedup_filter.py
+# DuplicateFilter: local window, Bloom filter and Medusa DB confirmation
+# =============================================================================
+
+import time
+
+import pytest
+
+from benchmarks.harness.fakes import FakeMessage
+from src.config import settings
+from src.consumers.handlers import SyncToMedusaHandler
+from src.services import dedup_filter as dedup_module
+from src.services.dedup_filter import DuplicateFilter
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch):
+    """Shifts time.monotonic forward by clock[0] seconds."""
+    offset = [0.0]
+    real = time.monotonic
+    monkeypatch.setattr(dedup_module.time, "monotonic", lambda: real() + offset[0])
+    return offset
+
+
+async def test_local_hit_remembers_medusa_id():
+    dedup = DuplicateFilter(bloom_enabled=False)
+    assert not await dedup.is_duplicate("key-1", "email-1")
+
+    await dedup.mark_synced("key-1", "rfq_1")
+
+    assert await dedup.is_duplicate("key-1", "email-1")
+    assert dedup.synced_medusa_id("key-1") == "rfq_1"
+    assert dedup.get_metrics()["local_hits"] == 1
+
+
+async def test_missing_key_is_never_a_duplicate():
+    dedup = DuplicateFilter(bloom_enabled=False)
+    await dedup.mark_synced(None)
+    assert not await dedup.is_duplicate(None, "email-1")
+
+
+async def test_local_keys_expire_after_window(clock):
+    dedup = DuplicateFilter(window_seconds=120, bucket_seconds=60, bloom_enabled=False)
+    await dedup.mark_synced("key-1")
+
+    clock[0] += 60
+    assert await dedup.is_duplicate("key-1", "email-1")
+
+    clock[0] += 120
+    assert not await dedup.is_duplicate("key-1", "email-1")
+
+
+async def test_bloom_hit_is_confirmed_in_medusa(redis, medusa_db):
+    # Synced by another replica: only the shared Bloom filter knows the key
+    await DuplicateFilter().mark_synced("key-1", "rfq_1")
+    medusa_db._rows["email-1"] = {"id": "rfq_1"}
+    dedup = DuplicateFilter()
+
+    assert await dedup.is_duplicate("key-1", "email-1")
+    assert dedup.get_metrics()["bloom_hits_confirmed"] == 1
+    assert dedup.synced_medusa_id("key-1") == "rfq_1"
+    # Remembered locally: the next check does not query Medusa
+    assert await dedup.is_duplicate("key-1", "email-1")
+    assert dedup.get_metrics()["local_hits"] == 1
+
+
+async def test_bloom_false_positive_is_not_discarded(redis, medusa_db):
+    await DuplicateFilter().mark_synced("key-1")
+    dedup = DuplicateFilter()
+
+    assert not await dedup.is_duplicate("key-1", "email-1")
+    assert dedup.get_metrics()["bloom_false_positives"] == 1
+
+
+async def test_bloom_miss(redis, medusa_db):
+    dedup = DuplicateFilter()
+    assert not await dedup.is_duplicate("key-1", "email-1")
+    assert dedup.get_metrics()["misses"] == 1
+
+
+async def test_redis_errors_never_discard(redis, redis_fault, medusa_db):
+    await DuplicateFilter().mark_synced("key-1")
+    medusa_db._rows["email-1"] = {"id": "rfq_1"}
+    redis_fault.down = True
+
+    assert not await DuplicateFilter().is_duplicate("key-1", "email-1")
+
+
+def test_bloom_parameters():
+    bits, hashes = DuplicateFilter.bloom_parameters(1_000_000, 0.001)
+    assert 14_000_000 < bits < 15_000_000
+    assert hashes == 10
+
+
+async def test_duplicate_still_publishes_sync_completed(monkeypatch):
+    sent = []
+
+    async def send(topic, value, key):
+        sent.append((topic, value, key))
+
+    dedup = DuplicateFilter(bloom_enabled=False)
+    monkeypatch.setattr("src.consumers.handlers.duplicate_filter", dedup)
+    await dedup.mark_synced("key-1", "rfq_1")
+    event = {"idempotency_key": "key-1", "email_rfq_id": "email-1", "rfq_number": "RFQ-1"}
+
+    await SyncToMedusaHandler(send).handle(
+        FakeMessage(settings.TOPIC_RFQ_SYNC_TO_MEDUSA, 0, 0, "RFQ-1", event, 0)
+    )
+
+    [(topic, value, key)] = sent
+    assert topic == settings.TOPIC_RFQ_SYNC_COMPLETED
+    assert key == "RFQ-1"
+    assert value["sync_status"] == "completed"
+    assert value["medusa_rfq_id"] == "rfq_1"
@@ -0,0 +1,213 @@
+# =============================================================================
+# FILE: tests/test_handler_registry.py
+# Handler routing, per-handler worker pools and topic pause/resume
+# =============================================================================
+
+import asyncio
+
+import pytest
+
+from benchmarks.harness.fakes import InMemoryKafkaConsumer, InMemoryKafkaProducer
+from src.config import settings
+from src.consumers.handler_registry import HandlerRegistry, MessageHandler
+from src.consumers.sync_consumer import SyncConsumer
+from src.consumers.worker_pool import WorkerPool
+
+
+class GatedHandler(MessageHandler):
+    """Records messages; each one waits until the gate is open."""
+
+    concurrency = 1
+    queue_size = 2
+    timeout_seconds = 5.0
+
+    def __init__(self, name: str, gated: bool = False):
+        self.name = name
+        self.handled = []
+        self.gate = asyncio.Event()
+        if not gated:
+            self.gate.set()
+
+    async def handle(self, message):
+        await self.gate.wait()
+        self.handled.append(message.value["n"])
+
+
+async def until(condition, timeout: float = 2.0) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.005)
+    await asyncio.wait_for(poll(), timeout)
+
+
+# -----------------------------------------------------------------------------
+# HandlerRegistry
+# -----------------------------------------------------------------------------
+
+def test_event_type_route_wins_over_catch_all():
+    registry = HandlerRegistry()
+    catch_all, specific = GatedHandler("catch_all"), GatedHandler("specific")
+    registry.register(catch_all, ["rfq"])
+    registry.register(specific, ["rfq"], event_types=["rfq.cancelled"])
+
+    assert registry.resolve("rfq", "rfq.cancelled") is specific
+    assert registry.resolve("rfq", "rfq.created") is catch_all
+    assert registry.resolve("rfq") is catch_all
+    assert registry.resolve("other") is None
+    assert registry.topics == ["rfq"]
+    assert registry.handlers_for("rfq") == [catch_all, specific]
+
+
+def test_conflicting_routes_are_rejected():
+    registry = HandlerRegistry()
+    registry.register(GatedHandler("a"), ["rfq"])
+
+    with pytest.raises(ValueError):
+        registry.register(GatedHandler("b"), ["rfq"])
+    with pytest.raises(ValueError):
+        registry.register(GatedHandler("a"), ["other"])
+
+
+# -----------------------------------------------------------------------------
+# WorkerPool
+# -----------------------------------------------------------------------------
+
+async def test_pool_reports_full_and_waits_for_room():
+    handled, done = [], []
+    gate = asyncio.Event()
+
+    async def handler(message):
+        await gate.wait()
+        handled.append(message)
+
+    async def on_error(message, error):
+        raise AssertionError(error)
+
+    pool = WorkerPool("test", handler, 1, 4, None, on_error, done.append)
+    pool.start()
+    for n in range(5):
+        pool.put(n)
+    await asyncio.sleep(0)
+
+    assert pool.full()
+    assert pool.pending() == 5
+    room = asyncio.create_task(pool.wait_for_room())
+    await asyncio.sleep(0.01)
+    assert not room.done()
+
+    gate.set()
+    await asyncio.wait_for(room, 1.0)
+    await until(lambda: pool.pending() == 0)
+    await pool.stop()
+
+    assert handled == [0, 1, 2, 3, 4]
+    assert done == handled
+
+
+async def test_pool_passes_failures_and_timeouts_to_on_error():
+    errors, done = [], []
+
+    async def handler(message):
+        if message == "slow":
+            await asyncio.sleep(1)
+        if message == "bad":
+            raise ValueError("bad message")
+
+    async def on_error(message, error):
+        errors.append((message, type(error)))
+
+    pool = WorkerPool("test", handler, 2, 10, 0.05, on_error, done.append)
+    pool.start()
+    for message in ("slow", "bad", "good"):
+        pool.put(message)
+    await until(lambda: len(done) == 3)
+    await pool.stop()
+
+    assert sorted(errors) == sorted([("slow", asyncio.TimeoutError), ("bad", ValueError)])
+
+
+# -----------------------------------------------------------------------------
+# SyncConsumer: topic pause/resume and routing failures
+# -----------------------------------------------------------------------------
+
+class RejectingPool(WorkerPool):
+    """Raises from put() for messages marked "reject"."""
+
+    def put(self, message):
+        if message.value.get("reject"):
+            raise RuntimeError("queue broken")
+        super().put(message)
+
+
+class RejectingHandler(GatedHandler):
+    def create_pool(self, on_error, on_done):
+        return RejectingPool(self.name, self.handle, 1, 10, 5.0, on_error, on_done)
+
+
+@pytest.fixture
+async def consumer():
+    kafka = InMemoryKafkaConsumer(partitions=1)
+    producer = InMemoryKafkaProducer()
+    slow, fast = GatedHandler("slow", gated=True), GatedHandler("fast")
+    registry = HandlerRegistry()
+    registry.register(slow, ["slow-topic"])
+    registry.register(fast, ["fast-topic"])
+    registry.register(RejectingHandler("rejecting"), ["rejecting-topic"])
+    sync_consumer = SyncConsumer(kafka, producer, registry)
+    await sync_consumer.start()
+    task = asyncio.create_task(sync_consumer.run())
+    yield kafka, sync_consumer, slow, fast
+    await sync_consumer.stop()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_full_handler_pauses_only_its_topic_and_resumes(consumer):
+    kafka, sync_consumer, slow, fast = consumer
+    for n in range(10):
+        await kafka.publish("slow-topic", {"n": n}, key="k")
+
+    await until(lambda: "slow-topic" in sync_consumer.get_metrics()["paused_topics"])
+    assert {tp.topic for tp in kafka.paused()} == {"slow-topic"}
+    assert kafka.lag() > 0
+
+    for n in range(3):
+        await kafka.publish("fast-topic", {"n": n}, key="k")
+    await until(lambda: len(fast.handled) == 3)
+
+    slow.gate.set()
+    await until(lambda: len(slow.handled) == 10)
+    assert slow.handled == list(range(10))
+    assert not sync_consumer.get_metrics()["paused_topics"]
+    assert not kafka.paused()
+
+
+async def test_unroutable_message_is_dead_lettered_and_committed(consumer, monkeypatch):
+    kafka, sync_consumer, _, fast = consumer
+    resolve = sync_consumer._registry.resolve
+
+    def failing_resolve(topic, event_type=None):
+        if event_type == "broken":
+            raise KeyError(event_type)
+        return resolve(topic, event_type)
+
+    monkeypatch.setattr(sync_consumer._registry, "resolve", failing_resolve)
+    await kafka.publish("fast-topic", {"n": 0}, key="k")
+    await kafka.publish("fast-topic", {"n": 1, "event_type": "broken"}, key="k")
+    await kafka.publish("fast-topic", {"n": 2}, key="k")
+
+    await until(lambda: len(fast.handled) == 2 and sync_consumer.pending() == 0)
+    assert fast.handled == [0, 2]
+    assert sync_consumer._producer.sent[settings.TOPIC_RFQ_DLQ] == 1
+    await sync_consumer._commit()
+    assert kafka.uncommitted() == 0
+
+
+async def test_pool_that_rejects_a_message_does_not_stop_fetching(consumer):
+    kafka, sync_consumer, _, fast = consumer
+    await kafka.publish("rejecting-topic", {"n": 0, "reject": True}, key="k")
+    await kafka.publish("fast-topic", {"n": 1}, key="k")
+
+    await until(lambda: fast.handled == [1])
+    await until(lambda: sync_consumer._producer.sent.get(settings.TOPIC_RFQ_DLQ) == 1)
+    assert sync_consumer.pending() == 0
@@ -0,0 +1,104 @@
+# =============================================================================
+# FILE: tests/test_log_sampling.py
+# Sampled per-message logging (including lock contention) and the background
+# writer's drop counter
+# =============================================================================
+
+import asyncio
+import logging
+import queue
+
+from src.config import settings
+from src.models.events import SyncStatus
+from src.models.internal import SyncWork
+from src.services import sync_processor
+from src.services.sync_processor import SyncProcessor
+from src.utils import log_sampling
+from src.utils.log_sampling import SampledLogger, run_summary_flusher
+from src.utils.logging_config import _DeferredQueueHandler
+from src.utils.metrics import LOG_RECORDS_DROPPED
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.records = []
+
+    def __getattr__(self, level):
+        return lambda event, **fields: self.records.append((level, event, fields))
+
+    def events(self, level=None):
+        return [event for lvl, event, _ in self.records if level in (None, lvl)]
+
+
+def test_info_is_sampled_and_summarized():
+    logger = RecordingLogger()
+    sampled = SampledLogger(logger, burst=3, interval_seconds=60)
+
+    for _ in range(10):
+        sampled.info("Synced")
+    assert logger.events() == ["Synced"] * 3
+
+    sampled.flush()
+    level, event, fields = logger.records[-1]
+    assert event == "Log summary"
+    assert fields["events"] == {"Synced": {"logged": 3, "suppressed": 7}}
+
+
+def test_warnings_and_errors_are_never_sampled():
+    logger = RecordingLogger()
+    sampled = SampledLogger(logger, burst=1, interval_seconds=60)
+
+    for _ in range(5):
+        sampled.warning("Slow statement")
+        sampled.error("Sync failed")
+
+    assert logger.events("warning") == ["Slow statement"] * 5
+    assert logger.events("error") == ["Sync failed"] * 5
+    sampled.flush()
+    assert "Log summary" not in logger.events()
+
+
+async def test_lock_contention_is_sampled(redis, monkeypatch):
+    logger = RecordingLogger()
+    sampled = SampledLogger(logger, burst=3, interval_seconds=60)
+    monkeypatch.setattr(sync_processor, "sampled_logger", sampled)
+    work = SyncWork(
+        event_id="evt-1",
+        idempotency_key="key-1",
+        email_rfq_id="email-1",
+        rfq_number="RFQ-1",
+        rfq_data={},
+    )
+    await redis.set(f"{settings.REDIS_KEY_PREFIX}lock:email-1", "1")
+
+    for _ in range(10):
+        outcome = await SyncProcessor().process_sync_to_medusa(work)
+        assert outcome.sync_status == SyncStatus.PENDING
+
+    assert logger.events() == ["Lock not acquired, skipping"] * 3
+
+
+async def test_summary_is_flushed_after_a_burst_stops(monkeypatch):
+    monkeypatch.setattr(log_sampling, "FLUSH_CHECK_SECONDS", 0.01)
+    logger = RecordingLogger()
+    sampled = SampledLogger(logger, burst=1, interval_seconds=0.05)
+    sampled.info("Synced")
+    sampled.info("Synced")
+
+    flusher = asyncio.create_task(run_summary_flusher())
+    await asyncio.sleep(0.2)
+    flusher.cancel()
+
+    assert logger.events()[-1] == "Log summary"
+
+
+def test_dropped_records_are_counted():
+    handler = _DeferredQueueHandler(queue.Queue(maxsize=1))
+    before = LOG_RECORDS_DROPPED._value.get()
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "message", None, None)
+
+    handler.enqueue(record)
+    handler.enqueue(record)
+
+    assert handler.dropped == 1
+    assert LOG_RECORDS_DROPPED._value.get() == before + 1
@@ -0,0 +1,59 @@
+# =============================================================================
+# FILE: tests/test_mapping.py
+# Compiled mapping: equivalence with the reference RFQTransformer, and spec checks
+# =============================================================================
+
+import pytest
+
+from benchmarks.bench_mapping import edge_cases
+from benchmarks.fixtures import make_rfq_data
+from src.services.mapping import EMAIL_TO_MEDUSA_MAPPING, CompiledMapping, email_to_medusa_mapping
+from src.services.transformer import transformer
+
+CASES = edge_cases()
+
+
+@pytest.mark.parametrize("data", CASES, ids=[f"case{i}" for i in range(len(CASES))])
+def test_transform_matches_reference(data):
+    assert email_to_medusa_mapping.transform(data) == transformer.transform_email_to_record(data)
+
+
+def test_transform_batch_matches_reference_in_order():
+    records = CASES + [make_rfq_data(n, seq) for seq, n in enumerate((3, 25, 500))]
+
+    batch = email_to_medusa_mapping.transform_batch(records)
+
+    assert batch == [transformer.transform_email_to_record(data) for data in records]
+
+
+def test_input_is_not_modified():
+    data = make_rfq_data(5, 1)
+    before = repr(data)
+
+    email_to_medusa_mapping.transform(data)
+
+    assert repr(data) == before
+
+
+def test_recompiling_the_spec_gives_the_same_source():
+    assert CompiledMapping(EMAIL_TO_MEDUSA_MAPPING, name="email_to_medusa").source == (
+        email_to_medusa_mapping.source
+    )
+
+
+@pytest.mark.parametrize("spec", [
+    {"no_such_field": {"path": "x"}},
+    {"rfq_number": "rfq_number"},
+    {"rfq_number": {"default": ""}},
+    {"rfq_number": {"path": "a", "const": "b"}},
+    {"rfq_number": {"path": "a", "unknown": 1}},
+    {"rfq_number": {"path": "a", "type": "decimal"}},
+    {"description": {"first_of": []}},
+    {"description": {"first_of": [
+        {"summary": {"path": "line_items", "field": "description"}},
+        {"path": "title"},
+    ]}},
+])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        CompiledMapping(spec)
@@ -0,0 +1,71 @@
+# =============================================================================
+# FILE: tests/test_medusa_db_explain.py
+# Slow statement plan capture
+# =============================================================================
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.services.breakers import medusa_db_breaker
+from src.services.medusa_db import MedusaDBClient
+from src.utils.circuit_breaker import DependencyUnavailable
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.sql = []
+
+    async def fetchval(self, sql, *args):
+        self.sql.append(sql)
+        return json.dumps([{"Plan": {}, "Execution Time": 1.0}])
+
+
+class RecordingPool:
+    def __init__(self):
+        self.conn = RecordingConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture
+def client() -> MedusaDBClient:
+    client = MedusaDBClient()
+    client._pool = RecordingPool()
+    return client
+
+
+async def test_reads_are_analyzed(client):
+    entry = {}
+    await client._explain("primary", "find_rfq_by_external_id", ("e1",), entry)
+
+    [sql] = client._pool.conn.sql
+    assert sql.startswith("EXPLAIN (ANALYZE")
+    assert entry["analyzed"] is True
+    assert entry["plan"]["Execution Time"] == 1.0
+
+
+@pytest.mark.parametrize("name", ["insert_rfq", "update_rfq_status"])
+async def test_writes_are_never_executed(client, name):
+    entry = {}
+    await client._explain("primary", name, (), entry)
+
+    [sql] = client._pool.conn.sql
+    assert sql.startswith("EXPLAIN (FORMAT JSON)")
+    assert entry["analyzed"] is False
+
+
+async def test_plan_capture_goes_through_the_breaker(client, monkeypatch):
+    monkeypatch.setattr(medusa_db_breaker, "allows", lambda: False)
+    entry = {}
+
+    await client._explain("primary", "find_rfq_by_external_id", ("e1",), entry)
+
+    assert client._pool.conn.sql == []
+    assert "plan" not in entry
+    with pytest.raises(DependencyUnavailable):
+        async with client._acquire("primary", client._pool):
+            pass
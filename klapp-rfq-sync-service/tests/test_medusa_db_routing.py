@@ -0,0 +1,230 @@
+# =============================================================================
+# FILE: tests/test_medusa_db_routing.py
+# Primary / read replica routing, against fake pools and two real Postgres
+# databases
+#
+# The real-database tests need MEDUSA_TEST_PRIMARY_DSN and
+# MEDUSA_TEST_REPLICA_DSN set to two scratch databases; the rfq table is
+# created and dropped in each. They are independent, not replicating, so a
+# row present in only one of them stands in for replication lag.
+# =============================================================================
+
+import itertools
+import os
+from contextlib import asynccontextmanager
+
+import asyncpg
+import pytest
+
+from src.config import settings
+from src.models.internal import MedusaRFQRecord
+from src.services.medusa_db import READ_STATEMENTS, MedusaDBClient
+
+PRIMARY_DSN = os.environ.get("MEDUSA_TEST_PRIMARY_DSN")
+REPLICA_DSN = os.environ.get("MEDUSA_TEST_REPLICA_DSN")
+
+
+# -----------------------------------------------------------------------------
+# Fake pools
+# -----------------------------------------------------------------------------
+
+_pids = itertools.count(1)
+
+
+class TableStatement:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchrow(self, external_id):
+        return self.rows.get(external_id)
+
+    def get_statusmsg(self):
+        return "SELECT 1"
+
+
+class TableConnection:
+    """Serves find_rfq_by_external_id from a dict of rows by external_id."""
+
+    def __init__(self):
+        self.rows = {}
+        self.pid = next(_pids)
+
+    def get_server_pid(self):
+        return self.pid
+
+    async def prepare(self, sql):
+        return TableStatement(self.rows)
+
+
+class TablePool:
+    def __init__(self):
+        self.conn = TableConnection()
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self.conn
+
+
+@pytest.fixture
+def routed() -> MedusaDBClient:
+    client = MedusaDBClient()
+    client._pool, client._read_pool = TablePool(), TablePool()
+    return client
+
+
+async def test_replica_hit_does_not_touch_the_primary(routed):
+    routed._read_pool.conn.rows["e1"] = {"status": "replica"}
+
+    assert await routed.find_rfq_by_external_id("e1") == {"status": "replica"}
+    assert routed._pool.acquired == 0
+
+
+async def test_replica_miss_is_confirmed_on_the_primary_pool(routed, monkeypatch):
+    monkeypatch.setattr(settings, "MEDUSA_READ_STALENESS_STRATEGY", "confirm_negative")
+    routed._pool.conn.rows["e1"] = {"status": "primary"}
+
+    assert await routed.find_rfq_by_external_id("e1") == {"status": "primary"}
+    assert await routed.find_rfq_by_external_id("missing") is None
+    assert routed._read_pool.acquired == 2
+    assert routed._pool.acquired == 2
+
+
+async def test_trust_replica_returns_a_replica_miss(routed, monkeypatch):
+    monkeypatch.setattr(settings, "MEDUSA_READ_STALENESS_STRATEGY", "trust_replica")
+    routed._pool.conn.rows["e1"] = {"status": "primary"}
+
+    assert await routed.find_rfq_by_external_id("e1") is None
+    assert routed._pool.acquired == 0
+
+
+async def test_consistent_reads_skip_the_replica(routed):
+    routed._pool.conn.rows["e1"] = {"status": "primary"}
+    routed._read_pool.conn.rows["e1"] = {"status": "replica"}
+
+    assert await routed.find_rfq_by_external_id("e1", consistent=True) == {"status": "primary"}
+    assert routed._read_pool.acquired == 0
+
+
+# -----------------------------------------------------------------------------
+# Real databases
+# -----------------------------------------------------------------------------
+
+CREATE_RFQ_TABLE = """
+    CREATE TABLE rfq (
+        id text PRIMARY KEY,
+        rfq_number text, customer_id text, company_id text,
+        customer_email text, customer_company text, customer_name text,
+        description text, line_items jsonb, status text, priority text,
+        estimated_value numeric, currency text, requirements jsonb,
+        delivery_address jsonb, attachments jsonb,
+        ai_confidence_score double precision, ai_analysis jsonb,
+        external_id text, external_source text, sync_status text,
+        synced_at timestamp, created_at timestamp, updated_at timestamp
+    )
+"""
+
+
+async def insert_row(dsn: str, external_id: str, status: str) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(
+            "INSERT INTO rfq (id, rfq_number, status, external_id, sync_status) "
+            "VALUES ($1, $2, $3, $4, 'synced')",
+            f"rfq_{status}_{external_id}", f"RFQ-{external_id}", status, external_id,
+        )
+    finally:
+        await conn.close()
+
+
+@pytest.fixture
+async def databases():
+    if not (PRIMARY_DSN and REPLICA_DSN):
+        pytest.skip("MEDUSA_TEST_PRIMARY_DSN and MEDUSA_TEST_REPLICA_DSN not set")
+    for dsn in (PRIMARY_DSN, REPLICA_DSN):
+        conn = await asyncpg.connect(dsn)
+        await conn.execute("DROP TABLE IF EXISTS rfq")
+        await conn.execute(CREATE_RFQ_TABLE)
+        await conn.close()
+    yield
+    for dsn in (PRIMARY_DSN, REPLICA_DSN):
+        conn = await asyncpg.connect(dsn)
+        await conn.execute("DROP TABLE IF EXISTS rfq")
+        await conn.close()
+
+
+async def connect(monkeypatch: pytest.MonkeyPatch, replica: bool = True) -> MedusaDBClient:
+    monkeypatch.setattr(type(settings), "MEDUSA_DATABASE_URL", property(lambda _: PRIMARY_DSN))
+    monkeypatch.setattr(
+        type(settings), "MEDUSA_READ_DATABASE_URL", property(lambda _: REPLICA_DSN if replica else None)
+    )
+    monkeypatch.setattr(settings, "MEDUSA_DB_POOL_MIN_SIZE", 1)
+    monkeypatch.setattr(settings, "MEDUSA_DB_POOL_MAX_SIZE", 2)
+    monkeypatch.setattr(settings, "MEDUSA_READ_DB_POOL_MIN_SIZE", 1)
+    monkeypatch.setattr(settings, "MEDUSA_READ_DB_POOL_MAX_SIZE", 2)
+    client = MedusaDBClient()
+    await client.connect()
+    return client
+
+
+async def test_lookups_are_served_by_the_replica(databases, monkeypatch):
+    await insert_row(PRIMARY_DSN, "e1", "primary")
+    await insert_row(REPLICA_DSN, "e1", "replica")
+    client = await connect(monkeypatch)
+    try:
+        assert (await client.find_rfq_by_external_id("e1"))["status"] == "replica"
+        assert (await client.find_rfq_by_external_id("e1", consistent=True))["status"] == "primary"
+    finally:
+        await client.disconnect()
+
+
+async def test_replica_miss_is_confirmed_on_the_primary(databases, monkeypatch):
+    await insert_row(PRIMARY_DSN, "e1", "primary")
+    client = await connect(monkeypatch)
+    try:
+        monkeypatch.setattr(settings, "MEDUSA_READ_STALENESS_STRATEGY", "confirm_negative")
+        assert (await client.find_rfq_by_external_id("e1"))["status"] == "primary"
+
+        monkeypatch.setattr(settings, "MEDUSA_READ_STALENESS_STRATEGY", "trust_replica")
+        assert await client.find_rfq_by_external_id("e1") is None
+
+        assert await client.find_rfq_by_external_id("missing", consistent=True) is None
+    finally:
+        await client.disconnect()
+
+
+async def test_without_replica_reads_use_the_primary(databases, monkeypatch):
+    await insert_row(PRIMARY_DSN, "e1", "primary")
+    await insert_row(REPLICA_DSN, "e1", "replica")
+    client = await connect(monkeypatch, replica=False)
+    try:
+        assert (await client.find_rfq_by_external_id("e1"))["status"] == "primary"
+    finally:
+        await client.disconnect()
+
+
+async def test_writes_go_to_the_primary(databases, monkeypatch):
+    client = await connect(monkeypatch)
+    try:
+        rfq_id = await client.create_rfq(
+            MedusaRFQRecord(rfq_number="RFQ-1", customer_email="a@example.com", external_id="e1")
+        )
+        found = await client.find_rfq_by_external_id("e1", consistent=True)
+        assert found["id"] == rfq_id
+        # Not on the replica: these databases do not replicate
+        monkeypatch.setattr(settings, "MEDUSA_READ_STALENESS_STRATEGY", "trust_replica")
+        assert await client.find_rfq_by_external_id("e1") is None
+    finally:
+        await client.disconnect()
+
+
+async def test_replica_connections_prepare_read_statements_only(databases, monkeypatch):
+    client = await connect(monkeypatch)
+    try:
+        await client.find_rfq_by_external_id("e1")
+        prepared = {role: set(names) for (role, _), names in client._prepared.items()}
+        assert prepared["replica"] == set(READ_STATEMENTS)
+        assert "insert_rfq" in prepared["primary"]
+    finally:
+        await client.disconnect()
@@ -0,0 +1,214 @@
+# =============================================================================
+# FILE: tests/test_models.py
+# Conversions between the event models and the slotted in-flight records
+# =============================================================================
+
+import dataclasses
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.events import (
+    ClaimCheckRef,
+    MedusaRFQ,
+    RFQSyncRequest,
+    SyncDirection,
+    SyncStatus,
+)
+from src.models.internal import MedusaRFQRecord, SyncOutcome, SyncState, SyncWork
+
+STARTED = datetime(2026, 10, 1, 12, 0, 0)
+COMPLETED = datetime(2026, 10, 1, 12, 0, 1, 500000)
+
+
+def make_event(**overrides) -> dict:
+    event = {
+        "event_id": "evt-1",
+        "event_type": "rfq.sync.to_medusa",
+        "event_timestamp": STARTED.isoformat(),
+        "source_service": "email-service",
+        "idempotency_key": "key-1",
+        "email_rfq_id": "email-1",
+        "rfq_number": "RFQ-1",
+        "rfq_data": {"rfq_number": "RFQ-1", "line_items": []},
+    }
+    event.update(overrides)
+    return event
+
+
+def make_outcome(**overrides) -> SyncOutcome:
+    options = dict(
+        email_rfq_id="email-1",
+        rfq_number="RFQ-1",
+        sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+        sync_status=SyncStatus.COMPLETED,
+        sync_started_at=STARTED,
+        sync_completed_at=COMPLETED,
+        duration_ms=1500,
+    )
+    options.update(overrides)
+    return SyncOutcome(**options)
+
+
+# -----------------------------------------------------------------------------
+# SyncWork
+# -----------------------------------------------------------------------------
+
+def test_sync_work_defaults_match_the_request():
+    work = SyncWork.from_event(make_event())
+    request = RFQSyncRequest(**make_event())
+
+    assert work.rfq_data == {"rfq_number": "RFQ-1", "line_items": []}
+    assert work.rfq_data_ref is None
+    assert work.correlation_id is None
+    assert (work.sync_direction, work.retry_count, work.max_retries) == (
+        request.sync_direction, request.retry_count, request.max_retries,
+    )
+
+
+def test_sync_work_keeps_every_request_field():
+    ref = {"uri": "file:///tmp/rfq-1.json", "size_bytes": 2048, "line_item_count": 40}
+    event = make_event(
+        rfq_data_ref=ref,
+        correlation_id="corr-1",
+        sync_direction=SyncDirection.MEDUSA_TO_EMAIL.value,
+        retry_count=2,
+        max_retries=5,
+    )
+    del event["rfq_data"]
+
+    work = SyncWork.from_event(event)
+
+    assert work.rfq_data == {}
+    assert work.rfq_data_ref == ClaimCheckRef(**ref)
+    assert work.rfq_data_ref.priority is None
+    assert work.correlation_id == "corr-1"
+    assert work.sync_direction == SyncDirection.MEDUSA_TO_EMAIL
+    assert (work.retry_count, work.max_retries) == (2, 5)
+    assert {f.name for f in dataclasses.fields(SyncWork)} <= set(RFQSyncRequest.model_fields)
+
+
+@pytest.mark.parametrize("missing, extra", [
+    ("rfq_data", {}),  # Neither payload
+    (None, {"rfq_data_ref": {"uri": "file:///tmp/rfq-1.json", "size_bytes": 1}}),  # Both
+    ("email_rfq_id", {}),
+])
+def test_sync_work_rejects_invalid_events(missing, extra):
+    event = make_event(**extra)
+    event.pop(missing, None)
+
+    with pytest.raises(ValidationError):
+        SyncWork.from_event(event)
+
+
+# -----------------------------------------------------------------------------
+# MedusaRFQRecord
+# -----------------------------------------------------------------------------
+
+def test_record_defaults_match_the_model():
+    record = MedusaRFQRecord(rfq_number="RFQ-1", customer_email="a@example.com", external_id="email-1")
+
+    assert record.to_model() == MedusaRFQ(
+        rfq_number="RFQ-1", customer_email="a@example.com", external_id="email-1",
+    )
+
+
+def test_record_round_trips_every_field():
+    record = MedusaRFQRecord(
+        rfq_number="RFQ-1",
+        customer_email="a@example.com",
+        external_id="email-1",
+        customer_name="Ada",
+        customer_company="Acme",
+        customer_id="cus_1",
+        company_id="comp_1",
+        description="Bolts",
+        line_items=[{"description": "Bolt", "quantity": 4}],
+        status="quoted",
+        priority="urgent",
+        currency="USD",
+        estimated_value=12.5,
+        requirements={"certified": True},
+        delivery_address={"city": "Berlin"},
+        attachments={"files": ["spec.pdf"]},
+        ai_confidence_score=0.9,
+        ai_analysis={"summary": "ok"},
+        external_source="portal",
+        sync_status="pending",
+    )
+
+    model = record.to_model()
+
+    assert model.model_dump() == dataclasses.asdict(record)
+    assert MedusaRFQRecord(**model.model_dump()) == record
+
+
+# -----------------------------------------------------------------------------
+# SyncOutcome
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"medusa_rfq_id": "rfq_1"},
+    {"sync_status": SyncStatus.FAILED, "error_message": "boom"},
+])
+def test_outcome_model_round_trip(overrides):
+    outcome = make_outcome(**overrides)
+
+    model = outcome.to_model()
+
+    assert SyncOutcome(**model.model_dump()) == outcome
+
+
+def test_outcome_event_is_json_and_parses_back():
+    outcome = make_outcome(sync_status=SyncStatus.FAILED, error_message="boom")
+
+    event = json.loads(json.dumps(outcome.to_event("rfq-sync-service")))
+
+    assert event["event_type"] == "rfq.sync.completed"
+    assert event["source_service"] == "rfq-sync-service"
+    assert event["medusa_rfq_id"] is None
+    assert event["error_message"] == "boom"
+    assert event["sync_status"] == SyncStatus.FAILED.value
+    assert datetime.fromisoformat(event["sync_started_at"]) == STARTED
+    assert datetime.fromisoformat(event["sync_completed_at"]) == COMPLETED
+    assert event["event_timestamp"] == event["sync_completed_at"]
+    assert event["sync_duration_ms"] == 1500
+
+
+# -----------------------------------------------------------------------------
+# SyncState
+# -----------------------------------------------------------------------------
+
+def test_state_round_trips_without_its_sequence():
+    state = SyncState(
+        email_rfq_id="email-1",
+        rfq_number="RFQ-1",
+        sync_status=SyncStatus.COMPLETED.value,
+        last_attempt_at=COMPLETED,
+        medusa_rfq_id="rfq_1",
+        duration_ms=1500,
+        attempts=3,
+        sequence=42,
+    )
+
+    data = json.loads(json.dumps(state.to_dict()))
+
+    assert "sequence" not in data
+    assert SyncState.from_dict(data) == dataclasses.replace(state, sequence=0)
+
+
+def test_state_from_dict_defaults_missing_fields():
+    state = SyncState.from_dict({
+        "email_rfq_id": "email-1",
+        "rfq_number": "RFQ-1",
+        "sync_status": SyncStatus.PENDING.value,
+        "last_attempt_at": STARTED.isoformat(),
+    })
+
+    assert state.medusa_rfq_id is None
+    assert state.duration_ms is None
+    assert state.error_message is None
+    assert state.attempts == 1
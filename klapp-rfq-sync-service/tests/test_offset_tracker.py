@@ -0,0 +1,71 @@
+# =============================================================================
+# FILE: tests/test_offset_tracker.py
+# Contiguous-prefix offset commits
+# =============================================================================
+
+from aiokafka.structs import TopicPartition
+
+from src.consumers.offset_tracker import OffsetTracker
+
+TP0 = TopicPartition("rfq", 0)
+TP1 = TopicPartition("rfq", 1)
+
+
+def tracked(*offsets: int, tp: TopicPartition = TP0) -> OffsetTracker:
+    tracker = OffsetTracker()
+    for offset in offsets:
+        tracker.track(tp, offset)
+    return tracker
+
+
+def test_nothing_to_commit_until_the_first_message_finishes():
+    tracker = tracked(10, 11, 12)
+    tracker.finish(TP0, 12)
+    tracker.finish(TP0, 11)
+
+    assert tracker.to_commit() == {}
+    assert tracker.in_flight() == 3
+
+
+def test_commit_covers_only_the_finished_prefix():
+    tracker = tracked(10, 11, 12, 13)
+    tracker.finish(TP0, 10)
+    tracker.finish(TP0, 12)
+
+    assert tracker.to_commit() == {TP0: 11}
+
+    tracker.finish(TP0, 11)
+    assert tracker.to_commit() == {TP0: 13}
+    assert tracker.in_flight() == 1
+
+
+def test_offsets_are_not_recommitted():
+    tracker = tracked(0, 1)
+    tracker.finish(TP0, 0)
+    tracker.committed(tracker.to_commit())
+
+    assert tracker.to_commit() == {}
+
+    tracker.finish(TP0, 1)
+    assert tracker.to_commit() == {TP0: 2}
+
+
+def test_partitions_are_independent():
+    tracker = tracked(0, 1)
+    tracker.track(TP1, 5)
+    tracker.finish(TP1, 5)
+    tracker.finish(TP0, 1)
+
+    assert tracker.to_commit() == {TP1: 6}
+
+
+def test_revoked_partitions_are_forgotten():
+    tracker = tracked(0, 1)
+    tracker.finish(TP0, 0)
+    tracker.forget([TP0])
+
+    tracker.finish(TP0, 1)  # Finished after the revoke
+
+    assert tracker.to_commit() == {}
+    assert tracker.in_flight() == 0
+
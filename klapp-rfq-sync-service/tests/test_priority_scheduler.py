@@ -0,0 +1,155 @@
+# =============================================================================
+# FILE: tests/test_priority_scheduler.py
+# Priority lanes: weighting, reserved urgent workers and lane routing
+# =============================================================================
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from benchmarks.harness.fakes import FakeMessage
+from src.config import settings
+from src.consumers.handlers import SyncToMedusaHandler
+from src.consumers.priority_scheduler import LANES, PriorityScheduler
+from src.services.blob_store import LocalFileBlobStore
+from src.services.claim_check import check_in
+from tests.test_claim_check import make_event
+
+WEIGHTS = {"urgent": 8, "high": 4, "medium": 2, "low": 1}
+
+
+async def noop(item) -> None:
+    pass
+
+
+def make_scheduler(handler=noop, **kwargs) -> PriorityScheduler:
+    kwargs.setdefault("weights", WEIGHTS)
+    return PriorityScheduler(handler, lane_for=lambda item: item[0], **kwargs)
+
+
+def test_lanes_are_picked_in_proportion_to_weight():
+    scheduler = make_scheduler()
+    for lane in LANES:
+        for i in range(100):
+            scheduler.put((lane, i))
+
+    picks = []
+    for _ in range(sum(WEIGHTS.values()) * 4):
+        lane = scheduler._pick_lane()
+        scheduler._queues[lane].popleft()
+        picks.append(lane)
+
+    assert Counter(picks) == {lane: weight * 4 for lane, weight in WEIGHTS.items()}
+    # Smooth: other lanes are interleaved with urgent, not served after a run of it
+    assert not any(a == b == c == "urgent" for a, b, c in zip(picks, picks[1:], picks[2:]))
+
+
+def test_empty_lanes_are_skipped():
+    scheduler = make_scheduler()
+    scheduler.put(("low", 1))
+    assert scheduler._pick_lane() == "low"
+    scheduler._queues["low"].popleft()
+    assert scheduler._pick_lane() is None
+
+
+async def test_reserved_workers_do_not_touch_round_robin_state():
+    done = asyncio.Event()
+    seen = []
+
+    async def handler(item):
+        seen.append(item)
+        if len(seen) == 5:
+            done.set()
+
+    scheduler = make_scheduler(handler, workers=0, reserved_urgent_workers=1)
+    scheduler.start()
+    for i in range(5):
+        scheduler.put(("urgent", i))
+    await asyncio.wait_for(done.wait(), 1)
+    await scheduler.stop()
+
+    assert len(seen) == 5
+    assert all(weight == 0 for weight in scheduler._current_weight.values())
+
+
+async def test_urgent_is_served_while_shared_workers_are_busy():
+    release = asyncio.Event()
+    urgent_done = asyncio.Event()
+
+    async def handler(item):
+        if item[0] == "urgent":
+            urgent_done.set()
+        else:
+            await release.wait()
+
+    scheduler = make_scheduler(handler, workers=1, reserved_urgent_workers=1)
+    scheduler.start()
+    scheduler.put(("low", 1))
+    await asyncio.sleep(0)
+    scheduler.put(("urgent", 1))
+
+    await asyncio.wait_for(urgent_done.wait(), 1)
+    assert scheduler.pending() == 1  # The low item, still running
+    release.set()
+    await scheduler.stop()
+
+
+def test_full_lane():
+    scheduler = make_scheduler(lane_capacity=2)
+    scheduler.put(("low", 1))
+    assert not scheduler.full(("low", 2))
+    scheduler.put(("low", 2))
+    assert scheduler.full(("low", 3))
+    assert not scheduler.full(("high", 1))
+
+
+def message(value, topic=settings.TOPIC_RFQ_SYNC_TO_MEDUSA) -> FakeMessage:
+    return FakeMessage(topic, 0, 0, None, value, 0)
+
+
+@pytest.mark.parametrize("priority, lane", [
+    ("critical", "urgent"),
+    ("urgent", "urgent"),
+    ("high", "high"),
+    ("low", "low"),
+    ("unknown", "medium"),
+    (None, "medium"),
+])
+def test_lane_for_inline_events(priority, lane):
+    event = make_event(1, priority=priority)
+    assert SyncToMedusaHandler.lane_for(message(event)) == lane
+
+
+def test_priority_topic_is_urgent():
+    event = make_event(1, priority="low")
+    assert SyncToMedusaHandler.lane_for(message(event, settings.TOPIC_RFQ_SYNC_TO_MEDUSA_PRIORITY)) == "urgent"
+
+
+async def test_lane_for_claim_checked_events(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CLAIM_CHECK_THRESHOLD_BYTES", 512)
+    event = await check_in(make_event(50, priority="critical"), LocalFileBlobStore(str(tmp_path)))
+    assert "rfq_data" not in event
+
+    assert SyncToMedusaHandler.lane_for(message(event)) == "urgent"
+    # Priority only in the ref (producers that do not copy it to the top level)
+    del event["priority"]
+    assert SyncToMedusaHandler.lane_for(message(event)) == "urgent"
+
+
+@pytest.mark.parametrize("value", [
+    None,
+    "not an event",
+    42,
+    ["rfq_data", {"priority": "urgent"}],
+    {"rfq_data": ["priority", "urgent"]},
+    {"rfq_data": "urgent", "rfq_data_ref": 7},
+    {"priority": ["urgent"]},
+    {"priority": {"level": "urgent"}},
+])
+def test_lane_for_malformed_events_is_medium(value):
+    assert SyncToMedusaHandler.lane_for(message(value)) == "medium"
+
+
+def test_lane_for_skips_malformed_sources():
+    assert SyncToMedusaHandler.lane_for(message({"rfq_data": [], "rfq_data_ref": {"priority": "high"}})) == "high"
@@ -0,0 +1,150 @@
+# =============================================================================
+# FILE: tests/test_query_stats.py
+# Statement statistics, the slow-statement log and their Prometheus counters
+# =============================================================================
+
+import asyncpg
+import pytest
+
+from src.config import settings
+from src.services import medusa_db
+from src.services.medusa_db import MedusaDBClient
+from src.services.query_stats import QueryStats
+from src.utils.metrics import DB_SLOW_STATEMENTS, DB_STATEMENT_ERRORS, DB_STATEMENT_ROWS
+
+
+def counter(metric, statement: str) -> float:
+    return metric.labels(statement=statement)._value.get()
+
+
+# -----------------------------------------------------------------------------
+# QueryStats
+# -----------------------------------------------------------------------------
+
+def test_statements_are_aggregated():
+    stats = QueryStats()
+    stats.record_statement("find_rfq_by_external_id", 0.010, 1)
+    stats.record_statement("find_rfq_by_external_id", 0.030, 0)
+    stats.record_error("find_rfq_by_external_id")
+    stats.record_acquire("replica", 0.002)
+
+    report = stats.report()
+
+    assert report["statements"]["find_rfq_by_external_id"] == {
+        "count": 2, "total_ms": 40.0, "max_ms": 30.0, "errors": 1, "rows": 1, "mean_ms": 20.0,
+    }
+    assert report["acquire_wait"]["replica"]["count"] == 1
+    assert report["slow_statements"] == []
+
+
+def test_statement_that_only_failed_has_no_mean():
+    stats = QueryStats()
+    stats.record_error("insert_rfq")
+
+    summary = stats.report()["statements"]["insert_rfq"]
+
+    assert summary["errors"] == 1
+    assert summary["mean_ms"] is None
+
+
+def test_slow_log_keeps_the_most_recent():
+    stats = QueryStats(slow_log_size=2)
+    for ms in (300, 400, 500):
+        stats.record_slow("insert_rfq", "primary", ms / 1000, [10])
+
+    slow = stats.report()["slow_statements"]
+
+    assert [entry["duration_ms"] for entry in slow] == [400.0, 500.0]
+    assert slow[-1]["pool"] == "primary"
+
+
+# -----------------------------------------------------------------------------
+# MedusaDBClient._run
+# -----------------------------------------------------------------------------
+
+class FakeStatement:
+    def __init__(self, status: str, error: Exception = None):
+        self.status = status
+        self.error = error
+
+    async def fetch(self, *args):
+        if self.error:
+            raise self.error
+        return []
+
+    def get_statusmsg(self):
+        return self.status
+
+
+class FakeConnection:
+    def __init__(self, statement: FakeStatement):
+        self.statement = statement
+
+    def get_server_pid(self):
+        return id(self)
+
+    async def prepare(self, sql):
+        return self.statement
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, event, **fields):
+        self.warnings.append((event, fields))
+
+
+@pytest.fixture
+def stats(monkeypatch: pytest.MonkeyPatch) -> QueryStats:
+    stats = QueryStats()
+    monkeypatch.setattr(medusa_db, "query_stats", stats)
+    monkeypatch.setattr(settings, "MEDUSA_DB_EXPLAIN_SAMPLE_RATE", 0.0)
+    return stats
+
+
+@pytest.fixture
+def slow_log(monkeypatch: pytest.MonkeyPatch) -> RecordingLogger:
+    logger = RecordingLogger()
+    monkeypatch.setattr(medusa_db, "sampled_logger", logger)
+    return logger
+
+
+async def test_rows_are_counted_from_the_command_tag(stats, slow_log):
+    before = counter(DB_STATEMENT_ROWS, "insert_rfq")
+    conn = FakeConnection(FakeStatement("INSERT 0 1"))
+
+    await MedusaDBClient()._run("primary", conn, "insert_rfq", "fetch", "rfq_1")
+
+    assert stats.report()["statements"]["insert_rfq"]["rows"] == 1
+    assert counter(DB_STATEMENT_ROWS, "insert_rfq") == before + 1
+    assert slow_log.warnings == []
+
+
+async def test_errors_are_counted_and_raised(stats, slow_log):
+    before = counter(DB_STATEMENT_ERRORS, "update_rfq_status")
+    conn = FakeConnection(FakeStatement("", asyncpg.UniqueViolationError()))
+
+    with pytest.raises(asyncpg.UniqueViolationError):
+        await MedusaDBClient()._run("primary", conn, "update_rfq_status", "fetch")
+
+    summary = stats.report()["statements"]["update_rfq_status"]
+    assert (summary["count"], summary["errors"]) == (0, 1)
+    assert counter(DB_STATEMENT_ERRORS, "update_rfq_status") == before + 1
+
+
+async def test_statements_over_the_threshold_are_logged(stats, slow_log, monkeypatch):
+    monkeypatch.setattr(settings, "MEDUSA_DB_SLOW_STATEMENT_MS", 0)
+    before = counter(DB_SLOW_STATEMENTS, "insert_rfq")
+    conn = FakeConnection(FakeStatement("INSERT 0 1"))
+
+    await MedusaDBClient()._run("primary", conn, "insert_rfq", "fetch", "rfq_1", None)
+
+    [(event, fields)] = slow_log.warnings
+    assert event == "Slow statement"
+    assert fields["statement"] == "insert_rfq"
+    assert fields["pool"] == "primary"
+    assert len(fields["param_bytes"]) == 2
+    [entry] = stats.report()["slow_statements"]
+    assert entry["statement"] == "insert_rfq"
+    assert counter(DB_SLOW_STATEMENTS, "insert_rfq") == before + 1
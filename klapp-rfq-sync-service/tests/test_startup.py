@@ -0,0 +1,84 @@
+# =============================================================================
+# FILE: tests/test_startup.py
+# Startup phase timing, time to first sync and the readiness endpoint
+# =============================================================================
+
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api import server
+from src.api.server import create_app
+from src.utils.metrics import SERVICE_READY, STARTUP_PHASE_SECONDS, TIME_TO_FIRST_SYNC
+from src.utils.startup import StartupTracker
+
+
+@pytest.fixture
+def tracker(monkeypatch: pytest.MonkeyPatch) -> StartupTracker:
+    tracker = StartupTracker()
+    monkeypatch.setattr(server, "startup_tracker", tracker)
+    return tracker
+
+
+# -----------------------------------------------------------------------------
+# StartupTracker
+# -----------------------------------------------------------------------------
+
+def test_phases_are_timed(tracker):
+    with tracker.phase("test_warm_up"):
+        time.sleep(0.02)
+
+    report = tracker.report()
+    assert report["phases_ms"]["test_warm_up"] >= 20
+    assert STARTUP_PHASE_SECONDS.labels(phase="test_warm_up")._value.get() >= 0.02
+    assert report["ready"] is False
+    assert report["ready_ms"] is None
+
+
+def test_ready_and_not_ready(tracker):
+    tracker.mark_ready()
+    report = tracker.report()
+    assert report["ready"] is True
+    assert report["ready_ms"] >= 0
+    assert SERVICE_READY._value.get() == 1
+
+    tracker.mark_not_ready()
+    assert tracker.ready is False
+    assert SERVICE_READY._value.get() == 0
+
+
+def test_only_the_first_sync_is_recorded(tracker):
+    assert tracker.report()["time_to_first_sync_ms"] is None
+    time.sleep(0.01)
+    tracker.record_synced()
+    first = tracker.report()["time_to_first_sync_ms"]
+    gauge = TIME_TO_FIRST_SYNC._value.get()
+
+    time.sleep(0.01)
+    tracker.record_synced()
+
+    assert first >= 10
+    assert tracker.report()["time_to_first_sync_ms"] == first
+    assert TIME_TO_FIRST_SYNC._value.get() == gauge == pytest.approx(first / 1000, abs=1e-3)
+
+
+# -----------------------------------------------------------------------------
+# /ready
+# -----------------------------------------------------------------------------
+
+async def test_ready_is_503_until_startup_completes(tracker):
+    async with TestClient(TestServer(create_app())) as client:
+        response = await client.get("/ready")
+        assert response.status == 503
+        assert (await response.json())["ready"] is False
+
+        with tracker.phase("test_connect"):
+            pass
+        tracker.mark_ready()
+
+        response = await client.get("/ready")
+        assert response.status == 200
+        body = await response.json()
+        assert body["ready"] is True
+        assert "test_connect" in body["phases_ms"]
@@ -0,0 +1,35 @@
+# =============================================================================
+# FILE: tests/test_sync_consumer.py
+# Consumer settings: the static group member id
+# =============================================================================
+
+import pytest
+
+from src.config import settings
+from src.consumers.sync_consumer import group_instance_id
+
+
+@pytest.fixture
+def static_membership(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "KAFKA_STATIC_MEMBERSHIP", True)
+    monkeypatch.setattr(settings, "KAFKA_GROUP_INSTANCE_ID", None)
+    monkeypatch.delenv("POD_NAME", raising=False)
+    return monkeypatch
+
+
+def test_static_membership_is_off_by_default(monkeypatch):
+    monkeypatch.setenv("POD_NAME", "rfq-sync-0")
+
+    assert type(settings)().KAFKA_STATIC_MEMBERSHIP is False
+    monkeypatch.setattr(settings, "KAFKA_STATIC_MEMBERSHIP", False)
+    assert group_instance_id() is None
+
+
+def test_instance_id_needs_an_explicit_name(static_membership):
+    assert group_instance_id() is None
+
+    static_membership.setenv("POD_NAME", "rfq-sync-0")
+    assert group_instance_id() == "rfq-sync-0"
+
+    static_membership.setattr(settings, "KAFKA_GROUP_INSTANCE_ID", "configured")
+    assert group_instance_id() == "configured"
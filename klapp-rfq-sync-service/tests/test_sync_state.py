@@ -0,0 +1,250 @@
+# =============================================================================
+# FILE: tests/test_sync_state.py
+# Sync state index: eviction, paging and the shared Redis snapshot
+# =============================================================================
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.events import SyncDirection, SyncStatus
+from src.models.internal import SyncOutcome
+from src.services.sync_state import SyncStateIndex
+
+START = datetime(2026, 10, 1, 12, 0, 0)
+
+
+def outcome(n: int, status: SyncStatus = SyncStatus.COMPLETED, at: int = None) -> SyncOutcome:
+    attempted_at = START + timedelta(seconds=n if at is None else at)
+    return SyncOutcome(
+        email_rfq_id=f"email-{n}",
+        medusa_rfq_id=f"rfq_{n}" if status == SyncStatus.COMPLETED else None,
+        rfq_number=f"RFQ-{n}",
+        sync_direction=SyncDirection.EMAIL_TO_MEDUSA,
+        sync_status=status,
+        sync_started_at=attempted_at,
+        sync_completed_at=attempted_at,
+        duration_ms=10,
+        error_message=None if status == SyncStatus.COMPLETED else "boom",
+    )
+
+
+def make_index(**overrides) -> SyncStateIndex:
+    options = dict(max_entries=100, snapshot_batch=7, key_prefix="test:")
+    options.update(overrides)
+    return SyncStateIndex(**options)
+
+
+def ids(items):
+    return [item["email_rfq_id"] for item in items]
+
+
+def all_pages(index: SyncStateIndex, limit: int, sync_status: str = None):
+    pages, cursor = [], None
+    while True:
+        items, cursor = index.page(limit, cursor, sync_status)
+        pages.append(ids(items))
+        if cursor is None:
+            return pages
+
+
+# -----------------------------------------------------------------------------
+# In memory
+# -----------------------------------------------------------------------------
+
+def test_oldest_entries_are_evicted():
+    index = make_index(max_entries=3)
+    for n in range(5):
+        index.record(outcome(n))
+
+    assert len(index) == 3
+    assert ids(index.page(10)[0]) == ["email-4", "email-3", "email-2"]
+    assert index.get_metrics()["evicted"] == 2
+
+
+def test_a_new_attempt_protects_an_entry_from_eviction():
+    index = make_index(max_entries=3)
+    for n in range(3):
+        index.record(outcome(n))
+    index.record(outcome(0, SyncStatus.FAILED))
+    index.record(outcome(3))
+
+    assert ids(index.page(10)[0]) == ["email-3", "email-0", "email-2"]
+
+
+async def test_retry_keeps_medusa_id_and_counts_attempts():
+    index = make_index()
+    index.record(outcome(1))
+    index.record_deferred("email-1", "RFQ-1", "redis unavailable")
+
+    state = (await index.lookup(email_rfq_ids=["email-1"]))["email_rfq_ids"]["email-1"]
+
+    assert state["sync_status"] == SyncStatus.PENDING.value
+    assert state["medusa_rfq_id"] == "rfq_1"
+    assert state["attempts"] == 2
+
+
+def test_pages_walk_every_entry_once_newest_first():
+    index = make_index()
+    for n in range(10):
+        index.record(outcome(n))
+
+    pages = all_pages(index, 4)
+
+    assert pages == [
+        ["email-9", "email-8", "email-7", "email-6"],
+        ["email-5", "email-4", "email-3", "email-2"],
+        ["email-1", "email-0"],
+    ]
+
+
+def test_entries_attempted_again_while_paging_are_not_repeated():
+    index = make_index()
+    for n in range(6):
+        index.record(outcome(n))
+
+    first, cursor = index.page(3)
+    index.record(outcome(4, SyncStatus.FAILED))
+    index.record(outcome(1, SyncStatus.FAILED))
+    rest, _ = index.page(10, cursor)
+
+    assert ids(first) == ["email-5", "email-4", "email-3"]
+    assert ids(rest) == ["email-2", "email-0"]
+
+
+def test_pages_filtered_by_status_follow_status_changes():
+    index = make_index()
+    for n in range(6):
+        index.record(outcome(n, SyncStatus.FAILED if n % 2 else SyncStatus.COMPLETED))
+    index.record(outcome(3))  # Failed, then completed
+
+    failed = all_pages(index, 1, SyncStatus.FAILED.value)
+    completed, _ = index.page(10, sync_status=SyncStatus.COMPLETED.value)
+
+    assert failed == [["email-5"], ["email-1"]]
+    assert ids(completed) == ["email-3", "email-4", "email-2", "email-0"]
+    assert index.page(10, sync_status="unknown") == ([], None)
+
+
+def test_page_logs_are_compacted():
+    index = make_index(max_entries=10)
+    for n in range(5000):
+        index.record(outcome(n % 20, at=n))
+
+    assert len(index._log) <= 2 * len(index) + 64
+    assert ids(index.page(3)[0]) == ["email-19", "email-18", "email-17"]
+
+
+# -----------------------------------------------------------------------------
+# Redis snapshot
+# -----------------------------------------------------------------------------
+
+async def test_snapshot_and_restore_round_trip(redis):
+    index = make_index()
+    for n in range(20):
+        index.record(outcome(n, SyncStatus.FAILED if n == 7 else SyncStatus.COMPLETED))
+
+    assert await index.snapshot() == 20
+    assert await index.snapshot() == 0  # Nothing changed
+
+    restored = make_index()
+    assert await restored.restore() == 20
+    assert all_pages(restored, 100) == all_pages(index, 100)
+    assert ids(restored.page(10, sync_status=SyncStatus.FAILED.value)[0]) == ["email-7"]
+
+
+async def test_restore_is_bounded_to_the_newest_entries(redis):
+    index = make_index(max_entries=1000)
+    for n in range(50):
+        index.record(outcome(n))
+    await index.snapshot()
+
+    restored = make_index(max_entries=10)
+    assert await restored.restore() == 10
+    assert ids(restored.page(1)[0]) == ["email-49"]
+    assert ids(restored.page(100)[0])[-1] == "email-40"
+
+
+async def test_recency_set_is_trimmed(redis):
+    index = make_index(max_entries=5)
+    for n in range(12):
+        index.record(outcome(n))
+        await index.snapshot()
+
+    assert len(redis._zsets["test:sync_state:recent"]) == 5
+
+
+async def test_local_eviction_does_not_delete_shared_state(redis):
+    small = make_index(max_entries=2)
+    small.record(outcome(1))
+    await small.snapshot()
+    small.record(outcome(2))
+    small.record(outcome(3))  # Evicts email-1 locally
+    await small.snapshot()
+
+    other = make_index()
+    found = await other.lookup(email_rfq_ids=["email-1"], rfq_numbers=["RFQ-1"])
+
+    assert found["email_rfq_ids"]["email-1"]["medusa_rfq_id"] == "rfq_1"
+    assert found["rfq_numbers"]["RFQ-1"]["email_rfq_id"] == "email-1"
+
+
+async def test_an_older_attempt_does_not_overwrite_a_newer_one(redis):
+    newer, older = make_index(), make_index()
+    newer.record(outcome(1, SyncStatus.COMPLETED, at=100))
+    older.record(outcome(1, SyncStatus.FAILED, at=50))
+
+    await newer.snapshot()
+    assert await older.snapshot() == 0
+
+    found = await make_index().lookup(email_rfq_ids=["email-1"])
+    assert found["email_rfq_ids"]["email-1"]["sync_status"] == SyncStatus.COMPLETED.value
+
+
+async def test_lookup_misses_are_none(redis):
+    found = await make_index().lookup(email_rfq_ids=["nope"], rfq_numbers=["RFQ-nope"])
+
+    assert found == {"email_rfq_ids": {"nope": None}, "rfq_numbers": {"RFQ-nope": None}}
+
+
+async def test_failed_snapshot_is_retried(redis, redis_fault):
+    index = make_index()
+    index.record(outcome(1))
+
+    redis_fault.down = True
+    assert await index.snapshot() == 0
+    assert index.get_metrics()["unsaved"] == 1
+
+    redis_fault.down = False
+    assert await index.snapshot() == 1
+    assert index.get_metrics()["unsaved"] == 0
+
+
+async def test_restore_keeps_entries_recorded_since_startup(redis):
+    saved = make_index()
+    saved.record(outcome(1, SyncStatus.FAILED))
+    saved.record(outcome(2))
+    await saved.snapshot()
+
+    index = make_index()
+    index.record(outcome(1))  # Retried before the restore finished
+    assert await index.restore() == 1
+
+    assert ids(index.page(10)[0]) == ["email-1", "email-2"]
+    state = (await index.lookup(email_rfq_ids=["email-1"]))["email_rfq_ids"]["email-1"]
+    assert state["sync_status"] == SyncStatus.COMPLETED.value
+
+
+@pytest.mark.parametrize("max_entries", [1, 3])
+async def test_restore_respects_max_entries_with_current_entries(redis, max_entries):
+    saved = make_index()
+    for n in range(5):
+        saved.record(outcome(n))
+    await saved.snapshot()
+
+    index = make_index(max_entries=max_entries)
+    index.record(outcome(9))
+    await index.restore()
+
+    assert len(index) == max_entries
+    assert ids(index.page(1)[0]) == ["email-9"]